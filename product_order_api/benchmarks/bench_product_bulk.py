@@ -0,0 +1,79 @@
+"""Compare POST /products/bulk with the per-row product API.
+
+Both paths create ``--rows`` products and then update the price and stock
+of every one of them; the report gives rows per second for each.
+
+Run it against MySQL (``--database-url``, e.g. the ``docker-compose.yml``
+server, which keeps the MySQL 8 default ``innodb_autoinc_lock_mode=2``) to
+measure the multi-row INSERT and the id read back of the bulk path there;
+SQLite returns the ids with ``RETURNING`` instead.
+"""
+import asyncio
+
+from benchmarks.common import Timer, base_parser, bench_client, write_report
+
+
+def _rows(count: int):
+    return [
+        {
+            "name": f"Bench product {n}",
+            "description": f"Benchmark product {n}",
+            "price": 10.0 + n % 100,
+            "stock": 100 + n % 50,
+        }
+        for n in range(count)
+    ]
+
+
+async def _per_row(client, rows):
+    with Timer() as create:
+        ids = []
+        for row in rows:
+            response = await client.post("/products/", json=row)
+            ids.append(response.json()["id"])
+    with Timer() as update:
+        for product_id in ids:
+            await client.put(
+                f"/products/{product_id}", json={"price": 1.0, "stock": 1}
+            )
+    return create.elapsed, update.elapsed
+
+
+async def _bulk(client, rows):
+    with Timer() as create:
+        response = await client.post("/products/bulk", json=rows)
+        ids = [r["id"] for r in response.json()]
+    with Timer() as update:
+        await client.post(
+            "/products/bulk",
+            json=[{"id": i, "price": 1.0, "stock": 1} for i in ids]
+        )
+    return create.elapsed, update.elapsed
+
+
+async def main() -> None:
+    parser = base_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    report = {"rows": args.rows}
+    for name, run in (("per_row", _per_row), ("bulk", _bulk)):
+        async with bench_client(args.database_url) as client:
+            create, update = await run(client, _rows(args.rows))
+        report[name] = {
+            "create_seconds": round(create, 3),
+            "update_seconds": round(update, 3),
+            "create_rows_per_second": round(args.rows / create, 1),
+            "update_rows_per_second": round(args.rows / update, 1),
+        }
+    report["speedup"] = {
+        "create": round(report["bulk"]["create_rows_per_second"]
+                        / report["per_row"]["create_rows_per_second"], 1),
+        "update": round(report["bulk"]["update_rows_per_second"]
+                        / report["per_row"]["update_rows_per_second"], 1),
+    }
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,162 @@
+"""Measure filtered and sorted GET /products/ on a large catalog.
+
+Seeds ``--rows`` products with varied prices, stock and update times, then
+for each common filter and sort combination records the database plan of
+the listing query and the latency of the first page and of a keyset page
+deep into the catalog. Plans come from ``EXPLAIN`` on MySQL and
+``EXPLAIN QUERY PLAN`` on SQLite; an index scan without a filesort
+(``Using filesort`` / ``USE TEMP B-TREE FOR ORDER BY``) means the page is
+read in sort order and stops after ``limit`` matching rows.
+
+The listing returns every column, so plans use the composite indexes for
+ordering and range predicates and read the rows from the table; they are
+not covering (index-only) scans.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from benchmarks.common import (
+    Timer,
+    base_parser,
+    bench_client,
+    percentiles,
+    write_report
+)
+from benchmarks.seed import SEED_BATCH_SIZE
+from src.models.product import Product
+from src.projections import product_list_query
+
+# Query parameters of the measured combinations
+COMBINATIONS: Dict[str, Dict[str, Any]] = {
+    "default": {},
+    "price_asc": {"sort": "price"},
+    "price_desc": {"sort": "price", "order": "desc"},
+    "price_range": {"min_price": 100, "max_price": 200, "sort": "price"},
+    "price_range_in_stock": {
+        "min_price": 100, "max_price": 200, "in_stock": True, "sort": "price"
+    },
+    "name": {"sort": "name"},
+    "recently_updated": {"sort": "updated_at", "order": "desc"},
+    "in_stock_recently_updated": {
+        "in_stock": True, "sort": "updated_at", "order": "desc"
+    },
+}
+
+
+def _catalog(start: int, count: int, now: datetime) -> List[Dict[str, Any]]:
+    return [
+        {
+            "name": f"Product {(n * 7919) % 1_000_003:07d}",
+            "description": f"Description for product {n}",
+            "price": round(1.0 + (n * 37) % 100_000 / 100, 2),
+            # One product in ten is out of stock
+            "stock": 0 if n % 10 == 0 else n % 500,
+            "created_at": now - timedelta(seconds=n),
+            "updated_at": now - timedelta(seconds=(n * 104_729) % 8_640_000),
+        }
+        for n in range(start, start + count)
+    ]
+
+
+async def _seed(session_factory: async_sessionmaker, rows: int) -> None:
+    now = datetime.utcnow()
+    async with session_factory() as db:
+        # Generated per batch to keep memory flat on million-row catalogs
+        for start in range(0, rows, SEED_BATCH_SIZE):
+            await db.execute(
+                insert(Product),
+                _catalog(start, min(SEED_BATCH_SIZE, rows - start), now)
+            )
+        if db.get_bind().dialect.name == "mysql":
+            await db.execute(text("ANALYZE TABLE products"))
+        else:
+            await db.execute(text("ANALYZE"))
+        await db.commit()
+
+
+async def _plan(session_factory: async_sessionmaker, params: Dict[str, Any]):
+    query = product_list_query(
+        min_price=params.get("min_price"),
+        max_price=params.get("max_price"),
+        in_stock=params.get("in_stock"),
+        sort=params.get("sort", "id"),
+        descending=params.get("order") == "desc"
+    ).limit(100)
+    async with session_factory() as db:
+        dialect = db.get_bind().dialect
+        sql = str(query.compile(
+            dialect=dialect, compile_kwargs={"literal_binds": True}
+        ))
+        if dialect.name == "mysql":
+            result = await db.execute(text(f"EXPLAIN {sql}"))
+            return [dict(row._mapping) for row in result]
+        result = await db.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+        return [row.detail for row in result]
+
+
+async def _latency(client, params: Dict[str, Any], iterations: int):
+    first_page, deep_page = [], []
+    cursor = ""
+    for _ in range(iterations):
+        with Timer() as timer:
+            response = await client.get(
+                "/products/", params={**params, "limit": 100}
+            )
+        response.raise_for_status()
+        first_page.append(timer.elapsed)
+    # Walk ten pages in, then time the keyset page reached from there
+    for _ in range(10):
+        page = (await client.get(
+            "/products/", params={**params, "limit": 100, "cursor": cursor}
+        )).json()
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    if cursor is not None:
+        for _ in range(iterations):
+            with Timer() as timer:
+                response = await client.get(
+                    "/products/",
+                    params={**params, "limit": 100, "cursor": cursor}
+                )
+            response.raise_for_status()
+            deep_page.append(timer.elapsed)
+    return {
+        "first_page": percentiles(first_page),
+        "keyset_page_11": percentiles(deep_page),
+    }
+
+
+async def main() -> None:
+    parser = base_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    report: Dict[str, Any] = {
+        "config": {"rows": args.rows, "iterations": args.iterations},
+    }
+    factories: List[async_sessionmaker] = []
+
+    async def seed(session_factory: async_sessionmaker) -> None:
+        factories.append(session_factory)
+        with Timer() as seeding:
+            await _seed(session_factory, args.rows)
+        report["config"]["seed_seconds"] = round(seeding.elapsed, 1)
+
+    async with bench_client(args.database_url, seed) as client:
+        for name, params in COMBINATIONS.items():
+            report[name] = {
+                "params": params,
+                "plan": await _plan(factories[0], params),
+                **await _latency(client, params, args.iterations),
+            }
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+"""Measure the cost of rendering one page of orders.
+
+Compares, for the same in-memory page of orders with their items:
+
+* ``response_model``: what FastAPI does for a handler returning ORM
+  objects: validate them into ``OrderResponse`` models, dump the models to
+  JSON-compatible data and encode it with ``JSONResponse``
+* ``documents``: prebuilt documents (:mod:`src.rendering`) encoded with
+  ``JSONResponse``
+* ``documents_orjson``: prebuilt documents encoded with ``ORJSONResponse``,
+  when ``orjson`` is installed
+
+No database is involved, so the report isolates serialization cost.
+"""
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+from benchmarks.common import Timer, base_parser, percentiles, write_report
+from src.models.order import Order, OrderItem
+from src.rendering import order_document, orjson
+from src.schemas.order import OrderResponse
+
+
+def _page(orders: int, items: int) -> List[Order]:
+    now = datetime(2024, 1, 1)
+    page = []
+    for n in range(orders):
+        order_items = [
+            OrderItem(
+                id=n * items + i,
+                product_id=i + 1,
+                quantity=i + 1,
+                unit_price=9.99 + i,
+                subtotal=(9.99 + i) * (i + 1)
+            )
+            for i in range(items)
+        ]
+        page.append(Order(
+            id=n + 1,
+            customer_name=f"Customer {n}",
+            customer_email=f"customer{n}@example.com",
+            total_amount=sum(item.subtotal for item in order_items),
+            status="pending",
+            created_at=now + timedelta(seconds=n),
+            updated_at=now + timedelta(seconds=n),
+            order_items=order_items
+        ))
+    return page
+
+
+def _measure(render: Callable[[], bytes], iterations: int) -> List[float]:
+    samples = []
+    for _ in range(iterations):
+        with Timer() as timer:
+            render()
+        samples.append(timer.elapsed)
+    return samples
+
+
+def main() -> None:
+    parser = base_parser(__doc__)
+    parser.add_argument("--orders", type=int, default=100, help="Orders per page")
+    parser.add_argument("--items", type=int, default=3, help="Items per order")
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    page = _page(args.orders, args.items)
+    adapter = TypeAdapter(List[OrderResponse])
+
+    def response_model() -> bytes:
+        models = adapter.validate_python(page, from_attributes=True)
+        return JSONResponse(adapter.dump_python(models, mode="json")).body
+
+    def documents() -> bytes:
+        return JSONResponse([order_document(order) for order in page]).body
+
+    def documents_orjson() -> bytes:
+        return ORJSONResponse([order_document(order) for order in page]).body
+
+    paths = {"response_model": response_model, "documents": documents}
+    if orjson is not None:
+        paths["documents_orjson"] = documents_orjson
+
+    report = {
+        "config": {
+            "orders_per_page": args.orders,
+            "items_per_order": args.items,
+            "iterations": args.iterations,
+        },
+        "page_bytes": len(response_model()),
+    }
+    for name, render in paths.items():
+        # Warm up caches and lazily built validators before measuring
+        _measure(render, 10)
+        report[name] = percentiles(_measure(render, args.iterations))
+    baseline = report["response_model"]["mean_ms"]
+    report["speedup"] = {
+        name: round(baseline / report[name]["mean_ms"], 1)
+        for name in paths if name != "response_model"
+    }
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
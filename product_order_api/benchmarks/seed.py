@@ -0,0 +1,108 @@
+"""Deterministic bulk data generators for benchmarks.
+
+Rows follow the same sequences as ``tests/factories.py`` but are inserted
+with multi-row INSERTs, so seeding tens of thousands of rows takes seconds.
+"""
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.models.order import Order, OrderItem
+from src.models.product import Product
+from src.schemas.order import OrderStatus
+
+# Rows per INSERT statement
+SEED_BATCH_SIZE = 1000
+
+
+def product_rows(count: int, stock: int) -> List[Dict[str, Any]]:
+    """Generate ``count`` products, each with ``stock`` units."""
+    now = datetime.utcnow()
+    return [
+        {
+            "name": f"Test Product {n}",
+            "description": f"Description for test product {n}",
+            "price": 10.0 + n % 500,
+            "stock": stock,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for n in range(count)
+    ]
+
+
+async def _insert(db, model, rows: List[Dict[str, Any]]) -> None:
+    for start in range(0, len(rows), SEED_BATCH_SIZE):
+        await db.execute(insert(model), rows[start:start + SEED_BATCH_SIZE])
+
+
+async def seed_database(
+    session_factory: async_sessionmaker,
+    products: int,
+    orders: int,
+    customers: int = 1000,
+    stock: int = 1_000_000,
+    seed: int = 0
+) -> None:
+    """
+    Load products and orders with one to three items each.
+
+    Order timestamps are spread over the last 90 days and statuses follow a
+    realistic mix, so pagination and status filters see varied data.
+
+    Args:
+        session_factory (async_sessionmaker): Factory for the seeding session
+        products (int): Number of products
+        orders (int): Number of orders
+        customers (int): Number of distinct customer emails
+        stock (int): Initial stock per product, large enough that checkouts
+            during the run never sell out
+        seed (int): Random seed, for reproducible data sets
+    """
+    rng = random.Random(seed)
+    statuses = [s.value for s in OrderStatus]
+    weights = [15, 15, 60, 10]
+    now = datetime.utcnow()
+
+    async with session_factory() as db:
+        await _insert(db, Product, product_rows(products, stock))
+        products_by_id = {
+            row.id: row.price
+            for row in await db.execute(select(Product.id, Product.price))
+        }
+        product_ids = sorted(products_by_id)
+
+        order_rows, item_rows = [], []
+        for n in range(orders):
+            created_at = now - timedelta(seconds=rng.randrange(90 * 86400))
+            lines = [
+                (product_id, rng.randint(1, 3))
+                for product_id in rng.sample(product_ids, rng.randint(1, 3))
+            ]
+            order_rows.append({
+                "id": n + 1,
+                "customer_name": f"Customer {n % customers}",
+                "customer_email": f"customer{n % customers}@example.com",
+                "total_amount": sum(
+                    products_by_id[p] * q for p, q in lines
+                ),
+                "status": rng.choices(statuses, weights)[0],
+                "created_at": created_at,
+                "updated_at": created_at,
+            })
+            item_rows.extend(
+                {
+                    "order_id": n + 1,
+                    "product_id": product_id,
+                    "quantity": quantity,
+                    "unit_price": products_by_id[product_id],
+                    "subtotal": products_by_id[product_id] * quantity,
+                }
+                for product_id, quantity in lines
+            )
+        await _insert(db, Order, order_rows)
+        await _insert(db, OrderItem, item_rows)
+        await db.commit()
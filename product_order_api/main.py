@@ -1,7 +1,21 @@
-from fastapi import FastAPI
+import math
+import time
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.exc import SQLAlchemyError
-from src.database import init_db
-from src.routers import products, orders
+from src.database import (
+    READ_STICKY_COOKIE,
+    READ_STICKY_SECONDS,
+    engine,
+    init_db,
+    read_engines
+)
+from src.idempotency import idempotency_key_purger
+from src.metrics import MetricsMiddleware, instrument_engine, registry
+from src.order_pipeline import order_worker_pool
+from src.order_rollup import order_rollup_refresher
+from src.rendering import RESPONSE_CLASS
+from src.routers import products, orders, customers, internal
 from src.errors import (
     APIError,
     api_error_handler,
@@ -36,10 +50,15 @@ app = FastAPI(
         {
             "name": "orders",
             "description": "Operations with orders, including order placement and status management"
+        },
+        {
+            "name": "customers",
+            "description": "Per-customer views, such as order history"
         }
     ],
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=RESPONSE_CLASS
 )
 
 # Add exception handlers
@@ -47,9 +66,50 @@ app.add_exception_handler(APIError, api_error_handler)
 app.add_exception_handler(SQLAlchemyError, sqlalchemy_error_handler)
 app.add_exception_handler(Exception, generic_exception_handler)
 
+# Record SQL statement timings of the writer and every replica
+for db_engine in [engine, *read_engines]:
+    instrument_engine(db_engine.sync_engine)
+
 # Include routers
 app.include_router(products.router)
 app.include_router(orders.router)
+app.include_router(customers.router)
+app.include_router(internal.router)
+
+
+@app.middleware("http")
+async def record_last_write(request: Request, call_next):
+    """
+    Mark clients that just wrote so their reads skip the replicas.
+
+    Successful non-GET requests set the ``db_last_write`` cookie; while it
+    is fresh, ``get_read_db`` reads from the writer instead of a replica
+    that may not have replicated the write yet.
+    """
+    response = await call_next(request)
+    is_write = request.method not in ("GET", "HEAD", "OPTIONS")
+    if is_write and response.status_code < 400:
+        response.set_cookie(
+            READ_STICKY_COOKIE,
+            str(time.time()),
+            max_age=math.ceil(READ_STICKY_SECONDS),
+            httponly=True
+        )
+    return response
+
+
+# Added last so it wraps every other middleware and measures the full
+# request, including the time spent in them
+app.add_middleware(MetricsMiddleware)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """Expose request and SQL metrics in the Prometheus text format."""
+    return PlainTextResponse(
+        registry.render(),
+        media_type="text/plain; version=0.0.4"
+    )
 
 
 @app.get("/")
@@ -59,5 +119,22 @@ async def root():
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize the database on startup."""
-    init_db()
+    """Initialize the database and start the background workers on startup."""
+    await init_db()
+    if order_worker_pool is not None:
+        order_worker_pool.start()
+    if order_rollup_refresher is not None:
+        order_rollup_refresher.start()
+    if idempotency_key_purger is not None:
+        idempotency_key_purger.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the background workers on shutdown."""
+    if order_worker_pool is not None:
+        await order_worker_pool.stop()
+    if order_rollup_refresher is not None:
+        await order_rollup_refresher.stop()
+    if idempotency_key_purger is not None:
+        await idempotency_key_purger.stop()
@@ -7,9 +7,13 @@ setup(
     install_requires=[
         "fastapi==0.115.0",
         "uvicorn==0.25.0",
-        "sqlalchemy==2.0.25",
+        "sqlalchemy[asyncio]==2.0.25",
         "pymysql==1.1.0",
+        "aiomysql==0.2.0",
         "python-dotenv==1.0.0",
     ],
+    extras_require={
+        "fast-json": ["orjson>=3.9"],
+    },
     python_requires=">=3.9",
 )
@@ -0,0 +1,246 @@
+"""Set-based bulk write helpers."""
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Sequence
+
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy import ColumnCollection, Insert, insert, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.product import Product
+from src.schemas.product import (
+    ProductBulkItem,
+    ProductBulkResult,
+    ProductCreate
+)
+
+# Rows written per multi-row statement and per transaction
+BULK_CHUNK_SIZE = 500
+
+
+# PUBLIC_INTERFACE
+def upsert_statement(
+    dialect_name: str,
+    model: Any,
+    rows: Sequence[Dict[str, Any]],
+    index_elements: Sequence[str],
+    set_: Callable[[ColumnCollection], Dict[str, Any]]
+) -> Insert:
+    """
+    Build a multi-row INSERT that updates rows on key conflicts.
+
+    Uses ``INSERT ... ON DUPLICATE KEY UPDATE`` on MySQL and
+    ``INSERT ... ON CONFLICT DO UPDATE`` on SQLite.
+
+    Args:
+        dialect_name (str): Name of the database dialect
+        model (Any): Mapped class to insert into
+        rows (Sequence[Dict[str, Any]]): Column values, one dict per row
+        index_elements (Sequence[str]): Unique key columns (ignored on
+            MySQL, which resolves conflicts on any unique key)
+        set_ (Callable): Receives the proposed row (``inserted`` on MySQL,
+            ``excluded`` on SQLite) and returns the columns to update
+
+    Returns:
+        Insert: Dialect-specific upsert statement
+
+    Raises:
+        NotImplementedError: If the dialect has no upsert support here
+    """
+    if dialect_name == "mysql":
+        stmt = mysql_insert(model).values(list(rows))
+        return stmt.on_duplicate_key_update(set_(stmt.inserted))
+    if dialect_name == "sqlite":
+        stmt = sqlite_insert(model).values(list(rows))
+        return stmt.on_conflict_do_update(
+            index_elements=list(index_elements),
+            set_=set_(stmt.excluded)
+        )
+    raise NotImplementedError(f"Upsert is not supported for {dialect_name}")
+
+
+async def _insert_products(
+    db: AsyncSession,
+    rows: List[Dict[str, Any]]
+) -> List[int]:
+    """Insert new products in one statement and return their ids in order."""
+    dialect = db.get_bind().dialect
+    if dialect.insert_executemany_returning_sort_by_parameter_order:
+        result = await db.execute(
+            insert(Product).returning(
+                Product.id, sort_by_parameter_order=True
+            ),
+            rows
+        )
+        return list(result.scalars())
+
+    # MySQL has no RETURNING and only reports the first id of a multi-row
+    # INSERT. The ids of one statement increase in row order, but with
+    # innodb_autoinc_lock_mode=2 (the MySQL 8 default) concurrent inserts
+    # may take ids in between, so the chunk is tagged with a token and its
+    # ids are read back by it from the first one onwards
+    token = uuid.uuid4().hex
+    result = await db.execute(
+        insert(Product).values([{**row, "bulk_token": token} for row in rows])
+    )
+    return list(await db.scalars(
+        select(Product.id)
+        .where(Product.id >= result.lastrowid, Product.bulk_token == token)
+        .order_by(Product.id)
+    ))
+
+
+async def _apply_chunk(
+    db: AsyncSession,
+    chunk: List[tuple],
+    results: List[ProductBulkResult]
+) -> None:
+    """Write one chunk of validated rows and record their outcomes."""
+    now = datetime.utcnow()
+    dialect_name = db.get_bind().dialect.name
+
+    keyed_ids = [item.id for _, item, _ in chunk if item.id is not None]
+    existing = set()
+    if keyed_ids:
+        existing = set(await db.scalars(
+            select(Product.id).where(Product.id.in_(keyed_ids))
+        ))
+
+    creates, upserts, patches = [], {}, []
+    for index, item, full in chunk:
+        values = item.model_dump(exclude_unset=True)
+        values["updated_at"] = now
+        if item.id is None:
+            # Every row of the multi-row INSERT must carry the same columns
+            creates.append((
+                index,
+                {**full.model_dump(), "created_at": now, "updated_at": now}
+            ))
+        elif full is not None:
+            # Group by column set so every statement updates uniform columns
+            key = tuple(sorted(values))
+            upserts.setdefault(key, []).append(
+                (index, {**values, "created_at": now})
+            )
+        elif item.id in existing:
+            patches.append((index, values))
+        else:
+            results[index] = ProductBulkResult(
+                index=index,
+                id=item.id,
+                status="not_found",
+                detail=f"Product with id {item.id} not found"
+            )
+
+    if creates:
+        ids = await _insert_products(db, [values for _, values in creates])
+        for (index, _), product_id in zip(creates, ids):
+            results[index] = ProductBulkResult(
+                index=index, id=product_id, status="created"
+            )
+
+    for columns, group in upserts.items():
+        updated = [c for c in columns if c not in ("id", "created_at")]
+        await db.execute(
+            upsert_statement(
+                dialect_name,
+                Product,
+                [values for _, values in group],
+                ["id"],
+                lambda proposed: {c: proposed[c] for c in updated}
+            )
+        )
+        for index, values in group:
+            results[index] = ProductBulkResult(
+                index=index,
+                id=values["id"],
+                status="updated" if values["id"] in existing else "created"
+            )
+
+    if patches:
+        # ORM bulk UPDATE by primary key, sent as an executemany
+        await db.execute(update(Product), [values for _, values in patches])
+        for index, values in patches:
+            results[index] = ProductBulkResult(
+                index=index, id=values["id"], status="updated"
+            )
+
+
+# PUBLIC_INTERFACE
+async def bulk_upsert_products(
+    db: AsyncSession,
+    items: Sequence[ProductBulkItem],
+    chunk_size: int = BULK_CHUNK_SIZE
+) -> List[ProductBulkResult]:
+    """
+    Create and update many products with set-based statements.
+
+    Rows are written in chunks of ``chunk_size``, each chunk with a handful
+    of multi-row statements inside its own transaction. A failing chunk is
+    rolled back and its rows are reported as ``error`` without affecting
+    other chunks.
+
+    Args:
+        db (AsyncSession): Database session
+        items (Sequence[ProductBulkItem]): Rows to apply
+        chunk_size (int): Rows per chunk and transaction
+
+    Returns:
+        List[ProductBulkResult]: One result per input row, in input order
+    """
+    results: List[ProductBulkResult] = [None] * len(items)
+    valid = []
+    seen = set()
+    for index, item in enumerate(items):
+        if item.id is not None:
+            # One upsert statement cannot touch a row twice (SQLite rejects
+            # it, MySQL applies the last row), so later copies are refused
+            if item.id in seen:
+                results[index] = ProductBulkResult(
+                    index=index,
+                    id=item.id,
+                    status="invalid",
+                    detail="Product appears more than once in the request"
+                )
+                continue
+            seen.add(item.id)
+        fields = item.model_dump(exclude_unset=True, exclude={"id"})
+        try:
+            full = ProductCreate.model_validate(fields)
+        except PydanticValidationError as e:
+            full = None
+            if item.id is None:
+                results[index] = ProductBulkResult(
+                    index=index,
+                    status="invalid",
+                    detail=str(e)
+                )
+                continue
+        if item.id is not None and not fields:
+            results[index] = ProductBulkResult(
+                index=index,
+                id=item.id,
+                status="invalid",
+                detail="No fields to update"
+            )
+            continue
+        valid.append((index, item, full))
+
+    for start in range(0, len(valid), chunk_size):
+        chunk = valid[start:start + chunk_size]
+        try:
+            await _apply_chunk(db, chunk, results)
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            for index, item, _ in chunk:
+                results[index] = ProductBulkResult(
+                    index=index,
+                    id=item.id,
+                    status="error",
+                    detail=f"Error applying row: {str(e)}"
+                )
+    return results
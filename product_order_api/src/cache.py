@@ -0,0 +1,237 @@
+"""Read-through cache for product lookups."""
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+# PUBLIC_INTERFACE
+class CacheBackend(ABC):
+    """
+    Storage interface for cached values.
+
+    Methods are coroutines so that shared backends can talk to a network
+    store without blocking the event loop.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for ``key`` or None on a miss."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any) -> None:
+        """Store ``value`` under ``key``."""
+
+    @abstractmethod
+    async def delete(self, keys: Iterable[str]) -> None:
+        """Remove ``keys`` from the cache."""
+
+    def stats(self) -> Dict[str, Any]:
+        """Return backend specific statistics."""
+        return {}
+
+
+# PUBLIC_INTERFACE
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Bounded in-process cache with per-entry TTL and LRU eviction.
+
+    Each worker process holds its own copy, so invalidations are only seen
+    by the process that performed the write; keep the TTL short when
+    running several workers.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "evictions": self.evictions,
+        }
+
+
+# PUBLIC_INTERFACE
+class KeyValueCacheBackend(CacheBackend):
+    """
+    Shared cache stored in an external key-value service.
+
+    ``client`` must provide coroutine methods ``get(key)``,
+    ``set(key, value, ex=seconds)`` and ``delete(*keys)`` (the
+    ``redis.asyncio`` client does), so every worker shares the same entries
+    and sees every invalidation. Values are stored as JSON.
+    """
+
+    def __init__(self, client: Any, ttl: float, prefix: str = "cache:") -> None:
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    async def set(self, key: str, value: Any) -> None:
+        await self.client.set(
+            self.prefix + key, json.dumps(value), ex=int(self.ttl)
+        )
+
+    async def delete(self, keys: Iterable[str]) -> None:
+        prefixed = [self.prefix + key for key in keys]
+        if prefixed:
+            await self.client.delete(*prefixed)
+
+
+# PUBLIC_INTERFACE
+class ProductCache:
+    """
+    Product lookups cache keyed by product id, with hit/miss counters.
+
+    A read that misses takes the current :meth:`generation` before loading
+    the product and passes it to :meth:`set`; the fill is dropped if the
+    product was invalidated in between, so a write that commits while the
+    row is being read cannot be hidden behind the pre-write row for the
+    whole TTL. Generations are tracked per process, like the invalidations
+    of the in-memory backend.
+
+    Args:
+        backend (CacheBackend): Storage of the cached documents
+        history (int): Number of recent invalidations remembered; fills
+            that started before the oldest of them are dropped
+    """
+
+    def __init__(self, backend: CacheBackend, history: int = 10000) -> None:
+        self.backend = backend
+        self.history = history
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.stale_fills = 0
+        # Generation of the last invalidation of each recently changed id
+        self._invalidated: "OrderedDict[int, int]" = OrderedDict()
+        self._generation = 0
+        self._forgotten = 0
+
+    @staticmethod
+    def _key(product_id: int) -> str:
+        return f"product:{product_id}"
+
+    async def get(self, product_id: int) -> Optional[Dict[str, Any]]:
+        """Return the cached product representation, counting hits/misses."""
+        value = await self.backend.get(self._key(product_id))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def generation(self) -> int:
+        """Return the invalidation generation to pass to :meth:`set`."""
+        return self._generation
+
+    def _invalidated_since(self, product_id: int, generation: int) -> bool:
+        if generation < self._forgotten:
+            # The id may have been invalidated and dropped from the history
+            return True
+        return self._invalidated.get(product_id, 0) > generation
+
+    async def set(
+        self,
+        product_id: int,
+        value: Dict[str, Any],
+        generation: Optional[int] = None
+    ) -> None:
+        """
+        Cache the JSON-compatible representation of a product.
+
+        Args:
+            product_id (int): Product ID
+            value (Dict[str, Any]): Product document
+            generation (Optional[int]): :meth:`generation` taken before
+                ``value`` was read; the value is not cached if the product
+                has been invalidated since
+        """
+        if generation is not None and self._invalidated_since(
+            product_id, generation
+        ):
+            self.stale_fills += 1
+            return
+        await self.backend.set(self._key(product_id), value)
+
+    async def invalidate(self, product_ids: Iterable[int]) -> None:
+        """Drop cached entries of products changed by a write."""
+        product_ids = set(product_ids)
+        for product_id in product_ids:
+            self._generation += 1
+            self._invalidated[product_id] = self._generation
+            self._invalidated.move_to_end(product_id)
+        while len(self._invalidated) > self.history:
+            _, self._forgotten = self._invalidated.popitem(last=False)
+        keys = [self._key(product_id) for product_id in product_ids]
+        self.invalidations += len(keys)
+        await self.backend.delete(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and backend statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "stale_fills": self.stale_fills,
+            **self.backend.stats(),
+        }
+
+
+def _create_product_cache() -> ProductCache:
+    """Create the process-wide product cache from environment settings."""
+    max_size = int(os.getenv("PRODUCT_CACHE_MAX_SIZE", "10000"))
+    ttl = float(os.getenv("PRODUCT_CACHE_TTL", "60"))
+    return ProductCache(InMemoryCacheBackend(max_size=max_size, ttl=ttl))
+
+
+product_cache = _create_product_cache()
+
+
+# PUBLIC_INTERFACE
+def get_product_cache() -> ProductCache:
+    """
+    Get the product cache.
+
+    Exposed as a dependency so a shared backend can be swapped in, e.g.
+    ``ProductCache(KeyValueCacheBackend(redis_client, ttl=60))``.
+
+    Returns:
+        ProductCache: Process-wide product cache
+    """
+    return product_cache
@@ -0,0 +1,201 @@
+"""Conditional GET: weak ETags, Last-Modified and 304 responses.
+
+Validators are derived from ``updated_at``, which every write to products
+and orders advances. A detail endpoint compares them with the client's
+``If-None-Match`` / ``If-Modified-Since`` using a single ``SELECT
+updated_at`` before loading anything else, and answers ``304 Not
+Modified`` when they match.
+
+List endpoints tag a page with the ids and ``updated_at`` of its rows, so
+a deleted, added or changed row changes the tag. They send no
+``Last-Modified``: a deletion does not advance any ``updated_at``.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Iterable, Optional
+
+from fastapi import Header, Request, Response, status
+
+
+def _weak_etag(*parts: Any) -> str:
+    """Hash ``parts`` into a weak entity tag."""
+    digest = hashlib.blake2b(
+        "\x1f".join(str(part) for part in parts).encode(), digest_size=12
+    )
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _http_date(moment: datetime) -> str:
+    """Format a naive UTC datetime as an HTTP date."""
+    return format_datetime(moment.replace(tzinfo=timezone.utc), usegmt=True)
+
+
+# PUBLIC_INTERFACE
+def entity_etag(entity_id: int, updated_at: datetime) -> str:
+    """
+    Build the weak ETag of one product or order.
+
+    Args:
+        entity_id (int): Primary key
+        updated_at (datetime): Last update timestamp
+
+    Returns:
+        str: Weak entity tag, e.g. ``W/"3f1c..."``
+    """
+    return _weak_etag(entity_id, updated_at.isoformat())
+
+
+# PUBLIC_INTERFACE
+def page_etag(query: str, rows: Iterable[Any]) -> str:
+    """
+    Build the weak ETag of a list page.
+
+    Args:
+        query (str): Request query string; pages of different filters,
+            sorts or positions get different tags
+        rows (Iterable[Any]): Rows of the page with ``id`` and
+            ``updated_at``
+
+    Returns:
+        str: Weak entity tag
+    """
+    return _weak_etag(
+        query, *(f"{row.id}@{row.updated_at.isoformat()}" for row in rows)
+    )
+
+
+# PUBLIC_INTERFACE
+def validator_headers(
+    etag: str,
+    last_modified: Optional[datetime] = None
+) -> Dict[str, str]:
+    """
+    Build the ``ETag`` and ``Last-Modified`` response headers.
+
+    Args:
+        etag (str): Entity tag
+        last_modified (Optional[datetime]): Naive UTC time of the last
+            change, None to omit ``Last-Modified``
+
+    Returns:
+        Dict[str, str]: Response headers
+    """
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = _http_date(last_modified)
+    return headers
+
+
+# PUBLIC_INTERFACE
+def not_modified(
+    etag: str,
+    last_modified: Optional[datetime] = None
+) -> Response:
+    """
+    Build an empty ``304 Not Modified`` response carrying the validators.
+
+    Args:
+        etag (str): Entity tag
+        last_modified (Optional[datetime]): Naive UTC time of the last change
+
+    Returns:
+        Response: 304 response
+    """
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=validator_headers(etag, last_modified)
+    )
+
+
+# PUBLIC_INTERFACE
+class Preconditions:
+    """
+    Conditional request headers of a GET request.
+
+    Args:
+        if_none_match (Optional[str]): ``If-None-Match`` header
+        if_modified_since (Optional[str]): ``If-Modified-Since`` header
+        query (str): Request query string
+    """
+
+    def __init__(
+        self,
+        if_none_match: Optional[str],
+        if_modified_since: Optional[str],
+        query: str = ""
+    ) -> None:
+        self.if_none_match = if_none_match
+        self.if_modified_since = if_modified_since
+        self.query = query
+
+    def __bool__(self) -> bool:
+        """Whether the client sent a validator to compare."""
+        return bool(self.if_none_match or self.if_modified_since)
+
+    def _modified_since(self) -> Optional[datetime]:
+        try:
+            moment = parsedate_to_datetime(self.if_modified_since)
+        except (TypeError, ValueError):
+            # An invalid date is ignored, as if the header was not sent
+            return None
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+        return moment
+
+    def matches(
+        self,
+        etag: str,
+        last_modified: Optional[datetime] = None
+    ) -> bool:
+        """
+        Check whether the client's copy is current, i.e. a 304 applies.
+
+        ``If-None-Match`` is compared with weak comparison and takes
+        precedence; ``If-Modified-Since`` is only evaluated without it,
+        at the one second resolution of HTTP dates.
+
+        Args:
+            etag (str): Current entity tag
+            last_modified (Optional[datetime]): Naive UTC time of the last
+                change, None when the resource has no ``Last-Modified``
+
+        Returns:
+            bool: True if the response would be unchanged
+        """
+        if self.if_none_match:
+            current = etag.removeprefix("W/")
+            for tag in self.if_none_match.split(","):
+                tag = tag.strip()
+                if tag == "*" or tag.removeprefix("W/") == current:
+                    return True
+            return False
+        if self.if_modified_since and last_modified is not None:
+            since = self._modified_since()
+            return (
+                since is not None
+                and last_modified.replace(microsecond=0) <= since
+            )
+        return False
+
+
+# PUBLIC_INTERFACE
+def get_preconditions(
+    request: Request,
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    if_modified_since: Optional[str] = Header(
+        None, alias="If-Modified-Since"
+    )
+) -> Preconditions:
+    """
+    FastAPI dependency collecting the conditional headers of a request.
+
+    Args:
+        request (Request): Incoming request
+        if_none_match (Optional[str]): ``If-None-Match`` header
+        if_modified_since (Optional[str]): ``If-Modified-Since`` header
+
+    Returns:
+        Preconditions: Headers to evaluate against the current validators
+    """
+    return Preconditions(if_none_match, if_modified_since, request.url.query)
@@ -1,30 +1,50 @@
 """Database configuration module for Amazon RDS MySQL connection."""
+import itertools
 import os
+import time
 from dotenv import load_dotenv
-from typing import Generator
-from sqlalchemy import create_engine
+from typing import AsyncGenerator, List, Optional, Sequence
+from fastapi import Request
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine
+)
+from sqlalchemy import DateTime
+from sqlalchemy.dialects.mysql import DATETIME as MYSQL_DATETIME
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.pool import QueuePool
+
+from src.pool import InstrumentedQueuePool
 
 
 # PUBLIC_INTERFACE
 Base = declarative_base()
+
+# DATETIME with microseconds on MySQL, whose default keeps whole seconds;
+# used for update timestamps that must change on every write, such as the
+# ones ETags are derived from
+# PUBLIC_INTERFACE
+PreciseDateTime = DateTime().with_variant(MYSQL_DATETIME(fsp=6), "mysql")
 load_dotenv()
 
 def get_database_url() -> str:
     """
     Construct database URL from environment variables.
 
+    The URL always names an asyncio driver: ``aiosqlite`` for testing and
+    ``aiomysql`` for MySQL unless overridden with ``DB_DRIVER`` (for example
+    ``asyncmy``).
+
     Returns:
         str: The database URL for SQLAlchemy
     """
     # Use SQLite for testing
     if os.getenv("TESTING", "false").lower() == "true":
-        return "sqlite:///:memory:"
+        return "sqlite+aiosqlite:///:memory:"
 
     # Use MySQL for production
+    db_driver = os.getenv("DB_DRIVER", "aiomysql")
     db_user = os.getenv("DB_USER", "admin")
     db_password = os.getenv("DB_PASSWORD", "password")
     db_host = os.getenv("DB_HOST", "localhost")
@@ -32,14 +52,72 @@ def get_database_url() -> str:
     db_name = os.getenv("DB_NAME", "product_order_db")
 
     return (
-        f"mysql+pymysql://{db_user}:{db_password}@"
+        f"mysql+{db_driver}://{db_user}:{db_password}@"
         f"{db_host}:{db_port}/{db_name}"
     )
 
 
+# PUBLIC_INTERFACE
+def get_read_database_urls() -> List[str]:
+    """
+    Construct read replica URLs from environment variables.
+
+    ``DB_READ_HOSTS`` is a comma separated list of ``host`` or ``host:port``
+    entries (for example the RDS reader endpoint or individual replica
+    endpoints). Credentials, driver and database name are shared with the
+    writer.
+
+    Returns:
+        List[str]: One URL per replica, empty when no replicas are configured
+    """
+    if os.getenv("TESTING", "false").lower() == "true":
+        return []
+
+    db_driver = os.getenv("DB_DRIVER", "aiomysql")
+    db_user = os.getenv("DB_USER", "admin")
+    db_password = os.getenv("DB_PASSWORD", "password")
+    db_port = os.getenv("DB_PORT", "3306")
+    db_name = os.getenv("DB_NAME", "product_order_db")
+
+    urls = []
+    for entry in os.getenv("DB_READ_HOSTS", "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        host, _, port = entry.partition(":")
+        urls.append(
+            f"mysql+{db_driver}://{db_user}:{db_password}@"
+            f"{host}:{port or db_port}/{db_name}"
+        )
+    return urls
+
+
+def _env_flag(name: str, default: str = "false") -> bool:
+    """Read a boolean environment variable."""
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
 # Configure SQLAlchemy engine
 def get_engine_config():
-    """Get database engine configuration based on environment."""
+    """
+    Get database engine configuration based on environment.
+
+    Pool settings can be tuned per deployment; size them so that
+    ``workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW)`` stays below the RDS
+    ``max_connections`` of the instance:
+
+    * ``DB_POOL_SIZE`` (5): connections kept open per worker
+    * ``DB_MAX_OVERFLOW`` (10): extra connections opened under load
+    * ``DB_POOL_TIMEOUT`` (30): seconds to wait for a free connection
+    * ``DB_POOL_RECYCLE`` (1800): seconds before a connection is replaced
+    * ``DB_POOL_PRE_PING`` (false): test connections on checkout, which
+      survives RDS failovers at the cost of a round trip
+    * ``DB_POOL_USE_LIFO`` (false): reuse the most recent connection so
+      idle extras can time out server-side
+
+    Returns:
+        dict: Keyword arguments for ``create_async_engine``
+    """
     is_testing = os.getenv("TESTING", "false").lower() == "true"
     
     if is_testing:
@@ -49,28 +127,163 @@ def get_engine_config():
         }
     
     return {
-        "poolclass": QueuePool,
-        "pool_size": 5,
-        "max_overflow": 10,
-        "pool_timeout": 30,
-        "pool_recycle": 1800,
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": _env_flag("DB_POOL_PRE_PING"),
+        "pool_use_lifo": _env_flag("DB_POOL_USE_LIFO"),
         "echo": False
     }
 
-engine = create_engine(get_database_url(), **get_engine_config())
+engine = create_async_engine(get_database_url(), **get_engine_config())
 
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create session factory. Objects stay usable after commit so handlers can
+# serialize them without another round trip to the database.
+SessionLocal = async_sessionmaker(
+    bind=engine,
+    autoflush=False,
+    expire_on_commit=False
+)
 
 
 # PUBLIC_INTERFACE
-def get_db() -> Generator[Session, None, None]:
+class ReplicaRouter:
+    """
+    Pick the session factory serving a read-only request.
+
+    Each replica has its own engine and connection pool. Replicas are
+    chosen round-robin, or with the ``least_busy`` strategy by the fewest
+    connections currently checked out of their pool. Without replicas, or
+    when the client must see its own recent writes, reads go to the writer.
+    """
+
+    STRATEGIES = ("round_robin", "least_busy")
+
+    def __init__(
+        self,
+        primary: async_sessionmaker,
+        replicas: Sequence[async_sessionmaker] = (),
+        strategy: str = "round_robin"
+    ) -> None:
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown replica selection strategy: {strategy}")
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.strategy = strategy
+        self._next = itertools.cycle(range(len(self.replicas)))
+
+    def session_factory(self, sticky: bool = False) -> async_sessionmaker:
+        """
+        Return the session factory for a read.
+
+        Args:
+            sticky (bool): Whether the client wrote recently and must read
+                from the writer
+
+        Returns:
+            async_sessionmaker: Writer or replica session factory
+        """
+        if sticky or not self.replicas:
+            return self.primary
+        if self.strategy == "least_busy":
+            return min(
+                self.replicas,
+                key=lambda factory: factory.kw["bind"].pool.checkedout()
+            )
+        return self.replicas[next(self._next)]
+
+
+# Seconds a client keeps reading from the writer after a write, covering
+# the replication lag of the replicas
+READ_STICKY_SECONDS = float(os.getenv("DB_READ_STICKY_SECONDS", "5"))
+
+# Cookie recording when the client last wrote
+READ_STICKY_COOKIE = "db_last_write"
+
+read_engines = [
+    create_async_engine(url, **get_engine_config())
+    for url in get_read_database_urls()
+]
+
+read_router = ReplicaRouter(
+    SessionLocal,
+    [
+        async_sessionmaker(
+            bind=read_engine,
+            autoflush=False,
+            expire_on_commit=False
+        )
+        for read_engine in read_engines
+    ],
+    os.getenv("DB_READ_STRATEGY", "round_robin")
+)
+
+
+# PUBLIC_INTERFACE
+def is_read_sticky(
+    last_write: Optional[str],
+    now: Optional[float] = None
+) -> bool:
+    """
+    Check whether a client wrote recently enough to read from the writer.
+
+    Args:
+        last_write (Optional[str]): Value of the last-write cookie, a Unix
+            timestamp
+        now (Optional[float]): Current Unix time, defaults to the clock
+
+    Returns:
+        bool: True if reads must go to the writer
+    """
+    if not last_write:
+        return False
+    try:
+        written_at = float(last_write)
+    except ValueError:
+        return False
+    now = time.time() if now is None else now
+    return now - written_at < READ_STICKY_SECONDS
+
+
+# PUBLIC_INTERFACE
+def get_read_sticky(request: Request) -> bool:
+    """
+    Check whether the client of a request must read its own writes.
+
+    Args:
+        request (Request): Incoming request
+
+    Returns:
+        bool: True if the ``db_last_write`` cookie is recent enough that
+            reads must go to the writer
+    """
+    return is_read_sticky(request.cookies.get(READ_STICKY_COOKIE))
+
+
+# PUBLIC_INTERFACE
+def is_replica_session(db: AsyncSession) -> bool:
+    """
+    Check whether a session reads from a replica, which may lag the writer.
+
+    Args:
+        db (AsyncSession): Session from :func:`get_read_db`
+
+    Returns:
+        bool: True if the session is bound to a read replica
+    """
+    return db.info.get("replica", False)
+
+
+# PUBLIC_INTERFACE
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Get database session from the connection pool.
 
     Yields:
-        Session: SQLAlchemy session object
+        AsyncSession: SQLAlchemy asyncio session object
 
     Raises:
         SQLAlchemyError: If there's an issue with the database connection
@@ -79,20 +292,68 @@ def get_db() -> Generator[Session, None, None]:
     try:
         yield db
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
+        raise e
+    finally:
+        await db.close()
+
+
+# PUBLIC_INTERFACE
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get a database session for a read-only endpoint.
+
+    The session comes from a read replica when replicas are configured,
+    unless the client wrote within ``DB_READ_STICKY_SECONDS`` (tracked by
+    the ``db_last_write`` cookie), in which case the writer serves the read
+    so the client sees its own changes. Replica sessions are flagged for
+    :func:`is_replica_session`.
+
+    Args:
+        request (Request): Incoming request
+
+    Yields:
+        AsyncSession: SQLAlchemy asyncio session object
+
+    Raises:
+        SQLAlchemyError: If there's an issue with the database connection
+    """
+    factory = read_router.session_factory(get_read_sticky(request))
+    db = factory()
+    db.info["replica"] = factory is not read_router.primary
+    try:
+        yield db
+    except SQLAlchemyError as e:
+        await db.rollback()
         raise e
     finally:
-        db.close()
+        await db.close()
+
+
+# PUBLIC_INTERFACE
+def get_session_factory() -> async_sessionmaker:
+    """
+    Get the session factory for work that outlives the request handler.
+
+    Streaming responses keep reading from the database after the handler
+    has returned, when the session from ``get_db`` is already closed; they
+    open their own session from this factory instead.
+
+    Returns:
+        async_sessionmaker: Factory producing AsyncSession objects
+    """
+    return SessionLocal
 
 
 # PUBLIC_INTERFACE
-def init_db() -> None:
+async def init_db() -> None:
     """
     Initialize database by creating all tables.
 
     This function should be called when the application starts.
     """
     try:
-        Base.metadata.create_all(bind=engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
     except SQLAlchemyError as e:
         raise Exception(f"Failed to initialize database: {str(e)}")
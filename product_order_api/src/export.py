@@ -0,0 +1,157 @@
+"""Streaming serialization of orders for bulk export."""
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Dict, Iterable, Optional
+
+from sqlalchemy import Select, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.models.order import Order, OrderItem
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+CSV_HEADER = (
+    "order_id",
+    "customer_name",
+    "customer_email",
+    "total_amount",
+    "status",
+    "created_at",
+    "updated_at",
+    "item_id",
+    "product_id",
+    "quantity",
+    "unit_price",
+    "subtotal",
+)
+
+
+# PUBLIC_INTERFACE
+def export_query() -> Select:
+    """
+    Build the flat order/item query backing the export.
+
+    Plain columns are selected instead of ORM entities so rows are never
+    added to a session identity map, keeping memory flat however many
+    orders are exported. Rows are ordered by order so items of the same
+    order are adjacent.
+
+    Returns:
+        Select: One row per order item; orders without items appear once
+            with NULL item columns
+    """
+    return (
+        select(
+            Order.id.label("order_id"),
+            Order.customer_name,
+            Order.customer_email,
+            Order.total_amount,
+            Order.status,
+            Order.created_at,
+            Order.updated_at,
+            OrderItem.id.label("item_id"),
+            OrderItem.product_id,
+            OrderItem.quantity,
+            OrderItem.unit_price,
+            OrderItem.subtotal,
+        )
+        .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+        .order_by(Order.id, OrderItem.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+
+async def _stream_partitions(
+    session_factory: async_sessionmaker,
+    query: Select
+) -> AsyncIterator[Iterable[Row]]:
+    """Yield batches of rows read through a server-side cursor."""
+    async with session_factory() as db:
+        result = await db.stream(query)
+        async for partition in result.partitions():
+            yield partition
+
+
+def _order_dict(row: Row) -> Dict[str, Any]:
+    """Build the NDJSON document for the order of a row."""
+    return {
+        "id": row.order_id,
+        "customer_name": row.customer_name,
+        "customer_email": row.customer_email,
+        "total_amount": row.total_amount,
+        "status": row.status,
+        "created_at": row.created_at.isoformat(),
+        "updated_at": row.updated_at.isoformat(),
+        "order_items": [],
+    }
+
+
+# PUBLIC_INTERFACE
+async def stream_ndjson(
+    session_factory: async_sessionmaker,
+    query: Select
+) -> AsyncIterator[str]:
+    """
+    Stream orders as newline-delimited JSON, one order with items per line.
+
+    Args:
+        session_factory (async_sessionmaker): Factory for the export session
+        query (Select): Query built by :func:`export_query`
+
+    Yields:
+        str: Chunk of complete NDJSON lines
+    """
+    current: Optional[Dict[str, Any]] = None
+    async for partition in _stream_partitions(session_factory, query):
+        lines = []
+        for row in partition:
+            if current is None or current["id"] != row.order_id:
+                if current is not None:
+                    lines.append(json.dumps(current))
+                current = _order_dict(row)
+            if row.item_id is not None:
+                current["order_items"].append({
+                    "id": row.item_id,
+                    "product_id": row.product_id,
+                    "quantity": row.quantity,
+                    "unit_price": row.unit_price,
+                    "subtotal": row.subtotal,
+                })
+        if lines:
+            yield "\n".join(lines) + "\n"
+    if current is not None:
+        yield json.dumps(current) + "\n"
+
+
+# PUBLIC_INTERFACE
+async def stream_csv(
+    session_factory: async_sessionmaker,
+    query: Select
+) -> AsyncIterator[str]:
+    """
+    Stream orders as CSV with one line per order item.
+
+    Args:
+        session_factory (async_sessionmaker): Factory for the export session
+        query (Select): Query built by :func:`export_query`
+
+    Yields:
+        str: Chunk of complete CSV lines, starting with the header
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_HEADER)
+    async for partition in _stream_partitions(session_factory, query):
+        for row in partition:
+            writer.writerow(
+                value.isoformat() if hasattr(value, "isoformat") else value
+                for value in row
+            )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
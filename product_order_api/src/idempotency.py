@@ -0,0 +1,261 @@
+"""Idempotency-Key handling for retried write requests."""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.database import SessionLocal
+from src.errors import ValidationError
+from src.models.idempotency import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+# How long a key and its stored response are kept
+IDEMPOTENCY_KEY_TTL = timedelta(
+    hours=float(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+)
+
+# Expired keys deleted per purge statement, bounding its locks and duration
+IDEMPOTENCY_PURGE_BATCH = int(os.getenv("IDEMPOTENCY_PURGE_BATCH", "500"))
+
+# Seconds between background purges; 0 disables the background purge
+IDEMPOTENCY_PURGE_SECONDS = float(
+    os.getenv("IDEMPOTENCY_PURGE_SECONDS", "300")
+)
+
+
+# PUBLIC_INTERFACE
+def request_fingerprint(payload: Dict[str, Any]) -> str:
+    """
+    Hash a request body independently of key order and whitespace.
+
+    Args:
+        payload (Dict[str, Any]): JSON-compatible request body
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+async def _find(
+    db: AsyncSession,
+    key: str,
+    fingerprint: str
+) -> Optional[IdempotencyKey]:
+    """Load a live key, dropping it if expired."""
+    record = await db.get(IdempotencyKey, key, populate_existing=True)
+    if record is None:
+        return None
+    if record.expires_at <= datetime.utcnow():
+        await db.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.key == key)
+        )
+        db.expunge(record)
+        return None
+    if record.request_hash != fingerprint:
+        raise ValidationError(
+            "Idempotency-Key was already used with a different request body"
+        )
+    return record
+
+
+# PUBLIC_INTERFACE
+async def claim_idempotency_key(
+    db: AsyncSession,
+    key: str,
+    fingerprint: str
+) -> IdempotencyKey:
+    """
+    Claim a key inside the current transaction or return its stored outcome.
+
+    A new key is inserted without a response; the caller performs the
+    write, stores the response with :func:`store_response` and commits,
+    so the key and the write become visible together. If another request
+    holds the key, the insert blocks until that transaction ends and the
+    committed record is returned instead.
+
+    Args:
+        db (AsyncSession): Database session
+        key (str): ``Idempotency-Key`` header value
+        fingerprint (str): Result of :func:`request_fingerprint`
+
+    Returns:
+        IdempotencyKey: The new claim, whose ``response_body`` is None, or
+            the completed record to replay
+
+    Raises:
+        ValidationError: If the key was used with a different request body
+    """
+    record = await _find(db, key, fingerprint)
+    if record is not None:
+        return record
+
+    record = IdempotencyKey(
+        key=key,
+        request_hash=fingerprint,
+        expires_at=datetime.utcnow() + IDEMPOTENCY_KEY_TTL
+    )
+    db.add(record)
+    try:
+        await db.flush()
+    except IntegrityError:
+        # A concurrent request with the same key committed first
+        await db.rollback()
+        record = await _find(db, key, fingerprint)
+        if record is None:
+            raise
+    return record
+
+
+# PUBLIC_INTERFACE
+def store_response(
+    record: IdempotencyKey,
+    status_code: int,
+    body: Dict[str, Any]
+) -> None:
+    """
+    Attach the response of a keyed request to its claim.
+
+    Args:
+        record (IdempotencyKey): Claim returned by
+            :func:`claim_idempotency_key`
+        status_code (int): HTTP status of the response
+        body (Dict[str, Any]): JSON-compatible response body
+    """
+    record.status_code = status_code
+    record.response_body = json.dumps(body)
+
+
+# PUBLIC_INTERFACE
+def replay_response(record: IdempotencyKey) -> JSONResponse:
+    """
+    Rebuild the stored response of a completed key.
+
+    Args:
+        record (IdempotencyKey): Completed record
+
+    Returns:
+        JSONResponse: Stored status and body, marked with an
+            ``Idempotent-Replayed`` header
+    """
+    return JSONResponse(
+        status_code=record.status_code,
+        content=json.loads(record.response_body),
+        headers={"Idempotent-Replayed": "true"}
+    )
+
+
+# PUBLIC_INTERFACE
+async def purge_expired_keys(
+    db: AsyncSession,
+    now: Optional[datetime] = None,
+    limit: int = IDEMPOTENCY_PURGE_BATCH
+) -> int:
+    """
+    Delete up to ``limit`` expired keys, oldest first.
+
+    The keys are found on the ``expires_at`` index and deleted by primary
+    key, which works on every dialect (MySQL rejects ``LIMIT`` in an
+    ``IN`` subquery). The caller commits.
+
+    Args:
+        db (AsyncSession): Session on the primary database
+        now (Optional[datetime]): Current UTC time, for tests
+        limit (int): Maximum number of keys to delete
+
+    Returns:
+        int: Number of keys found expired; fewer than ``limit`` means none
+            are left
+    """
+    now = now or datetime.utcnow()
+    keys = list(await db.scalars(
+        select(IdempotencyKey.key)
+        .where(IdempotencyKey.expires_at < now)
+        .order_by(IdempotencyKey.expires_at)
+        .limit(limit)
+    ))
+    if keys:
+        await db.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.key.in_(keys),
+                # A key may have been reclaimed since it was selected
+                IdempotencyKey.expires_at < now
+            )
+        )
+    return len(keys)
+
+
+# PUBLIC_INTERFACE
+class IdempotencyKeyPurger:
+    """
+    Background task deleting expired idempotency keys at a fixed interval.
+
+    Args:
+        session_factory (async_sessionmaker): Factory for primary sessions
+        interval (float): Seconds between purges
+        batch_size (int): Keys deleted per transaction
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        interval: float,
+        batch_size: int = IDEMPOTENCY_PURGE_BATCH
+    ) -> None:
+        self.session_factory = session_factory
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> int:
+        """
+        Purge every expired key, one batch per transaction.
+
+        Returns:
+            int: Number of keys purged
+        """
+        purged = 0
+        while True:
+            async with self.session_factory() as db:
+                count = await purge_expired_keys(db, limit=self.batch_size)
+                await db.commit()
+            purged += count
+            if count < self.batch_size:
+                return purged
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                # Keep purging; expired keys are retried on the next run
+                logger.exception("Idempotency key purge failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start purging on the running event loop."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop purging."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+idempotency_key_purger = None
+if IDEMPOTENCY_PURGE_SECONDS > 0:
+    idempotency_key_purger = IdempotencyKeyPurger(
+        SessionLocal, IDEMPOTENCY_PURGE_SECONDS
+    )
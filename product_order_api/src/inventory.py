@@ -0,0 +1,97 @@
+"""Stock reservation engine for product inventory."""
+from typing import Dict, Iterable, Mapping, Union
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.errors import BusinessLogicError, ResourceNotFoundError
+from src.models.order import OrderItem
+from src.models.product import Product
+from src.schemas.order import OrderItemCreate
+
+# Products per stock restoring UPDATE, bounding the size of its CASE
+RESTORE_CHUNK_SIZE = 500
+
+
+# PUBLIC_INTERFACE
+def merge_order_lines(
+    items: Iterable[Union[OrderItemCreate, OrderItem]]
+) -> Dict[int, int]:
+    """
+    Merge order lines of the same product so stock is handled per product.
+
+    Args:
+        items (Iterable[Union[OrderItemCreate, OrderItem]]): Requested or
+            stored order lines
+
+    Returns:
+        Dict[int, int]: Total quantity keyed by product ID, in order of
+            first appearance
+    """
+    quantities: Dict[int, int] = {}
+    for item in items:
+        quantities[item.product_id] = (
+            quantities.get(item.product_id, 0) + item.quantity
+        )
+    return quantities
+
+
+# PUBLIC_INTERFACE
+async def reserve_stock(db: AsyncSession, quantities: Mapping[int, int]) -> None:
+    """
+    Atomically reserve stock for every product in ``quantities``.
+
+    Each product is decremented with a single conditional UPDATE, so two
+    concurrent checkouts can never both take the last units of a product.
+    Products are updated in ascending id order, which makes transactions
+    touching overlapping products acquire row locks in the same order and
+    prevents deadlocks between them.
+
+    Args:
+        db (AsyncSession): Database session; the caller owns the transaction
+        quantities (Mapping[int, int]): Units to reserve keyed by product ID
+
+    Raises:
+        ResourceNotFoundError: If a product no longer exists
+        BusinessLogicError: If a product does not have enough stock. Rows
+            already updated in the transaction must be rolled back by the
+            caller.
+    """
+    for product_id in sorted(quantities):
+        quantity = quantities[product_id]
+        result = await db.execute(
+            Product.reserve_stock_statement(product_id, quantity)
+        )
+        if result.rowcount == 1:
+            continue
+
+        available = await db.scalar(
+            select(Product.stock).where(Product.id == product_id)
+        )
+        if available is None:
+            raise ResourceNotFoundError("Product", product_id)
+        msg = (
+            f"Insufficient stock for product {product_id}. "
+            f"Available: {available}, Requested: {quantity}"
+        )
+        raise BusinessLogicError(msg)
+
+
+# PUBLIC_INTERFACE
+async def restore_stock(db: AsyncSession, quantities: Mapping[int, int]) -> None:
+    """
+    Return stock of cancelled or deleted order lines to their products.
+
+    Uses one aggregated UPDATE per ``RESTORE_CHUNK_SIZE`` products instead
+    of loading and updating each product. Products deleted in the meantime
+    are skipped.
+
+    Args:
+        db (AsyncSession): Database session; the caller owns the transaction
+        quantities (Mapping[int, int]): Units to return keyed by product ID
+    """
+    product_ids = sorted(quantities)
+    for start in range(0, len(product_ids), RESTORE_CHUNK_SIZE):
+        chunk = product_ids[start:start + RESTORE_CHUNK_SIZE]
+        await db.execute(Product.restore_stock_statement(
+            {product_id: quantities[product_id] for product_id in chunk}
+        ))
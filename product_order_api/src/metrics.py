@@ -0,0 +1,341 @@
+"""In-process metrics: primitives, HTTP middleware and SQL timings."""
+import bisect
+import re
+import threading
+import time
+from typing import Any, Dict, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Upper bounds, in seconds, suited to request and query latencies
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+
+# PUBLIC_INTERFACE
+class Histogram:
+    """
+    Cumulative histogram with fixed bucket upper bounds.
+
+    Observations are counted in the first bucket whose bound is greater
+    than or equal to the value; values above the last bound only count
+    towards ``count`` and ``sum`` (the implicit ``+Inf`` bucket).
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.bucket_counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        # Pool events fire from whichever thread or greenlet checks out
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """
+        Record one observation.
+
+        Args:
+            value (float): Observed value, e.g. a duration in seconds
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            if index < len(self.buckets):
+                self.bucket_counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the current state as cumulative bucket counts.
+
+        Returns:
+            Dict[str, Any]: ``count``, ``sum`` and ``buckets`` mapping each
+                upper bound to the number of observations at or below it
+        """
+        with self._lock:
+            cumulative, buckets = 0, {}
+            for bound, bucket_count in zip(self.buckets, self.bucket_counts):
+                cumulative += bucket_count
+                buckets[str(bound)] = cumulative
+            buckets["+Inf"] = self.count
+            return {
+                "count": self.count,
+                "sum": round(self.sum, 6),
+                "buckets": buckets,
+            }
+
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\"", "\\\"")
+        .replace("\n", "\\n")
+    )
+
+
+def _format_labels(labels: Labels, **extra: str) -> str:
+    """Render labels as ``{name="value",...}``."""
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(
+        f'{name}="{_escape(value)}"' for name, value in pairs
+    ) + "}"
+
+
+# PUBLIC_INTERFACE
+class MetricsRegistry:
+    """
+    Labelled counters, gauges and histograms of this worker process.
+
+    Metrics must be declared with :meth:`describe` before use; samples are
+    kept per label set and rendered in the Prometheus text format.
+    """
+
+    def __init__(self) -> None:
+        self._types: Dict[str, Tuple[str, str]] = {}
+        self._samples: Dict[str, Dict[Labels, Any]] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, metric_type: str, help_text: str) -> None:
+        """
+        Declare a metric.
+
+        Args:
+            name (str): Metric name
+            metric_type (str): ``counter``, ``gauge`` or ``histogram``
+            help_text (str): Description shown in the exposition
+        """
+        self._types[name] = (metric_type, help_text)
+        self._samples.setdefault(name, {})
+
+    def inc(self, name: str, labels: Dict[str, str], amount: float = 1) -> None:
+        """Add ``amount`` to a counter or gauge."""
+        key = tuple(labels.items())
+        with self._lock:
+            samples = self._samples[name]
+            samples[key] = samples.get(key, 0) + amount
+
+    def observe(self, name: str, labels: Dict[str, str], value: float) -> None:
+        """Record an observation in a histogram."""
+        key = tuple(labels.items())
+        with self._lock:
+            histogram = self._samples[name].get(key)
+            if histogram is None:
+                histogram = self._samples[name][key] = Histogram()
+        histogram.observe(value)
+
+    def value(self, name: str, labels: Dict[str, str]) -> Any:
+        """
+        Get the current sample of a metric.
+
+        Args:
+            name (str): Metric name
+            labels (Dict[str, str]): Label values, in declaration order
+
+        Returns:
+            Any: Counter or gauge value, or :class:`Histogram`; None if the
+                label set was never recorded
+        """
+        return self._samples[name].get(tuple(labels.items()))
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text
+        """
+        lines = []
+        with self._lock:
+            samples = {
+                name: list(values.items())
+                for name, values in self._samples.items()
+            }
+        for name, (metric_type, help_text) in self._types.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, sample in samples[name]:
+                if metric_type != "histogram":
+                    lines.append(f"{name}{_format_labels(labels)} {sample}")
+                    continue
+                snapshot = sample.snapshot()
+                for bound, count in snapshot["buckets"].items():
+                    bucket_labels = _format_labels(labels, le=bound)
+                    lines.append(f"{name}_bucket{bucket_labels} {count}")
+                lines.append(
+                    f"{name}_sum{_format_labels(labels)} {snapshot['sum']}"
+                )
+                lines.append(
+                    f"{name}_count{_format_labels(labels)} {snapshot['count']}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+registry.describe(
+    "http_requests_total", "counter", "HTTP requests by route and status."
+)
+registry.describe(
+    "http_request_duration_seconds",
+    "histogram",
+    "HTTP request latency by route, until the last body chunk is sent."
+)
+registry.describe(
+    "http_requests_in_progress", "gauge", "HTTP requests being served."
+)
+registry.describe(
+    "db_statement_duration_seconds",
+    "histogram",
+    "SQL statement execution time by normalized statement."
+)
+
+# Label for requests that match no route, so unknown paths cannot create
+# unbounded label sets
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+# PUBLIC_INTERFACE
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request count, latency and in-flight gauges.
+
+    Requests are labelled with the route template (``/orders/{order_id}``)
+    rather than the raw path.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    def _route_template(self, scope: Scope) -> str:
+        """Find the path template of the route serving the request."""
+        router = scope["app"].router
+        partial = None
+        for route in router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+            if match == Match.PARTIAL and partial is None:
+                partial = route.path
+        return partial or UNMATCHED_ROUTE
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        labels = {
+            "method": scope["method"],
+            "route": self._route_template(scope)
+        }
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        registry.inc("http_requests_in_progress", labels)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            registry.observe(
+                "http_request_duration_seconds",
+                labels,
+                time.perf_counter() - started
+            )
+            registry.inc("http_requests_in_progress", labels, -1)
+            registry.inc(
+                "http_requests_total",
+                {**labels, "status": str(status_code)}
+            )
+
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|%\(\w+\)s|\?|:\w+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_REPEATED_ROWS = re.compile(r"(\([?, .]+\))(?:\s*,\s*\([?, .]+\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+# Longest normalized statement kept as a label value
+MAX_STATEMENT_LENGTH = 200
+
+
+# PUBLIC_INTERFACE
+def normalize_statement(statement: str) -> str:
+    """
+    Reduce a SQL statement to its shape for use as a metric label.
+
+    Literals and bound parameters become ``?``, lists of placeholders (IN
+    lists, multi-row VALUES) collapse to one element, and whitespace is
+    squeezed.
+
+    Args:
+        statement (str): SQL as sent to the driver
+
+    Returns:
+        str: Normalized statement, truncated to ``MAX_STATEMENT_LENGTH``
+    """
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _PLACEHOLDER.sub("?", statement)
+    statement = _NUMBER.sub("?", statement)
+    statement = _PLACEHOLDER_LIST.sub("(?, ...)", statement)
+    statement = _REPEATED_ROWS.sub(r"\1, ...", statement)
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    return statement[:MAX_STATEMENT_LENGTH]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context,
+                           executemany):
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context,
+                          executemany):
+    started = conn.info["metrics_query_start"].pop()
+    registry.observe(
+        "db_statement_duration_seconds",
+        {"statement": normalize_statement(statement)},
+        time.perf_counter() - started
+    )
+
+
+def _handle_error(context):
+    # Failed statements never reach after_cursor_execute
+    if context.connection is None:
+        return
+    starts = context.connection.info.get("metrics_query_start")
+    if starts:
+        starts.pop()
+
+
+# PUBLIC_INTERFACE
+def instrument_engine(engine: Engine) -> None:
+    """
+    Record the execution time of every statement run through an engine.
+
+    Args:
+        engine (Engine): Synchronous engine, e.g. ``AsyncEngine.sync_engine``
+    """
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,31 @@
+"""Idempotency key model module."""
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, String, Text
+from src.database import Base
+
+
+# PUBLIC_INTERFACE
+class IdempotencyKey(Base):
+    """
+    IdempotencyKey model recording the outcome of a keyed request.
+
+    The key is the primary key, so two requests carrying the same key can
+    never both be recorded: the second insert waits for the first
+    transaction and then fails with a duplicate key error.
+
+    Attributes:
+        key (str): Client supplied ``Idempotency-Key`` header value
+        request_hash (str): SHA-256 of the canonical request body
+        status_code (int): HTTP status of the stored response
+        response_body (str): JSON response body to replay
+        created_at (datetime): Creation timestamp
+        expires_at (datetime): Time after which the key may be reused
+    """
+    __tablename__ = 'idempotency_keys'
+
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer)
+    response_body = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
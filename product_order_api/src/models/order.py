@@ -1,8 +1,12 @@
 """Order and OrderItem models module."""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import (
+    Column, Integer, String, Float, DateTime, ForeignKey, Index, Update, update
+)
 from sqlalchemy.orm import relationship
-from src.database import Base
+from src.database import Base, PreciseDateTime
+from src.order_state import allowed_sources
+from src.schemas.order import OrderStatus
 
 
 # PUBLIC_INTERFACE
@@ -21,27 +25,74 @@ class Order(Base):
         order_items (list): List of order items
     """
     __tablename__ = 'orders'
+    __table_args__ = (
+        # Keyset pagination over (created_at, id), optionally by status
+        Index('ix_orders_created_at_id', 'created_at', 'id'),
+        Index('ix_orders_status_created_at_id', 'status', 'created_at', 'id'),
+        # Per-customer order history; also serves plain email lookups
+        Index(
+            'ix_orders_customer_email_created_at_id',
+            'customer_email', 'created_at', 'id'
+        ),
+        # Orders changed since the order rollup watermark
+        Index('ix_orders_updated_at', 'updated_at'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     customer_name = Column(String(255), nullable=False)
-    customer_email = Column(String(255), nullable=False, index=True)
+    customer_email = Column(String(255), nullable=False)
     total_amount = Column(Float, nullable=False)
     status = Column(String(50), nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(
-        DateTime,
+        PreciseDateTime,
         default=datetime.utcnow,
         onupdate=datetime.utcnow,
         nullable=False
     )
 
-    # Relationship with OrderItem
+    # Relationship with OrderItem. Items must be loaded explicitly with an
+    # eager loader option; an accidental per-order lazy load raises instead
+    # of silently issuing one query per order.
     order_items = relationship(
         "OrderItem",
         back_populates="order",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        lazy="raise_on_sql"
     )
 
+    # PUBLIC_INTERFACE
+    @classmethod
+    def transition_statement(
+        cls,
+        order_id: int,
+        new_status: OrderStatus
+    ) -> Update:
+        """
+        Build a conditional UPDATE moving an order to a new status.
+
+        The statement only matches while the order is in a status from
+        which ``new_status`` is reachable, so the transition check and the
+        write happen atomically in the database. A rowcount of zero means
+        the order is missing or the transition is not allowed.
+
+        Args:
+            order_id (int): Order ID
+            new_status (OrderStatus): Target status
+
+        Returns:
+            Update: UPDATE statement changing the order status
+        """
+        return (
+            update(cls)
+            .where(
+                cls.id == order_id,
+                cls.status.in_(allowed_sources(new_status))
+            )
+            .values(status=new_status.value)
+            .execution_options(synchronize_session=False)
+        )
+
 
 # PUBLIC_INTERFACE
 class OrderItem(Base):
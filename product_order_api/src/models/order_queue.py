@@ -0,0 +1,47 @@
+"""Queued order model module."""
+from datetime import datetime
+from sqlalchemy import (
+    Column, DateTime, ForeignKey, Index, Integer, String, Text
+)
+from src.database import Base
+
+
+# PUBLIC_INTERFACE
+class QueuedOrder(Base):
+    """
+    QueuedOrder model holding an accepted order request until a worker
+    processes it.
+
+    Attributes:
+        id (int): Primary key, returned to the client for polling
+        payload (str): Validated ``OrderCreate`` body as JSON
+        status (str): ``pending``, ``processing``, ``completed`` or ``failed``
+        order_id (int): Created order once completed
+        detail (str): Reason the order was rejected or failed
+        attempts (int): Number of times a worker claimed the entry
+        claim_token (str): Token of the worker batch holding the entry
+        claimed_at (datetime): When the entry was last claimed
+        created_at (datetime): Creation timestamp
+        updated_at (datetime): Last update timestamp
+    """
+    __tablename__ = 'order_queue'
+    __table_args__ = (
+        # Workers scan for the oldest claimable entries
+        Index('ix_order_queue_status_id', 'status', 'id'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    payload = Column(Text, nullable=False)
+    status = Column(String(20), nullable=False, default="pending")
+    order_id = Column(Integer, ForeignKey('orders.id', ondelete="SET NULL"))
+    detail = Column(String(1000))
+    attempts = Column(Integer, nullable=False, default=0)
+    claim_token = Column(String(32), index=True)
+    claimed_at = Column(DateTime)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False
+    )
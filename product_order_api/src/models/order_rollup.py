@@ -0,0 +1,60 @@
+"""Order rollup models module."""
+from sqlalchemy import Column, Date, DateTime, Float, Integer, String
+from src.database import Base
+
+
+# PUBLIC_INTERFACE
+class OrderDailyRollup(Base):
+    """
+    Number and value of the orders placed on one day, per status.
+
+    Rebuilt day by day from ``orders`` by the rollup refresh; see
+    :mod:`src.order_rollup`.
+
+    Attributes:
+        day (date): UTC date the orders were placed
+        status (str): Current status of the orders
+        order_count (int): Number of orders
+        revenue (float): Sum of their ``total_amount``
+    """
+    __tablename__ = 'order_daily_rollup'
+
+    day = Column(Date, primary_key=True)
+    status = Column(String(50), primary_key=True)
+    order_count = Column(Integer, nullable=False)
+    revenue = Column(Float, nullable=False)
+
+
+# PUBLIC_INTERFACE
+class OrderRollupState(Base):
+    """
+    Progress of the order rollup refresh.
+
+    A single row; it is locked during a refresh so concurrent refreshes
+    run one after the other.
+
+    Attributes:
+        id (int): Always 1
+        watermark (datetime): Orders updated after this time may not be
+            reflected in the rollup yet
+    """
+    __tablename__ = 'order_rollup_state'
+
+    id = Column(Integer, primary_key=True)
+    watermark = Column(DateTime, nullable=False)
+
+
+# PUBLIC_INTERFACE
+class OrderRollupStaleDay(Base):
+    """
+    Day to rebuild on the next refresh although no order of it was updated.
+
+    Deleted orders leave no ``updated_at`` behind, so deleting one marks
+    its day here instead.
+
+    Attributes:
+        day (date): UTC date the deleted order was placed
+    """
+    __tablename__ = 'order_rollup_stale_days'
+
+    day = Column(Date, primary_key=True)
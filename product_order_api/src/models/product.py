@@ -1,8 +1,12 @@
 """Product model module."""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from typing import Mapping
+from sqlalchemy import (
+    DDL, Column, Integer, String, Float, DateTime, Index, Update, case, event,
+    update
+)
 from sqlalchemy.orm import relationship
-from src.database import Base
+from src.database import Base, PreciseDateTime
 
 
 # PUBLIC_INTERFACE
@@ -18,8 +22,22 @@ class Product(Base):
         stock (int): Available stock quantity
         created_at (datetime): Creation timestamp
         updated_at (datetime): Last update timestamp
+        bulk_token (str): Token of the POST /products/bulk chunk that
+            created the product on MySQL, used to read its id back
     """
     __tablename__ = 'products'
+    __table_args__ = (
+        # Relevance search on MySQL; SQLite uses the products_fts table below
+        Index(
+            'ix_products_name_description_fulltext',
+            'name', 'description',
+            mysql_prefix='FULLTEXT'
+        ).ddl_if(dialect='mysql'),
+        # Sort orders of GET /products/ (see src.projections.PRODUCT_SORTS);
+        # price ranges are scanned on ix_products_price_id as well
+        Index('ix_products_price_id', 'price', 'id'),
+        Index('ix_products_updated_at_id', 'updated_at', 'id'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, index=True)
@@ -28,11 +46,12 @@ class Product(Base):
     stock = Column(Integer, nullable=False, default=0)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(
-        DateTime,
+        PreciseDateTime,
         default=datetime.utcnow,
         onupdate=datetime.utcnow,
         nullable=False
     )
+    bulk_token = Column(String(32))
 
     # Relationship with OrderItem
     order_items = relationship(
@@ -40,3 +59,82 @@ class Product(Base):
         back_populates="product",
         cascade="all, delete-orphan"
     )
+
+    # PUBLIC_INTERFACE
+    @classmethod
+    def reserve_stock_statement(cls, product_id: int, quantity: int) -> Update:
+        """
+        Build a conditional UPDATE that reserves stock for a product.
+
+        The statement only matches while ``stock >= quantity``, so the check
+        and the decrement happen atomically in the database. A rowcount of
+        zero means the reservation was rejected.
+
+        Args:
+            product_id (int): Product ID
+            quantity (int): Number of units to reserve
+
+        Returns:
+            Update: UPDATE statement decrementing the product stock
+        """
+        return (
+            update(cls)
+            .where(cls.id == product_id, cls.stock >= quantity)
+            .values(stock=cls.stock - quantity)
+            .execution_options(synchronize_session=False)
+        )
+
+    # PUBLIC_INTERFACE
+    @classmethod
+    def restore_stock_statement(cls, quantities: Mapping[int, int]) -> Update:
+        """
+        Build a single UPDATE returning stock to many products.
+
+        Renders as ``UPDATE products SET stock = stock + CASE id WHEN ...
+        END WHERE id IN (...)``, so any number of order lines costs one
+        statement and no product rows are loaded.
+
+        Args:
+            quantities (Mapping[int, int]): Units to return keyed by
+                product ID
+
+        Returns:
+            Update: UPDATE statement incrementing the product stock
+        """
+        return (
+            update(cls)
+            .where(cls.id.in_(quantities))
+            .values(stock=cls.stock + case(dict(quantities), value=cls.id))
+            .execution_options(synchronize_session=False)
+        )
+
+
+# SQLite stand-in for the MySQL FULLTEXT index: an external content FTS5
+# table over name and description, kept in sync by triggers
+PRODUCTS_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5("
+    "name, description, content='products', content_rowid='id')",
+    "CREATE TRIGGER products_fts_insert AFTER INSERT ON products BEGIN "
+    "INSERT INTO products_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+    "CREATE TRIGGER products_fts_delete AFTER DELETE ON products BEGIN "
+    "INSERT INTO products_fts(products_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); END",
+    "CREATE TRIGGER products_fts_update AFTER UPDATE OF name, description "
+    "ON products BEGIN "
+    "INSERT INTO products_fts(products_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO products_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+)
+for _statement in PRODUCTS_FTS_DDL:
+    event.listen(
+        Product.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    Product.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS products_fts").execute_if(dialect="sqlite")
+)
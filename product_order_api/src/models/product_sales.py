@@ -0,0 +1,30 @@
+"""Product sales aggregate model module."""
+from sqlalchemy import Column, Date, Float, Index, Integer
+from src.database import Base
+
+
+# PUBLIC_INTERFACE
+class ProductDailySales(Base):
+    """
+    Units sold and revenue of a product on one day.
+
+    Maintained incrementally in the transactions that place, cancel and
+    delete orders, keyed by the UTC day the order was placed. Cancelling
+    or deleting an order subtracts its lines from the day it was placed.
+
+    Attributes:
+        product_id (int): Product sold; rows outlive deleted products
+        day (date): UTC date the orders were placed
+        units (int): Units sold
+        revenue (float): Sum of line subtotals
+    """
+    __tablename__ = 'product_daily_sales'
+    __table_args__ = (
+        # Top sellers over a window of days
+        Index('ix_product_daily_sales_day', 'day', 'product_id'),
+    )
+
+    product_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+    units = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
@@ -0,0 +1,258 @@
+"""Queued order pipeline: batched order processing in background workers.
+
+With ``ORDER_PIPELINE_MODE=queued``, ``POST /orders/`` only validates and
+enqueues the request; workers started with the application drain the
+queue in batches. Each batch reads its products once, checks stock for
+every order in arrival order and applies a single decrement per product,
+so a flash sale on one product costs one row update per batch instead of
+one per order.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.cache import ProductCache, product_cache
+from src.database import SessionLocal
+from src.inventory import merge_order_lines, reserve_stock
+from src.models.order import Order, OrderItem
+from src.models.order_queue import QueuedOrder
+from src.models.product import Product
+from src.order_queue import DatabaseOrderQueue, InMemoryOrderQueue, OrderQueue
+from src.sales import SalesDelta, order_sales, record_sales
+from src.schemas.order import OrderCreate, OrderStatus
+
+logger = logging.getLogger(__name__)
+
+
+# PUBLIC_INTERFACE
+async def process_order_batch(
+    db: AsyncSession,
+    queue: OrderQueue,
+    entries: Sequence[QueuedOrder]
+) -> Set[int]:
+    """
+    Place the orders of a batch of claimed queue entries.
+
+    Product rows are locked in id order (where the database supports
+    ``FOR UPDATE``) and orders are accepted first come, first served
+    against the remaining stock. The summed quantities are then reserved
+    with one conditional UPDATE per product and the sales aggregates of
+    the batch are recorded together. Rejected entries, including ones
+    whose payload no longer parses as an order, are marked ``failed``
+    with the reason. The caller commits.
+
+    Args:
+        db (AsyncSession): Worker session
+        queue (OrderQueue): Queue the entries were claimed from
+        entries (Sequence[QueuedOrder]): Claimed entries, oldest first
+
+    Returns:
+        Set[int]: IDs of products whose stock changed
+
+    Raises:
+        APIError: If stock changed under the batch despite the locks;
+            nothing is written and the batch must be rolled back
+        SQLAlchemyError: If a statement fails
+    """
+    requests = []
+    for entry in entries:
+        try:
+            requests.append(
+                (entry, OrderCreate.model_validate_json(entry.payload))
+            )
+        except ValueError as e:
+            # e.g. a payload queued before an incompatible schema change;
+            # retrying can never succeed, so it fails on its own
+            queue.complete(entry, detail=f"Invalid order payload: {str(e)}")
+    lines = {
+        entry.id: merge_order_lines(order.items) for entry, order in requests
+    }
+    product_ids = sorted(
+        {pid for quantities in lines.values() for pid in quantities}
+    )
+    result = await db.execute(
+        select(Product)
+        .where(Product.id.in_(product_ids))
+        .order_by(Product.id)
+        .with_for_update()
+    )
+    products = {product.id: product for product in result.scalars()}
+    available = {product.id: product.stock for product in products.values()}
+
+    totals: Dict[int, int] = {}
+    sales: SalesDelta = {}
+    placed: List[Tuple[QueuedOrder, Order]] = []
+    now = datetime.utcnow()
+    for entry, order in requests:
+        quantities = lines[entry.id]
+        missing = [pid for pid in quantities if pid not in products]
+        if missing:
+            queue.complete(entry, detail=f"Product with id {missing[0]} not found")
+            continue
+        short = [pid for pid, qty in quantities.items() if available[pid] < qty]
+        if short:
+            pid = short[0]
+            queue.complete(entry, detail=(
+                f"Insufficient stock for product {pid}. "
+                f"Available: {available[pid]}, Requested: {quantities[pid]}"
+            ))
+            continue
+
+        order_items = []
+        for pid, quantity in quantities.items():
+            available[pid] -= quantity
+            totals[pid] = totals.get(pid, 0) + quantity
+            order_items.append(OrderItem(
+                product_id=pid,
+                quantity=quantity,
+                unit_price=products[pid].price,
+                subtotal=products[pid].price * quantity
+            ))
+        order_sales(order_items, now.date(), into=sales)
+        placed.append((entry, Order(
+            customer_name=order.customer_name,
+            customer_email=order.customer_email,
+            total_amount=sum(item.subtotal for item in order_items),
+            status=OrderStatus.PENDING,
+            created_at=now,
+            updated_at=now,
+            order_items=order_items
+        )))
+
+    if placed:
+        await reserve_stock(db, totals)
+        await record_sales(db, sales)
+        db.add_all([db_order for _, db_order in placed])
+        await db.flush()
+        for entry, db_order in placed:
+            queue.complete(entry, order_id=db_order.id)
+    return set(totals)
+
+
+# PUBLIC_INTERFACE
+class OrderWorkerPool:
+    """
+    Background workers draining an order queue.
+
+    Args:
+        queue (OrderQueue): Queue to drain
+        session_factory (async_sessionmaker): Factory for worker sessions
+        cache (ProductCache): Product cache to invalidate after each batch
+        workers (int): Number of concurrent workers
+        batch_size (int): Entries claimed per batch
+        poll_interval (float): Seconds an idle worker waits before polling
+    """
+
+    def __init__(
+        self,
+        queue: OrderQueue,
+        session_factory: async_sessionmaker,
+        cache: ProductCache,
+        workers: int = 2,
+        batch_size: int = 50,
+        poll_interval: float = 0.2
+    ) -> None:
+        self.queue = queue
+        self.session_factory = session_factory
+        self.cache = cache
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._tasks: List[asyncio.Task] = []
+
+    async def run_once(self) -> int:
+        """
+        Claim and process one batch.
+
+        Returns:
+            int: Number of entries claimed
+        """
+        async with self.session_factory() as db:
+            entries = await self.queue.claim(db, self.batch_size)
+            if not entries:
+                return 0
+            entry_ids = [entry.id for entry in entries]
+            try:
+                changed = await process_order_batch(db, self.queue, entries)
+                await db.commit()
+            except Exception as e:
+                # Release on any error so ORDER_QUEUE_MAX_ATTEMPTS applies
+                await db.rollback()
+                logger.exception("Order batch %s failed", entry_ids)
+                await self.queue.release(
+                    db, entry_ids, f"Processing failed: {str(e)}"
+                )
+                await db.commit()
+                return len(entry_ids)
+        await self.cache.invalidate(changed)
+        return len(entry_ids)
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                processed = await self.run_once()
+            except Exception:
+                # Keep the worker alive; the claimed entries are re-queued
+                # once their lease expires
+                logger.exception("Order worker failed")
+                processed = 0
+            if not processed:
+                await asyncio.sleep(self.poll_interval)
+
+    def start(self) -> None:
+        """Start the workers on the running event loop."""
+        self._tasks = [
+            asyncio.create_task(self._work()) for _ in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """
+        Stop the workers.
+
+        Batches claimed but not committed are picked up again once their
+        lease expires.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+def _create_order_queue() -> Optional[OrderQueue]:
+    """Create the order queue selected by the environment, if enabled."""
+    if os.getenv("ORDER_PIPELINE_MODE", "sync").lower() != "queued":
+        return None
+    if os.getenv("ORDER_QUEUE_BACKEND", "database").lower() == "memory":
+        return InMemoryOrderQueue()
+    return DatabaseOrderQueue()
+
+
+order_queue = _create_order_queue()
+
+order_worker_pool = None
+if order_queue is not None:
+    order_worker_pool = OrderWorkerPool(
+        order_queue,
+        SessionLocal,
+        product_cache,
+        workers=int(os.getenv("ORDER_WORKERS", "2")),
+        batch_size=int(os.getenv("ORDER_BATCH_SIZE", "50")),
+        poll_interval=float(os.getenv("ORDER_QUEUE_POLL_SECONDS", "0.2"))
+    )
+
+
+# PUBLIC_INTERFACE
+def get_order_queue() -> Optional[OrderQueue]:
+    """
+    Get the order queue.
+
+    Returns:
+        Optional[OrderQueue]: Queue receiving new orders, or None when
+            orders are placed synchronously
+    """
+    return order_queue
@@ -0,0 +1,261 @@
+"""Queue backends for asynchronously processed orders."""
+import itertools
+import os
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import and_, case, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.order_queue import QueuedOrder
+
+# Seconds after which an entry claimed by a worker that never finished it
+# (e.g. the process died) can be claimed again
+ORDER_QUEUE_LEASE_SECONDS = float(os.getenv("ORDER_QUEUE_LEASE_SECONDS", "60"))
+
+# Claims after which an entry whose batch keeps failing is given up
+ORDER_QUEUE_MAX_ATTEMPTS = int(os.getenv("ORDER_QUEUE_MAX_ATTEMPTS", "3"))
+
+
+# PUBLIC_INTERFACE
+class OrderQueue(ABC):
+    """
+    Storage interface for queued orders.
+
+    Entries are :class:`QueuedOrder` instances. Methods receive the session
+    of the caller so a database backend can take part in its transaction;
+    the caller commits.
+    """
+
+    @abstractmethod
+    async def enqueue(self, db: AsyncSession, payload: str) -> QueuedOrder:
+        """
+        Add an order request in ``pending`` status.
+
+        Args:
+            db (AsyncSession): Session of the accepting request
+            payload (str): Validated order body as JSON
+
+        Returns:
+            QueuedOrder: Entry with its id assigned
+        """
+
+    @abstractmethod
+    async def claim(self, db: AsyncSession, limit: int) -> List[QueuedOrder]:
+        """
+        Take up to ``limit`` of the oldest pending entries for processing.
+
+        Args:
+            db (AsyncSession): Worker session
+            limit (int): Maximum number of entries
+
+        Returns:
+            List[QueuedOrder]: Entries now in ``processing`` status
+        """
+
+    @abstractmethod
+    async def release(
+        self,
+        db: AsyncSession,
+        entry_ids: Sequence[int],
+        detail: str
+    ) -> None:
+        """
+        Return entries whose batch failed unexpectedly to the queue.
+
+        Entries that reached ``ORDER_QUEUE_MAX_ATTEMPTS`` are marked
+        ``failed`` with ``detail`` instead.
+
+        Args:
+            db (AsyncSession): Worker session
+            entry_ids (Sequence[int]): Claimed entries
+            detail (str): Error description
+        """
+
+    @abstractmethod
+    async def get(self, db: AsyncSession, entry_id: int) -> Optional[QueuedOrder]:
+        """Return an entry by id, or None if unknown."""
+
+    def complete(
+        self,
+        entry: QueuedOrder,
+        order_id: Optional[int] = None,
+        detail: Optional[str] = None
+    ) -> None:
+        """
+        Record the outcome of a processed entry.
+
+        Args:
+            entry (QueuedOrder): Claimed entry
+            order_id (Optional[int]): Created order, if the order was placed
+            detail (Optional[str]): Rejection reason otherwise
+        """
+        entry.status = "completed" if order_id is not None else "failed"
+        entry.order_id = order_id
+        entry.detail = detail
+        entry.updated_at = datetime.utcnow()
+
+
+# PUBLIC_INTERFACE
+class InMemoryOrderQueue(OrderQueue):
+    """
+    Process-local queue for tests and single-process development.
+
+    Entries are lost when the process exits; use
+    :class:`DatabaseOrderQueue` wherever accepted orders must survive a
+    restart.
+    """
+
+    def __init__(self) -> None:
+        self._ids = itertools.count(1)
+        self._entries: Dict[int, QueuedOrder] = {}
+
+    async def enqueue(self, db: AsyncSession, payload: str) -> QueuedOrder:
+        now = datetime.utcnow()
+        entry = QueuedOrder(
+            id=next(self._ids),
+            payload=payload,
+            status="pending",
+            attempts=0,
+            created_at=now,
+            updated_at=now
+        )
+        self._entries[entry.id] = entry
+        return entry
+
+    async def claim(self, db: AsyncSession, limit: int) -> List[QueuedOrder]:
+        claimed = []
+        for entry in self._entries.values():
+            if len(claimed) == limit:
+                break
+            if entry.status == "pending":
+                entry.status = "processing"
+                entry.attempts += 1
+                claimed.append(entry)
+        return claimed
+
+    async def release(
+        self,
+        db: AsyncSession,
+        entry_ids: Sequence[int],
+        detail: str
+    ) -> None:
+        for entry_id in entry_ids:
+            entry = self._entries[entry_id]
+            if entry.attempts >= ORDER_QUEUE_MAX_ATTEMPTS:
+                entry.status, entry.detail = "failed", detail
+            else:
+                entry.status = "pending"
+
+    async def get(self, db: AsyncSession, entry_id: int) -> Optional[QueuedOrder]:
+        return self._entries.get(entry_id)
+
+
+# PUBLIC_INTERFACE
+class DatabaseOrderQueue(OrderQueue):
+    """
+    Durable queue stored in the ``order_queue`` table.
+
+    Several workers, in one or many processes, can drain the table:
+    candidates are read with ``FOR UPDATE SKIP LOCKED`` where supported and
+    claimed with a conditional UPDATE tagging them with a batch token, so
+    an entry is never handed to two workers at once. Entries held longer
+    than ``ORDER_QUEUE_LEASE_SECONDS`` become claimable again, unless they
+    were already claimed ``ORDER_QUEUE_MAX_ATTEMPTS`` times, in which case
+    they are marked ``failed``.
+    """
+
+    def _expired(self, now: datetime) -> Any:
+        stale = now - timedelta(seconds=ORDER_QUEUE_LEASE_SECONDS)
+        return and_(
+            QueuedOrder.status == "processing",
+            QueuedOrder.claimed_at < stale
+        )
+
+    def _claimable(self, now: datetime) -> Any:
+        return or_(
+            QueuedOrder.status == "pending",
+            and_(
+                self._expired(now),
+                QueuedOrder.attempts < ORDER_QUEUE_MAX_ATTEMPTS
+            )
+        )
+
+    async def enqueue(self, db: AsyncSession, payload: str) -> QueuedOrder:
+        entry = QueuedOrder(payload=payload, status="pending", attempts=0)
+        db.add(entry)
+        await db.flush()
+        return entry
+
+    async def claim(self, db: AsyncSession, limit: int) -> List[QueuedOrder]:
+        now = datetime.utcnow()
+        # Entries whose workers died on their last allowed attempt are
+        # given up here, since no release() will ever run for them
+        await db.execute(
+            update(QueuedOrder)
+            .where(
+                self._expired(now),
+                QueuedOrder.attempts >= ORDER_QUEUE_MAX_ATTEMPTS
+            )
+            .values(
+                status="failed",
+                detail="Processing did not finish after "
+                       f"{ORDER_QUEUE_MAX_ATTEMPTS} attempts",
+                claim_token=None
+            )
+            .execution_options(synchronize_session=False)
+        )
+        candidates = list(await db.scalars(
+            select(QueuedOrder.id)
+            .where(self._claimable(now))
+            .order_by(QueuedOrder.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        ))
+        if not candidates:
+            await db.commit()
+            return []
+
+        token = uuid.uuid4().hex
+        await db.execute(
+            update(QueuedOrder)
+            .where(QueuedOrder.id.in_(candidates), self._claimable(now))
+            .values(
+                status="processing",
+                claim_token=token,
+                claimed_at=now,
+                attempts=QueuedOrder.attempts + 1
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        result = await db.scalars(
+            select(QueuedOrder)
+            .where(QueuedOrder.claim_token == token)
+            .order_by(QueuedOrder.id)
+            .execution_options(populate_existing=True)
+        )
+        return list(result)
+
+    async def release(
+        self,
+        db: AsyncSession,
+        entry_ids: Sequence[int],
+        detail: str
+    ) -> None:
+        given_up = QueuedOrder.attempts >= ORDER_QUEUE_MAX_ATTEMPTS
+        await db.execute(
+            update(QueuedOrder)
+            .where(QueuedOrder.id.in_(entry_ids))
+            .values(
+                status=case((given_up, "failed"), else_="pending"),
+                detail=case((given_up, detail), else_=QueuedOrder.detail),
+                claim_token=None
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def get(self, db: AsyncSession, entry_id: int) -> Optional[QueuedOrder]:
+        return await db.get(QueuedOrder, entry_id)
@@ -0,0 +1,272 @@
+"""Materialized daily order totals.
+
+``order_daily_rollup`` holds the number and value of orders per day and
+status. A periodic refresh rebuilds only the days with orders updated
+since the last watermark, plus days marked stale by deletions, so its
+cost follows the write rate rather than the size of ``orders``. Reads
+combine the rollup for past days with a live aggregation of the current
+day.
+"""
+import asyncio
+import logging
+import os
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import Date, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.bulk import upsert_statement
+from src.database import SessionLocal
+from src.models.order import Order
+from src.models.order_rollup import (
+    OrderDailyRollup,
+    OrderRollupStaleDay,
+    OrderRollupState
+)
+
+logger = logging.getLogger(__name__)
+
+# Longest time an order write may take between setting ``updated_at`` and
+# committing; the watermark trails the refresh time by this much so such
+# writes are still picked up by the next refresh
+ORDER_ROLLUP_LAG_SECONDS = float(os.getenv("ORDER_ROLLUP_LAG_SECONDS", "300"))
+
+# Seconds between background refreshes; 0 disables the background refresh
+ORDER_ROLLUP_REFRESH_SECONDS = float(
+    os.getenv("ORDER_ROLLUP_REFRESH_SECONDS", "60")
+)
+
+# Watermark of a rollup that was never refreshed
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _day_bounds(day: date) -> Tuple[datetime, datetime]:
+    """Return the half-open ``created_at`` range of a UTC day."""
+    start = datetime.combine(day, datetime.min.time())
+    return start, start + timedelta(days=1)
+
+
+def _status_totals(day: date) -> Any:
+    """Build the per-status aggregation of the orders placed on a day."""
+    start, end = _day_bounds(day)
+    return (
+        select(
+            Order.status,
+            func.count(Order.id),
+            func.sum(Order.total_amount)
+        )
+        .where(Order.created_at >= start, Order.created_at < end)
+        .group_by(Order.status)
+    )
+
+
+# PUBLIC_INTERFACE
+async def mark_day_stale(db: AsyncSession, day: date) -> None:
+    """
+    Have the next refresh rebuild a day, e.g. after deleting an order.
+
+    Args:
+        db (AsyncSession): Database session; the caller owns the transaction
+        day (date): UTC date the affected order was placed
+    """
+    await db.execute(upsert_statement(
+        db.get_bind().dialect.name,
+        OrderRollupStaleDay,
+        [{"day": day}],
+        ("day",),
+        lambda proposed: {"day": proposed.day}
+    ))
+
+
+async def _rebuild_day(db: AsyncSession, day: date) -> None:
+    """Replace the rollup rows of a day with fresh totals."""
+    await db.execute(
+        delete(OrderDailyRollup).where(OrderDailyRollup.day == day)
+    )
+    result = await db.execute(_status_totals(day))
+    rows = [
+        {
+            "day": day,
+            "status": status,
+            "order_count": count,
+            "revenue": revenue,
+        }
+        for status, count, revenue in result
+    ]
+    if rows:
+        await db.execute(insert(OrderDailyRollup), rows)
+
+
+# PUBLIC_INTERFACE
+async def refresh_order_rollup(
+    db: AsyncSession,
+    now: Optional[datetime] = None
+) -> List[date]:
+    """
+    Rebuild the rollup of every day touched since the last refresh.
+
+    Days with an order whose ``updated_at`` is past the watermark are
+    found through ``ix_orders_updated_at``; each is rebuilt with one
+    range aggregation over ``ix_orders_created_at_id``. The caller
+    commits.
+
+    Args:
+        db (AsyncSession): Session on the primary database
+        now (Optional[datetime]): Current UTC time, for tests
+
+    Returns:
+        List[date]: Rebuilt days, oldest first
+    """
+    now = now or datetime.utcnow()
+    state = await db.scalar(
+        select(OrderRollupState)
+        .where(OrderRollupState.id == 1)
+        .with_for_update()
+    )
+    if state is None:
+        state = OrderRollupState(id=1, watermark=_EPOCH)
+        db.add(state)
+        await db.flush()
+
+    touched: Set[date] = set(await db.scalars(
+        select(func.date(Order.created_at, type_=Date))
+        .where(Order.updated_at > state.watermark)
+        .distinct()
+    ))
+    stale = set(await db.scalars(select(OrderRollupStaleDay.day)))
+    days = sorted(touched | stale)
+    for day in days:
+        await _rebuild_day(db, day)
+    if stale:
+        await db.execute(
+            delete(OrderRollupStaleDay)
+            .where(OrderRollupStaleDay.day.in_(stale))
+        )
+    state.watermark = max(
+        state.watermark,
+        now - timedelta(seconds=ORDER_ROLLUP_LAG_SECONDS)
+    )
+    return days
+
+
+# PUBLIC_INTERFACE
+async def order_totals(
+    db: AsyncSession,
+    start: date,
+    end: date,
+    group_by: str,
+    now: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """
+    Sum orders placed between two days, by day or by status.
+
+    Days before today are read from the rollup; today is aggregated live
+    from ``orders``.
+
+    Args:
+        db (AsyncSession): Database session
+        start (date): First UTC day, inclusive
+        end (date): Last UTC day, inclusive
+        group_by (str): ``day`` or ``status``
+        now (Optional[datetime]): Current UTC time, for tests
+
+    Returns:
+        List[Dict[str, Any]]: ``order_count`` and ``revenue`` per day or
+            status, sorted by group key
+    """
+    today = (now or datetime.utcnow()).date()
+    rows: List[Tuple[date, str, int, float]] = []
+    if start < today:
+        result = await db.execute(
+            select(
+                OrderDailyRollup.day,
+                OrderDailyRollup.status,
+                OrderDailyRollup.order_count,
+                OrderDailyRollup.revenue
+            )
+            .where(
+                OrderDailyRollup.day >= start,
+                OrderDailyRollup.day <= min(end, today - timedelta(days=1))
+            )
+        )
+        rows.extend(result.tuples())
+    if start <= today <= end:
+        result = await db.execute(_status_totals(today))
+        rows.extend(
+            (today, status, count, revenue) for status, count, revenue in result
+        )
+
+    totals: Dict[Any, List[float]] = {}
+    for day, status, count, revenue in rows:
+        key = day if group_by == "day" else status
+        total = totals.setdefault(key, [0, 0.0])
+        total[0] += count
+        total[1] += revenue
+    return [
+        {
+            group_by: key.isoformat() if group_by == "day" else key,
+            "order_count": int(count),
+            "revenue": round(revenue, 2),
+        }
+        for key, (count, revenue) in sorted(totals.items())
+    ]
+
+
+# PUBLIC_INTERFACE
+class OrderRollupRefresher:
+    """
+    Background task refreshing the order rollup at a fixed interval.
+
+    Args:
+        session_factory (async_sessionmaker): Factory for primary sessions
+        interval (float): Seconds between refreshes
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        interval: float
+    ) -> None:
+        self.session_factory = session_factory
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> List[date]:
+        """
+        Refresh the rollup in its own transaction.
+
+        Returns:
+            List[date]: Rebuilt days
+        """
+        async with self.session_factory() as db:
+            days = await refresh_order_rollup(db)
+            await db.commit()
+        return days
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                # Keep refreshing; the watermark only advances on success
+                logger.exception("Order rollup refresh failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start refreshing on the running event loop."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop refreshing."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+order_rollup_refresher = None
+if ORDER_ROLLUP_REFRESH_SECONDS > 0:
+    order_rollup_refresher = OrderRollupRefresher(
+        SessionLocal, ORDER_ROLLUP_REFRESH_SECONDS
+    )
@@ -0,0 +1,85 @@
+"""Order status state machine."""
+from types import MappingProxyType
+from typing import FrozenSet, Mapping
+
+from src.errors import BusinessLogicError
+from src.schemas.order import OrderStatus
+
+# Statuses an order may move to from each status. Built once and read-only,
+# so handlers and bulk paths share the same rules.
+TRANSITIONS: Mapping[OrderStatus, FrozenSet[OrderStatus]] = MappingProxyType({
+    OrderStatus.PENDING: frozenset({
+        OrderStatus.PROCESSING,
+        OrderStatus.CANCELLED
+    }),
+    OrderStatus.PROCESSING: frozenset({
+        OrderStatus.COMPLETED,
+        OrderStatus.CANCELLED
+    }),
+    OrderStatus.COMPLETED: frozenset(),  # No transitions from completed
+    OrderStatus.CANCELLED: frozenset()  # No transitions from cancelled
+})
+
+# Inverse of TRANSITIONS: statuses an order may come from to reach each
+# status, for ``WHERE status IN (...)`` guards
+SOURCES: Mapping[OrderStatus, FrozenSet[OrderStatus]] = MappingProxyType({
+    target: frozenset(
+        source for source, targets in TRANSITIONS.items() if target in targets
+    )
+    for target in OrderStatus
+})
+
+
+# PUBLIC_INTERFACE
+def can_transition(current_status: OrderStatus, new_status: OrderStatus) -> bool:
+    """
+    Check whether an order may move from one status to another.
+
+    Args:
+        current_status (OrderStatus): Status the order is in
+        new_status (OrderStatus): Requested status
+
+    Returns:
+        bool: True if the transition is allowed
+    """
+    return new_status in TRANSITIONS[current_status]
+
+
+# PUBLIC_INTERFACE
+def allowed_sources(new_status: OrderStatus) -> FrozenSet[str]:
+    """
+    Get the statuses from which an order may reach ``new_status``.
+
+    Args:
+        new_status (OrderStatus): Target status
+
+    Returns:
+        FrozenSet[str]: Stored status values, ready for ``status.in_(...)``
+    """
+    return frozenset(source.value for source in SOURCES[new_status])
+
+
+# PUBLIC_INTERFACE
+def check_transition(
+    current_status: OrderStatus,
+    new_status: OrderStatus
+) -> None:
+    """
+    Validate a status change against ``TRANSITIONS``.
+
+    Args:
+        current_status (OrderStatus): Status the order is in
+        new_status (OrderStatus): Requested status
+
+    Raises:
+        BusinessLogicError: If the transition is not allowed
+    """
+    if not can_transition(current_status, new_status):
+        valid_trans = ', '.join(
+            sorted(str(s) for s in TRANSITIONS[current_status])
+        )
+        msg = (
+            f"Invalid status transition from {current_status} "
+            f"to {new_status}. Valid transitions are: {valid_trans}"
+        )
+        raise BusinessLogicError(msg)
@@ -0,0 +1,167 @@
+"""Bulk order status transitions."""
+from collections import defaultdict
+from datetime import datetime
+from typing import List, Sequence, Set, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.errors import BusinessLogicError
+from src.inventory import merge_order_lines, restore_stock
+from src.models.order import Order, OrderItem
+from src.order_state import check_transition
+from src.sales import SalesDelta, order_sales, record_sales
+from src.schemas.order import (
+    OrderStatus,
+    OrderStatusChange,
+    OrderStatusChangeResult
+)
+
+# Status changes applied per transaction
+STATUS_CHUNK_SIZE = 500
+
+
+async def _apply_chunk(
+    db: AsyncSession,
+    chunk: List[Tuple[int, OrderStatusChange]],
+    results: List[OrderStatusChangeResult]
+) -> Set[int]:
+    """Apply one chunk of status changes; return the restocked products."""
+    # Lock the orders so their status cannot change before the UPDATEs
+    current = dict((await db.execute(
+        select(Order.id, Order.status)
+        .where(Order.id.in_([change.order_id for _, change in chunk]))
+        .order_by(Order.id)
+        .with_for_update()
+    )).all())
+
+    groups = defaultdict(list)
+    for index, change in chunk:
+        if change.order_id not in current:
+            results[index] = OrderStatusChangeResult(
+                index=index,
+                order_id=change.order_id,
+                status="not_found",
+                to_status=change.status,
+                detail=f"Order with id {change.order_id} not found"
+            )
+            continue
+        from_status = OrderStatus(current[change.order_id])
+        try:
+            check_transition(from_status, change.status)
+        except BusinessLogicError as e:
+            results[index] = OrderStatusChangeResult(
+                index=index,
+                order_id=change.order_id,
+                status="invalid",
+                from_status=from_status,
+                to_status=change.status,
+                detail=e.detail
+            )
+            continue
+        groups[(from_status, change.status)].append((index, change.order_id))
+
+    # One UPDATE per (from, to) pair; the status guard keeps it a no-op for
+    # rows another transaction moved on
+    now = datetime.utcnow()
+    cancelled = []
+    for (from_status, to_status), group in groups.items():
+        ids = [order_id for _, order_id in group]
+        await db.execute(
+            update(Order)
+            .where(Order.id.in_(ids), Order.status == from_status)
+            .values(status=to_status, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        if to_status == OrderStatus.CANCELLED:
+            cancelled.extend(ids)
+        for index, order_id in group:
+            results[index] = OrderStatusChangeResult(
+                index=index,
+                order_id=order_id,
+                status="updated",
+                from_status=from_status,
+                to_status=to_status
+            )
+
+    if not cancelled:
+        return set()
+    lines = (await db.execute(
+        select(
+            OrderItem.product_id,
+            OrderItem.quantity,
+            OrderItem.subtotal,
+            Order.created_at
+        )
+        .join(Order, Order.id == OrderItem.order_id)
+        .where(OrderItem.order_id.in_(cancelled))
+    )).all()
+    quantities = merge_order_lines(lines)
+    sales: SalesDelta = {}
+    for line in lines:
+        order_sales([line], line.created_at.date(), sign=-1, into=sales)
+    await restore_stock(db, quantities)
+    await record_sales(db, sales)
+    return set(quantities)
+
+
+# PUBLIC_INTERFACE
+async def apply_status_changes(
+    db: AsyncSession,
+    changes: Sequence[OrderStatusChange],
+    chunk_size: int = STATUS_CHUNK_SIZE
+) -> Tuple[List[OrderStatusChangeResult], Set[int]]:
+    """
+    Apply many order status changes with set-based statements.
+
+    Changes are validated against ``order_state.TRANSITIONS`` and applied
+    in chunks of ``chunk_size``, each inside its own transaction, with one
+    UPDATE per (from, to) status pair. Stock of cancelled orders is restored
+    with aggregated UPDATEs. A failing chunk is rolled back and its changes
+    are reported as ``error`` without affecting other chunks.
+
+    Args:
+        db (AsyncSession): Database session
+        changes (Sequence[OrderStatusChange]): Changes to apply
+        chunk_size (int): Changes per chunk and transaction
+
+    Returns:
+        Tuple[List[OrderStatusChangeResult], Set[int]]: One result per
+            change, in input order, and the IDs of restocked products
+    """
+    results: List[OrderStatusChangeResult] = [None] * len(changes)
+    valid = []
+    seen = set()
+    for index, change in enumerate(changes):
+        if change.order_id in seen:
+            results[index] = OrderStatusChangeResult(
+                index=index,
+                order_id=change.order_id,
+                status="invalid",
+                to_status=change.status,
+                detail="Order appears more than once in the batch"
+            )
+            continue
+        seen.add(change.order_id)
+        valid.append((index, change))
+
+    restocked: Set[int] = set()
+    for start in range(0, len(valid), chunk_size):
+        chunk = valid[start:start + chunk_size]
+        try:
+            products = await _apply_chunk(db, chunk, results)
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            for index, change in chunk:
+                results[index] = OrderStatusChangeResult(
+                    index=index,
+                    order_id=change.order_id,
+                    status="error",
+                    to_status=change.status,
+                    detail=f"Error applying status change: {str(e)}"
+                )
+            continue
+        restocked |= products
+    return results, restocked
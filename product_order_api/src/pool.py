@@ -0,0 +1,84 @@
+"""Connection pool with checkout instrumentation."""
+import time
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+from src.metrics import Histogram
+
+
+# PUBLIC_INTERFACE
+class PoolStats:
+    """Checkout counters and wait time histogram of one connection pool."""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = Histogram()
+
+
+# PUBLIC_INTERFACE
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that measures how long checkouts wait for a connection.
+
+    The wait covers blocking on an exhausted pool as well as opening a new
+    connection. Checkouts that give up after ``pool_timeout`` are counted
+    as timeouts.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            self.stats.wait_seconds.observe(time.perf_counter() - started)
+        self.stats.checkouts += 1
+        return entry
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        # Keep the counters when the engine replaces the pool, e.g. after
+        # a disconnect invalidates it
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+# PUBLIC_INTERFACE
+def pool_stats(engine: AsyncEngine) -> Dict[str, Any]:
+    """
+    Describe the connection pool of an engine.
+
+    Args:
+        engine (AsyncEngine): Engine whose pool is inspected
+
+    Returns:
+        Dict[str, Any]: Pool sizing, current usage and, for an
+            :class:`InstrumentedQueuePool`, checkout counters and the wait
+            time histogram
+    """
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return {"pool": type(pool).__name__, "status": pool.status()}
+
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "timeout_seconds": pool.timeout(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": pool.stats.checkouts,
+        "checkout_timeouts": pool.stats.timeouts,
+        "checkout_wait_seconds": pool.stats.wait_seconds.snapshot(),
+    }
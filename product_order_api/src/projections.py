@@ -0,0 +1,220 @@
+"""Column-projected read queries for list endpoints.
+
+Listing endpoints only serialize what they read, so they select the
+response columns as plain rows instead of ORM entities. Rows skip the
+identity map, change tracking and relationship loaders; the documents of
+:mod:`src.rendering` are built from them directly.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import Select, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.order import Order, OrderItem
+from src.models.product import Product
+from src.pagination import decode_cursor, encode_cursor, keyset_condition
+from src.rendering import order_item_document, order_summary_document
+
+PRODUCT_COLUMNS = (
+    Product.id,
+    Product.name,
+    Product.description,
+    Product.price,
+    Product.stock,
+    Product.created_at,
+    Product.updated_at,
+)
+
+ORDER_COLUMNS = (
+    Order.id,
+    Order.customer_name,
+    Order.customer_email,
+    Order.total_amount,
+    Order.status,
+    Order.created_at,
+    Order.updated_at,
+)
+
+ORDER_ITEM_COLUMNS = (
+    OrderItem.order_id,
+    OrderItem.id,
+    OrderItem.product_id,
+    OrderItem.quantity,
+    OrderItem.unit_price,
+    OrderItem.subtotal,
+)
+
+
+# PUBLIC_INTERFACE
+def product_rows() -> Select:
+    """
+    Build a query selecting the ``ProductResponse`` columns of products.
+
+    Returns:
+        Select: Query to refine with filters, ordering and limits
+    """
+    return select(*PRODUCT_COLUMNS)
+
+
+# Sort orders of GET /products/; each is served by an index on
+# (column, id): ix_products_name (which ends in the primary key
+# implicitly), ix_products_price_id and ix_products_updated_at_id
+PRODUCT_SORTS: Dict[str, Any] = {
+    "id": Product.id,
+    "name": Product.name,
+    "price": Product.price,
+    "updated_at": Product.updated_at,
+}
+
+# Types of the sort values carried by product listing cursors
+PRODUCT_SORT_TYPES: Dict[str, type] = {
+    "id": int,
+    "name": str,
+    "price": float,
+    "updated_at": datetime,
+}
+
+
+# PUBLIC_INTERFACE
+def product_list_query(
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    in_stock: Optional[bool] = None,
+    sort: str = "id",
+    descending: bool = False,
+    cursor: Optional[str] = None
+) -> Select:
+    """
+    Build the filtered and sorted product listing query.
+
+    Args:
+        min_price (Optional[float]): Lowest price, inclusive
+        max_price (Optional[float]): Highest price, inclusive
+        in_stock (Optional[bool]): Only products with (True) or without
+            (False) stock
+        sort (str): Key of :data:`PRODUCT_SORTS`; ``id`` breaks ties
+        descending (bool): Whether to sort from highest to lowest
+        cursor (Optional[str]): Keyset cursor made by
+            :func:`product_list_cursor` for the same sort, or None
+
+    Returns:
+        Select: Query over :data:`PRODUCT_COLUMNS`, without limit
+
+    Raises:
+        ValidationError: If the cursor is malformed
+    """
+    sort_column = PRODUCT_SORTS[sort]
+    query = product_rows()
+    if min_price is not None:
+        query = query.where(Product.price >= min_price)
+    if max_price is not None:
+        query = query.where(Product.price <= max_price)
+    if in_stock is not None:
+        query = query.where(Product.stock > 0 if in_stock else Product.stock == 0)
+
+    if cursor:
+        position = decode_cursor(
+            cursor, {sort: PRODUCT_SORT_TYPES[sort], "id": int}
+        )
+        if sort == "id":
+            query = query.where(
+                Product.id < position["id"] if descending
+                else Product.id > position["id"]
+            )
+        else:
+            query = query.where(keyset_condition(
+                sort_column, position[sort], Product.id, position["id"],
+                descending
+            ))
+
+    if sort == "id":
+        return query.order_by(Product.id.desc() if descending else Product.id)
+    if descending:
+        return query.order_by(sort_column.desc(), Product.id.desc())
+    return query.order_by(sort_column, Product.id)
+
+
+# PUBLIC_INTERFACE
+def product_list_cursor(row: Row, sort: str) -> str:
+    """
+    Encode the position of the last product of a page.
+
+    Args:
+        row (Row): Last row of the page
+        sort (str): Sort the page was listed with
+
+    Returns:
+        str: Cursor for :func:`product_list_query`
+    """
+    if sort == "id":
+        return encode_cursor({"id": row.id})
+    value = getattr(row, sort)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return encode_cursor({sort: value, "id": row.id})
+
+
+# PUBLIC_INTERFACE
+def order_rows() -> Select:
+    """
+    Build a query selecting the ``OrderResponse`` columns of orders.
+
+    Returns:
+        Select: Query to refine with filters, ordering and limits
+    """
+    return select(*ORDER_COLUMNS)
+
+
+# PUBLIC_INTERFACE
+async def order_items_by_order(
+    db: AsyncSession,
+    order_ids: Sequence[int]
+) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Load the item documents of several orders with one query.
+
+    Args:
+        db (AsyncSession): Database session
+        order_ids (Sequence[int]): Orders whose items are needed
+
+    Returns:
+        Dict[int, List[Dict[str, Any]]]: Item documents per order id, in
+            item id order; orders without items are absent
+    """
+    items: Dict[int, List[Dict[str, Any]]] = {}
+    if not order_ids:
+        return items
+    result = await db.execute(
+        select(*ORDER_ITEM_COLUMNS)
+        .where(OrderItem.order_id.in_(order_ids))
+        .order_by(OrderItem.order_id, OrderItem.id)
+    )
+    for row in result:
+        items.setdefault(row.order_id, []).append(order_item_document(row))
+    return items
+
+
+# PUBLIC_INTERFACE
+async def order_documents(
+    db: AsyncSession,
+    rows: Sequence[Row]
+) -> List[Dict[str, Any]]:
+    """
+    Build the ``OrderResponse`` documents of a page of order rows.
+
+    Args:
+        db (AsyncSession): Database session
+        rows (Sequence[Row]): Rows selected by :func:`order_rows`
+
+    Returns:
+        List[Dict[str, Any]]: Documents with their items, in row order
+    """
+    items = await order_items_by_order(db, [row.id for row in rows])
+    documents = []
+    for row in rows:
+        document = order_summary_document(row)
+        document["order_items"] = items.get(row.id, [])
+        documents.append(document)
+    return documents
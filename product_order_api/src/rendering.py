@@ -0,0 +1,138 @@
+"""Response rendering from prebuilt documents.
+
+List and detail handlers build their JSON documents straight from the
+loaded rows and return them as a response, so FastAPI neither validates
+them against the ``response_model`` again nor runs ``jsonable_encoder``
+over them. The documents only hold JSON-native values, which lets any
+JSON response class encode them.
+
+With ``ORJSON_RESPONSES=true`` and ``orjson`` installed, responses are
+encoded with orjson, for these handlers as well as the application
+default. Without it the standard library encoder is used.
+"""
+import os
+from typing import Any, Dict, Optional, Type
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from src.models.order import Order, OrderItem
+from src.models.product import Product
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+ORJSON_RESPONSES = (
+    os.getenv("ORJSON_RESPONSES", "false").lower() in ("1", "true", "yes")
+    and orjson is not None
+)
+
+# Response class used for prebuilt documents and as the application default
+RESPONSE_CLASS: Type[JSONResponse] = (
+    ORJSONResponse if ORJSON_RESPONSES else JSONResponse
+)
+
+
+# PUBLIC_INTERFACE
+def render(
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None
+) -> JSONResponse:
+    """
+    Wrap a prebuilt document in a response, bypassing the response model.
+
+    Args:
+        content (Any): JSON-native document
+        status_code (int): HTTP status code
+        headers (Optional[Dict[str, str]]): Extra response headers
+
+    Returns:
+        JSONResponse: Response encoded with :data:`RESPONSE_CLASS`
+    """
+    return RESPONSE_CLASS(content=content, status_code=status_code, headers=headers)
+
+
+# PUBLIC_INTERFACE
+def product_document(product: Product) -> Dict[str, Any]:
+    """
+    Build the ``ProductResponse`` document of a product.
+
+    Args:
+        product (Product): Loaded product, or a row with the same columns
+
+    Returns:
+        Dict[str, Any]: Document with the keys and values
+            ``ProductResponse`` would serialize
+    """
+    return {
+        "name": product.name,
+        "description": product.description,
+        "price": float(product.price),
+        "stock": product.stock,
+        "id": product.id,
+        "created_at": product.created_at.isoformat(),
+        "updated_at": product.updated_at.isoformat(),
+    }
+
+
+# PUBLIC_INTERFACE
+def order_item_document(item: OrderItem) -> Dict[str, Any]:
+    """
+    Build the ``OrderItemResponse`` document of an order item.
+
+    Args:
+        item (OrderItem): Loaded item, or a row with the same columns
+
+    Returns:
+        Dict[str, Any]: Item document
+    """
+    return {
+        "product_id": item.product_id,
+        "quantity": item.quantity,
+        "id": item.id,
+        "unit_price": float(item.unit_price),
+        "subtotal": float(item.subtotal),
+    }
+
+
+# PUBLIC_INTERFACE
+def order_summary_document(order: Order) -> Dict[str, Any]:
+    """
+    Build the document of an order without its items.
+
+    Args:
+        order (Order): Loaded order, or a row with the same columns
+
+    Returns:
+        Dict[str, Any]: ``OrderResponse`` document minus ``order_items``
+    """
+    return {
+        "customer_name": order.customer_name,
+        "customer_email": order.customer_email,
+        "id": order.id,
+        "total_amount": float(order.total_amount),
+        "status": order.status,
+        "created_at": order.created_at.isoformat(),
+        "updated_at": order.updated_at.isoformat(),
+    }
+
+
+# PUBLIC_INTERFACE
+def order_document(order: Order) -> Dict[str, Any]:
+    """
+    Build the ``OrderResponse`` document of an order with its items.
+
+    Args:
+        order (Order): Order with ``order_items`` loaded
+
+    Returns:
+        Dict[str, Any]: Document with the keys and values ``OrderResponse``
+            would serialize
+    """
+    document = order_summary_document(order)
+    document["order_items"] = [
+        order_item_document(item) for item in order.order_items
+    ]
+    return document
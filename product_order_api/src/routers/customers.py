@@ -0,0 +1,116 @@
+"""Customers router module."""
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.conditional import (
+    Preconditions,
+    get_preconditions,
+    not_modified,
+    page_etag,
+    validator_headers
+)
+from src.database import get_read_db
+from src.errors import DatabaseError
+from src.models.order import Order
+from src.pagination import created_at_keyset, encode_created_at_cursor
+from src.projections import order_documents, order_rows
+from src.rendering import order_summary_document, render
+from src.schemas.order import CustomerOrderPage, OrderStatus
+
+router = APIRouter(
+    prefix="/customers",
+    tags=["customers"]
+)
+
+
+# PUBLIC_INTERFACE
+@router.get(
+    "/{email}/orders",
+    response_model=CustomerOrderPage,
+    summary="List the orders of a customer",
+    description="""
+    Get the order history of one customer, newest first.
+
+    Pagination is keyset based: pass the `next_cursor` of a page as
+    `cursor` to get the next one; the last page has `next_cursor: null`.
+    Pages are read from the `(customer_email, created_at, id)` index, so
+    every page costs the same regardless of how many orders exist.
+
+    Orders are returned without their items unless `include_items=true`.
+    Responses carry a weak `ETag` for the page; send it back in
+    `If-None-Match` to get `304 Not Modified` while the page is unchanged.
+    """,
+    responses={
+        200: {"description": "Orders retrieved successfully"},
+        304: {"description": "Page unchanged since the client's copy"},
+        400: {"description": "Invalid pagination cursor"}
+    }
+)
+async def list_customer_orders(
+    email: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    status_filter: Optional[OrderStatus] = Query(None, alias="status"),
+    include_items: bool = False,
+    db: AsyncSession = Depends(get_read_db),
+    preconditions: Preconditions = Depends(get_preconditions)
+) -> Response:
+    """
+    List the orders of a customer with keyset pagination.
+
+    Args:
+        email (str): Customer email, matched exactly
+        cursor (Optional[str]): Cursor from the previous page
+        limit (int): Maximum number of orders per page
+        status_filter (Optional[OrderStatus]): Only return orders with
+            this status
+        include_items (bool): Whether to include the items of each order
+        db (AsyncSession): Database session
+        preconditions (Preconditions): Conditional request headers
+
+    Returns:
+        Response: Page of order summaries, or full orders with
+            ``include_items``, and the next cursor; 304 if the client's
+            copy of the page is current
+
+    Raises:
+        ValidationError: If the cursor is malformed
+    """
+    query = order_rows().where(Order.customer_email == email)
+    if status_filter is not None:
+        query = query.where(Order.status == status_filter)
+    if cursor:
+        query = query.where(
+            created_at_keyset(cursor, Order.created_at, Order.id, descending=True)
+        )
+    # Fetch one extra row to know whether another page follows
+    query = (
+        query.order_by(Order.created_at.desc(), Order.id.desc())
+        .limit(limit + 1)
+    )
+
+    try:
+        rows = (await db.execute(query)).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_created_at_cursor(
+                rows[-1].created_at, rows[-1].id
+            )
+        etag = page_etag(preconditions.query, rows)
+        if preconditions.matches(etag):
+            return not_modified(etag)
+        if include_items:
+            documents = await order_documents(db, rows)
+        else:
+            documents = [order_summary_document(row) for row in rows]
+    except SQLAlchemyError as e:
+        raise DatabaseError(f"Error listing customer orders: {str(e)}")
+
+    return render(
+        {"items": documents, "next_cursor": next_cursor},
+        headers=validator_headers(etag)
+    )
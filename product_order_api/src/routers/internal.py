@@ -0,0 +1,66 @@
+"""Internal operational endpoints for capacity tuning."""
+from typing import Any, Dict
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.cache import ProductCache, get_product_cache
+from src.database import engine, get_db, read_engines
+from src.order_rollup import refresh_order_rollup
+from src.pool import pool_stats
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["internal"],
+    include_in_schema=False
+)
+
+
+# PUBLIC_INTERFACE
+@router.get("/cache-stats")
+async def cache_stats(
+    cache: ProductCache = Depends(get_product_cache)
+) -> Dict[str, Any]:
+    """
+    Get product cache statistics of this worker process.
+
+    Args:
+        cache (ProductCache): Product cache
+
+    Returns:
+        Dict[str, Any]: Hit/miss counters and backend statistics
+    """
+    return {"products": cache.stats()}
+
+
+# PUBLIC_INTERFACE
+@router.get("/pool-stats")
+async def connection_pool_stats() -> Dict[str, Any]:
+    """
+    Get connection pool statistics of this worker process.
+
+    Returns:
+        Dict[str, Any]: Usage, checkout counters and wait time histogram of
+            the writer pool and of each read replica pool
+    """
+    return {
+        "primary": pool_stats(engine),
+        "replicas": [pool_stats(read_engine) for read_engine in read_engines],
+    }
+
+
+# PUBLIC_INTERFACE
+@router.post("/order-rollup/refresh")
+async def refresh_rollup(db: AsyncSession = Depends(get_db)) -> Dict[str, Any]:
+    """
+    Refresh the daily order rollup now instead of waiting for the
+    background refresh.
+
+    Args:
+        db (AsyncSession): Database session
+
+    Returns:
+        Dict[str, Any]: Days that were rebuilt
+    """
+    days = await refresh_order_rollup(db)
+    await db.commit()
+    return {"refreshed_days": [day.isoformat() for day in days]}
@@ -1,19 +1,63 @@
 """Orders router module."""
-from typing import List
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Literal, Optional, Union
+from fastapi import APIRouter, Depends, Header, Query, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import joinedload, selectinload
 from sqlalchemy.exc import SQLAlchemyError
 
-from src.database import get_db
+from src.cache import ProductCache, get_product_cache
+from src.conditional import (
+    Preconditions,
+    entity_etag,
+    get_preconditions,
+    not_modified,
+    page_etag,
+    validator_headers
+)
+from src.database import get_db, get_read_db, get_session_factory
 from src.errors import (
+    APIError,
     ResourceNotFoundError,
     DatabaseError,
-    BusinessLogicError
+    BusinessLogicError,
+    ValidationError
+)
+from src.export import export_query, stream_csv, stream_ndjson
+from src.idempotency import (
+    claim_idempotency_key,
+    replay_response,
+    request_fingerprint,
+    store_response
+)
+from src.inventory import merge_order_lines, reserve_stock, restore_stock
+from src.order_pipeline import get_order_queue
+from src.order_queue import OrderQueue
+from src.order_rollup import mark_day_stale, order_totals
+from src.order_state import check_transition
+from src.order_status import apply_status_changes
+from src.pagination import (
+    check_page_size,
+    created_at_keyset,
+    encode_created_at_cursor
 )
+from src.projections import order_documents, order_rows
+from src.rendering import order_document, render
+from src.sales import order_sales, record_sales
 from src.models.order import Order, OrderItem
 from src.models.product import Product
 from src.schemas.order import (
-    OrderCreate, OrderResponse, OrderUpdate, OrderStatus
+    OrderCreate,
+    OrderPage,
+    OrderResponse,
+    OrderUpdate,
+    OrderStatus,
+    OrderStatusChange,
+    OrderStatusChangeResult,
+    OrderTotals,
+    QueuedOrderResponse
 )
 
 router = APIRouter(
@@ -22,6 +66,51 @@ router = APIRouter(
 )
 
 
+# Eager loading strategy for ``Order.order_items`` per endpoint.
+# ``selectin`` loads the items of every order in the result with one extra
+# ``IN (...)`` query; ``joined`` folds them into the parent query with a
+# LEFT OUTER JOIN. Lazy loading is disabled on the relationship, so every
+# endpoint returning items must be listed here.
+ORDER_ITEMS_LOADERS = {
+    "selectin": selectinload,
+    "joined": joinedload,
+}
+ORDER_ITEMS_LOADING: Dict[str, str] = {
+    "get_order": "selectin",
+    "update_order": "selectin",
+    "delete_order": "selectin",
+}
+
+
+def _order_items_loader(endpoint: str):
+    """Build the loader option configured for an endpoint."""
+    strategy = ORDER_ITEMS_LOADING[endpoint]
+    return ORDER_ITEMS_LOADERS[strategy](Order.order_items)
+
+
+async def _get_order(db: AsyncSession, order_id: int, endpoint: str) -> Order:
+    """
+    Load an order together with its items.
+
+    Args:
+        db (AsyncSession): Database session
+        order_id (int): Order ID
+        endpoint (str): Endpoint name selecting the loader strategy
+
+    Raises:
+        ResourceNotFoundError: If the order does not exist
+    """
+    result = await db.execute(
+        select(Order)
+        .options(_order_items_loader(endpoint))
+        .where(Order.id == order_id)
+    )
+    order = result.scalars().unique().one_or_none()
+    if not order:
+        raise ResourceNotFoundError("Order", order_id)
+    return order
+
+
 # PUBLIC_INTERFACE
 @router.post(
     "/",
@@ -32,10 +121,20 @@ router = APIRouter(
     Create a new order with multiple items.
     
     The endpoint will:
+    - Merge duplicate product lines into a single order item
     - Validate product existence and stock availability
     - Calculate total amount
-    - Update product stock levels
+    - Atomically reserve product stock
     - Create order with items
+
+    Send an `Idempotency-Key` header to make retries safe: a repeated
+    request with the same key and body returns the stored response (with
+    an `Idempotent-Replayed: true` header) instead of creating another
+    order. Reusing a key with a different body is rejected.
+
+    When the queued order pipeline is enabled, the order is only validated
+    and queued: the response is `202 Accepted` with the queue entry in
+    `pending` status, to be polled at `GET /orders/queue/{id}`.
     """,
     responses={
         201: {
@@ -68,6 +167,10 @@ router = APIRouter(
                 }
             }
         },
+        202: {
+            "model": QueuedOrderResponse,
+            "description": "Order queued for processing (queued mode)",
+        },
         404: {
             "description": "Product not found",
             "content": {
@@ -100,83 +203,222 @@ router = APIRouter(
         }
     }
 )
-def create_order(order: OrderCreate, db: Session = Depends(get_db)):
+async def create_order(
+    order: OrderCreate,
+    db: AsyncSession = Depends(get_db),
+    cache: ProductCache = Depends(get_product_cache),
+    idempotency_key: Optional[str] = Header(
+        None, alias="Idempotency-Key", min_length=1, max_length=255
+    ),
+    queue: Optional[OrderQueue] = Depends(get_order_queue)
+):
     """
     Create a new order with items.
 
     Args:
         order (OrderCreate): Order data including items
-        db (Session): Database session
+        db (AsyncSession): Database session
+        cache (ProductCache): Product cache to invalidate
+        idempotency_key (Optional[str]): Client key identifying retries of
+            the same request
+        queue (Optional[OrderQueue]): Order queue in queued mode
 
     Returns:
-        OrderResponse: Created order with all details
+        OrderResponse: Created order with all details, the queue entry in
+            queued mode, or the stored response of an earlier request with
+            the same key
 
     Raises:
         HTTPException: If products don't exist or insufficient stock
     """
     try:
-        # Create new order instance
+        # Claim the key first; a concurrent duplicate blocks here until
+        # this transaction commits, then replays its response
+        claim = None
+        if idempotency_key:
+            claim = await claim_idempotency_key(
+                db,
+                idempotency_key,
+                request_fingerprint(order.model_dump(mode="json"))
+            )
+            if claim.response_body is not None:
+                return replay_response(claim)
+
+        if queue is not None:
+            entry = await queue.enqueue(db, order.model_dump_json())
+            body = QueuedOrderResponse.model_validate(entry).model_dump(
+                mode="json"
+            )
+            if claim is not None:
+                store_response(claim, status.HTTP_202_ACCEPTED, body)
+            await db.commit()
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content=body,
+                headers={"Location": f"/orders/queue/{entry.id}"}
+            )
+
+        # Create new order instance; the timestamp is set here so the sales
+        # aggregates are booked on the day the order is stored with
+        now = datetime.utcnow()
         db_order = Order(
             customer_name=order.customer_name,
             customer_email=order.customer_email,
             total_amount=0,  # Will be calculated from items
-            status=OrderStatus.PENDING
+            status=OrderStatus.PENDING,
+            created_at=now,
+            updated_at=now
         )
 
-        total_amount = 0
-        order_items = []
+        # Merge duplicate product lines so stock is validated per product
+        quantities = merge_order_lines(order.items)
 
-        # Process each order item
-        for item in order.items:
-            # Get product and validate
-            product = (
-                db.query(Product)
-                .filter(Product.id == item.product_id)
-                .first()
-            )
+        # Fetch every referenced product in a single round trip
+        result = await db.execute(
+            select(Product).where(Product.id.in_(quantities))
+        )
+        products = {product.id: product for product in result.scalars()}
+
+        # Validate every line before touching stock
+        for product_id, quantity in quantities.items():
+            product = products.get(product_id)
             if not product:
-                raise ResourceNotFoundError("Product", item.product_id)
+                raise ResourceNotFoundError("Product", product_id)
             # Check stock availability
-            if product.stock < item.quantity:
+            if product.stock < quantity:
                 msg = (
                     f"Insufficient stock for product {product.id}. "
-                    f"Available: {product.stock}, Requested: {item.quantity}"
+                    f"Available: {product.stock}, Requested: {quantity}"
                 )
                 raise BusinessLogicError(msg)
 
+        # Atomically decrement stock; guards against concurrent checkouts
+        await reserve_stock(db, quantities)
+
+        total_amount = 0
+        order_items = []
+
+        # Process each order line
+        for product_id, quantity in quantities.items():
+            product = products[product_id]
+
             # Create order item
-            subtotal = product.price * item.quantity
+            subtotal = product.price * quantity
             order_item = OrderItem(
                 product_id=product.id,
-                quantity=item.quantity,
+                quantity=quantity,
                 unit_price=product.price,
                 subtotal=subtotal
             )
-            # Update product stock
-            product.stock -= item.quantity
             total_amount += subtotal
             order_items.append(order_item)
         # Update order total and items
         db_order.total_amount = total_amount
         db_order.order_items = order_items
+        await record_sales(db, order_sales(order_items, now.date()))
 
-        # Save to database
+        # Save to database; generated values are populated by the flush
         db.add(db_order)
-        db.commit()
-        db.refresh(db_order)
+        if claim is not None:
+            await db.flush()
+            store_response(
+                claim,
+                status.HTTP_201_CREATED,
+                OrderResponse.model_validate(db_order).model_dump(mode="json")
+            )
+        await db.commit()
+        await cache.invalidate(quantities)
         return db_order
 
+    except APIError:
+        # Release any stock reserved before the failure
+        await db.rollback()
+        raise
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise DatabaseError(f"Error creating order: {str(e)}")
 
 
+# PUBLIC_INTERFACE
+@router.post(
+    "/status:batch",
+    response_model=List[OrderStatusChangeResult],
+    summary="Change the status of many orders",
+    description="""
+    Apply a batch of `{order_id, status}` changes, validated against the
+    same transition rules as `PUT /orders/{order_id}`.
+
+    Changes are applied in chunks, each in its own transaction, with one
+    UPDATE per (from, to) status pair; stock of cancelled orders is
+    restored with aggregated UPDATEs. The response holds one result per
+    change, in input order.
+    """,
+    responses={
+        200: {
+            "description": "Changes applied; see the per-order status",
+            "content": {
+                "application/json": {
+                    "example": [
+                        {
+                            "index": 0,
+                            "order_id": 12,
+                            "status": "updated",
+                            "from_status": "processing",
+                            "to_status": "completed"
+                        },
+                        {
+                            "index": 1,
+                            "order_id": 99,
+                            "status": "not_found",
+                            "to_status": "completed",
+                            "detail": "Order with id 99 not found"
+                        }
+                    ]
+                }
+            }
+        }
+    }
+)
+async def batch_update_status(
+    changes: List[OrderStatusChange],
+    db: AsyncSession = Depends(get_db),
+    cache: ProductCache = Depends(get_product_cache)
+) -> List[OrderStatusChangeResult]:
+    """
+    Change the status of many orders at once.
+
+    Args:
+        changes (List[OrderStatusChange]): Status changes to apply
+        db (AsyncSession): Database session
+        cache (ProductCache): Product cache to invalidate
+
+    Returns:
+        List[OrderStatusChangeResult]: One result per change, in input order
+    """
+    results, restocked = await apply_status_changes(db, changes)
+    await cache.invalidate(restocked)
+    return results
+
+
 # PUBLIC_INTERFACE
 @router.get(
     "/",
-    response_model=List[OrderResponse],
+    response_model=Union[List[OrderResponse], OrderPage],
     summary="List all orders",
-    description="Get a paginated list of all orders with their items",
+    description="""
+    Get a paginated list of all orders with their items.
+
+    Two pagination modes are supported:
+    - Offset mode (default): `skip` and `limit`, returns a plain list
+    - Cursor mode: pass `cursor` (empty for the first page) and `limit`,
+      returns `{"items": [...], "next_cursor": "..."}`. Orders are sorted
+      by `(created_at, id)` and every page costs the same as the first.
+
+    Both modes can be filtered by `status` and `customer_email`.
+
+    Responses carry a weak `ETag` for the page; send it back in
+    `If-None-Match` to get `304 Not Modified` while the page is unchanged.
+    """,
     responses={
         200: {
             "description": "List of orders retrieved successfully",
@@ -215,28 +457,245 @@ def create_order(order: OrderCreate, db: Session = Depends(get_db)):
         }
     }
 )
-def list_orders(
+async def list_orders(
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    status_filter: Optional[OrderStatus] = Query(None, alias="status"),
+    customer_email: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    preconditions: Preconditions = Depends(get_preconditions)
 ):
     """
-    List all orders with pagination.
+    List all orders with offset or keyset pagination.
 
     Args:
-        skip (int): Number of records to skip
-        limit (int): Maximum number of records to return
-        db (Session): Database session
+        skip (int): Number of records to skip (offset mode only)
+        limit (int): Maximum number of records to return; 1 to 100 in
+            keyset mode
+        cursor (Optional[str]): Cursor from the previous page; enables
+            keyset pagination when present, empty for the first page
+        status_filter (Optional[OrderStatus]): Only return orders with
+            this status
+        customer_email (Optional[str]): Only return orders of this customer
+        db (AsyncSession): Database session
+        preconditions (Preconditions): Conditional request headers
 
     Returns:
-        List[OrderResponse]: List of orders
+        Union[List[OrderResponse], OrderPage]: List of orders in offset
+            mode, or a page with the next cursor in keyset mode; 304 if
+            the client's copy of the page is current
+
+    Raises:
+        ValidationError: If the cursor is malformed or the page size is out
+            of range
     """
+    if cursor is not None:
+        check_page_size(limit, 100)
+    query = order_rows()
+    if status_filter is not None:
+        query = query.where(Order.status == status_filter)
+    if customer_email is not None:
+        query = query.where(Order.customer_email == customer_email)
+
+    if cursor is None:
+        query = query.offset(skip).limit(limit)
+    else:
+        if cursor:
+            query = query.where(
+                created_at_keyset(cursor, Order.created_at, Order.id)
+            )
+        # Fetch one extra row to know whether another page follows
+        query = query.order_by(Order.created_at, Order.id).limit(limit + 1)
+
     try:
-        orders = db.query(Order).offset(skip).limit(limit).all()
-        return orders
+        rows = (await db.execute(query)).all()
+        next_cursor = None
+        if cursor is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_created_at_cursor(
+                rows[-1].created_at, rows[-1].id
+            )
+        # Items only change along with their order's updated_at, so an
+        # unchanged page is answered before they are loaded
+        etag = page_etag(preconditions.query, rows)
+        if preconditions.matches(etag):
+            return not_modified(etag)
+        documents = await order_documents(db, rows)
     except SQLAlchemyError as e:
         raise DatabaseError(f"Error listing orders: {str(e)}")
 
+    headers = validator_headers(etag)
+    if cursor is None:
+        return render(documents, headers=headers)
+    return render(
+        {"items": documents, "next_cursor": next_cursor}, headers=headers
+    )
+
+
+# PUBLIC_INTERFACE
+@router.get(
+    "/summary",
+    response_model=List[OrderTotals],
+    summary="Summarize orders by day or status",
+    description="""
+    Get the number of orders and their total amount for the orders placed
+    between `from` and `to` (UTC days, inclusive; the last 30 days by
+    default), grouped by `day` or by current `status`.
+
+    Past days are read from a daily rollup refreshed in the background
+    every `ORDER_ROLLUP_REFRESH_SECONDS`, so changes to them show up after
+    the next refresh. The current day is always aggregated live.
+    """,
+    responses={
+        200: {"description": "Summary retrieved successfully"},
+        400: {"description": "`from` is after `to`"}
+    }
+)
+async def summarize_orders(
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    group_by: Literal["day", "status"] = "day",
+    db: AsyncSession = Depends(get_read_db)
+) -> JSONResponse:
+    """
+    Summarize orders placed in a range of days.
+
+    Args:
+        start (Optional[date]): First day, 29 days before ``end`` by default
+        end (Optional[date]): Last day, today by default
+        group_by (Literal["day", "status"]): Grouping of the totals
+        db (AsyncSession): Database session
+
+    Returns:
+        JSONResponse: Order count and revenue per group
+
+    Raises:
+        ValidationError: If ``start`` is after ``end``
+    """
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise ValidationError("'from' must not be after 'to'")
+    try:
+        totals = await order_totals(db, start, end, group_by)
+    except SQLAlchemyError as e:
+        raise DatabaseError(f"Error summarizing orders: {str(e)}")
+    return render(totals)
+
+
+# PUBLIC_INTERFACE
+@router.get(
+    "/export",
+    summary="Export orders with their items",
+    description="""
+    Stream every order with its items in a single response.
+
+    - `format=ndjson` (default): one JSON order with `order_items` per line
+    - `format=csv`: one line per order item with the order columns repeated
+
+    Rows are read through a server-side cursor in batches, so memory use
+    stays constant regardless of how many orders are exported. Results can
+    be filtered by `status` and `customer_email`.
+    """,
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Orders streamed successfully",
+            "content": {
+                "application/x-ndjson": {},
+                "text/csv": {}
+            }
+        }
+    }
+)
+async def export_orders(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    status_filter: Optional[OrderStatus] = Query(None, alias="status"),
+    customer_email: Optional[str] = None,
+    session_factory: async_sessionmaker = Depends(get_session_factory)
+) -> StreamingResponse:
+    """
+    Stream all orders with their items as NDJSON or CSV.
+
+    Args:
+        export_format (str): Output format, ``ndjson`` or ``csv``
+        status_filter (Optional[OrderStatus]): Only export orders with
+            this status
+        customer_email (Optional[str]): Only export orders of this customer
+        session_factory (async_sessionmaker): Factory for the session that
+            reads while the response is streamed
+
+    Returns:
+        StreamingResponse: Streamed export body
+    """
+    query = export_query()
+    if status_filter is not None:
+        query = query.where(Order.status == status_filter)
+    if customer_email is not None:
+        query = query.where(Order.customer_email == customer_email)
+
+    if export_format == "csv":
+        return StreamingResponse(
+            stream_csv(session_factory, query),
+            media_type="text/csv",
+            headers={"Content-Disposition": "attachment; filename=orders.csv"}
+        )
+    return StreamingResponse(
+        stream_ndjson(session_factory, query),
+        media_type="application/x-ndjson"
+    )
+
+
+# PUBLIC_INTERFACE
+@router.get(
+    "/queue/{entry_id}",
+    response_model=QueuedOrderResponse,
+    summary="Get the status of a queued order",
+    description="""
+    Poll an order accepted with `202 Accepted` in queued mode. Once
+    processed the status is `completed` with the created `order_id`, or
+    `failed` with the reason in `detail`.
+    """,
+    responses={
+        404: {
+            "description": "Queued order not found",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Queued order with id 1 not found"
+                    }
+                }
+            }
+        }
+    }
+)
+async def get_queued_order(
+    entry_id: int,
+    db: AsyncSession = Depends(get_db),
+    queue: Optional[OrderQueue] = Depends(get_order_queue)
+):
+    """
+    Get the processing status of a queued order.
+
+    Args:
+        entry_id (int): Queue entry ID returned when the order was accepted
+        db (AsyncSession): Database session; the writer is used so the
+            status is never stale
+        queue (Optional[OrderQueue]): Order queue in queued mode
+
+    Returns:
+        QueuedOrderResponse: Queue entry status
+
+    Raises:
+        ResourceNotFoundError: If the entry does not exist or orders are
+            not queued
+    """
+    entry = await queue.get(db, entry_id) if queue is not None else None
+    if entry is None:
+        raise ResourceNotFoundError("Queued order", entry_id)
+    return entry
+
 
 # PUBLIC_INTERFACE
 @router.get(
@@ -268,6 +727,9 @@ def list_orders(
                 }
             }
         },
+        304: {
+            "description": "Order unchanged since the client's copy"
+        },
         404: {
             "description": "Order not found",
             "content": {
@@ -290,35 +752,54 @@ def list_orders(
         }
     }
 )
-def get_order(order_id: int, db: Session = Depends(get_db)):
+async def get_order(
+    order_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    preconditions: Preconditions = Depends(get_preconditions)
+):
     """
     Get a specific order by ID.
 
+    Conditional requests are answered from the order's ``updated_at``
+    alone, before the order and its items are loaded.
+
     Args:
         order_id (int): Order ID
-        db (Session): Database session
+        db (AsyncSession): Database session
+        preconditions (Preconditions): Conditional request headers
 
     Returns:
-        OrderResponse: Order details
+        OrderResponse: Order details with ``ETag`` and ``Last-Modified``,
+            or 304 if the client's copy is current
 
     Raises:
         HTTPException: If order not found
     """
     try:
-        order = db.query(Order).filter(Order.id == order_id).first()
-        if not order:
-            raise ResourceNotFoundError("Order", order_id)
-        return order
+        if preconditions:
+            updated_at = await db.scalar(
+                select(Order.updated_at).where(Order.id == order_id)
+            )
+            if updated_at is None:
+                raise ResourceNotFoundError("Order", order_id)
+            etag = entity_etag(order_id, updated_at)
+            if preconditions.matches(etag, updated_at):
+                return not_modified(etag, updated_at)
+        order = await _get_order(db, order_id, "get_order")
     except SQLAlchemyError as e:
         raise DatabaseError(f"Error retrieving order: {str(e)}")
+    return render(order_document(order), headers=validator_headers(
+        entity_etag(order.id, order.updated_at), order.updated_at
+    ))
 
 
 # PUBLIC_INTERFACE
 @router.put("/{order_id}", response_model=OrderResponse)
-def update_order(
+async def update_order(
     order_id: int,
     order_update: OrderUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    cache: ProductCache = Depends(get_product_cache)
 ):
     """
     Update order status.
@@ -326,7 +807,8 @@ def update_order(
     Args:
         order_id (int): Order ID
         order_update (OrderUpdate): Update data
-        db (Session): Database session
+        db (AsyncSession): Database session
+        cache (ProductCache): Product cache to invalidate
 
     Returns:
         OrderResponse: Updated order
@@ -335,92 +817,80 @@ def update_order(
         HTTPException: If order not found or invalid status transition
     """
     try:
-        order = db.query(Order).filter(Order.id == order_id).first()
-        if not order:
-            raise ResourceNotFoundError("Order", order_id)
-
-        # Validate status transition
-        current_status = OrderStatus(order.status)
         new_status = order_update.status
 
-        # Define valid status transitions
-        valid_transitions = {
-            OrderStatus.PENDING: {
-                OrderStatus.PROCESSING,
-                OrderStatus.CANCELLED
-            },
-            OrderStatus.PROCESSING: {
-                OrderStatus.COMPLETED,
-                OrderStatus.CANCELLED
-            },
-            OrderStatus.COMPLETED: set(),  # No transitions from completed
-            OrderStatus.CANCELLED: set()  # No transitions from cancelled
-        }
-
-        if new_status not in valid_transitions[current_status]:
-            valid_trans = ', '.join(
-                str(s) for s in valid_transitions[current_status]
+        # Check and apply the transition in one statement, so concurrent
+        # updates of the same order cannot both succeed
+        result = await db.execute(
+            Order.transition_statement(order_id, new_status)
+        )
+        if result.rowcount != 1:
+            current_status = await db.scalar(
+                select(Order.status).where(Order.id == order_id)
             )
-            msg = (
-                f"Invalid status transition from {current_status} "
-                f"to {new_status}. Valid transitions are: {valid_trans}"
+            if current_status is None:
+                raise ResourceNotFoundError("Order", order_id)
+            check_transition(OrderStatus(current_status), new_status)
+            raise BusinessLogicError(
+                f"Order {order_id} changed concurrently, please retry"
             )
-            raise BusinessLogicError(msg)
-
-        # If cancelling order, restore product stock
-        if (new_status == OrderStatus.CANCELLED and
-                current_status != OrderStatus.CANCELLED):
-            for item in order.order_items:
-                product = (
-                    db.query(Product)
-                    .filter(Product.id == item.product_id)
-                    .first()
-                )
-                if product:
-                    product.stock += item.quantity
 
-        order.status = new_status
-        db.commit()
-        db.refresh(order)
+        order = await _get_order(db, order_id, "update_order")
+
+        # If cancelling order, restore product stock; only pending and
+        # processing orders can be cancelled, so stock is still reserved
+        restored = {}
+        if new_status == OrderStatus.CANCELLED:
+            restored = merge_order_lines(order.order_items)
+            await restore_stock(db, restored)
+            await record_sales(db, order_sales(
+                order.order_items, order.created_at.date(), sign=-1
+            ))
+
+        await db.commit()
+        await cache.invalidate(restored)
         return order
 
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise DatabaseError(f"Error updating order: {str(e)}")
 
 
 # PUBLIC_INTERFACE
 @router.delete("/{order_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_order(order_id: int, db: Session = Depends(get_db)):
+async def delete_order(
+    order_id: int,
+    db: AsyncSession = Depends(get_db),
+    cache: ProductCache = Depends(get_product_cache)
+):
     """
     Delete an order.
 
     Args:
         order_id (int): Order ID
-        db (Session): Database session
+        db (AsyncSession): Database session
+        cache (ProductCache): Product cache to invalidate
 
     Raises:
         HTTPException: If order not found or cannot be deleted
     """
     try:
-        order = db.query(Order).filter(Order.id == order_id).first()
-        if not order:
-            raise ResourceNotFoundError("Order", order_id)
+        order = await _get_order(db, order_id, "delete_order")
 
-        # Restore product stock if order is not cancelled
+        # Restore product stock and sales if order is not cancelled
+        restored = {}
         if order.status != OrderStatus.CANCELLED:
-            for item in order.order_items:
-                product = (
-                    db.query(Product)
-                    .filter(Product.id == item.product_id)
-                    .first()
-                )
-                if product:
-                    product.stock += item.quantity
+            restored = merge_order_lines(order.order_items)
+            await restore_stock(db, restored)
+            await record_sales(db, order_sales(
+                order.order_items, order.created_at.date(), sign=-1
+            ))
+        await mark_day_stale(db, order.created_at.date())
 
-        db.delete(order)
-        db.commit()
+        await db.delete(order)
+        await db.commit()
+        await cache.invalidate(restored)
 
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise DatabaseError(f"Error deleting order: {str(e)}")
@@ -1,21 +1,52 @@
 """Product router module."""
-from typing import List
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from typing import List, Literal, Optional, Union
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 
-from src.database import get_db
+from src.database import (
+    get_db,
+    get_read_db,
+    get_read_sticky,
+    is_replica_session
+)
+from src.bulk import bulk_upsert_products
+from src.cache import ProductCache, get_product_cache
+from src.conditional import (
+    Preconditions,
+    entity_etag,
+    get_preconditions,
+    not_modified,
+    page_etag,
+    validator_headers
+)
 from src.errors import (
     ResourceNotFoundError,
-    DatabaseError
+    DatabaseError,
+    ValidationError
 )
 from src.models.product import Product
+from src.pagination import check_page_size
+from src.projections import product_list_cursor, product_list_query
+from src.rendering import product_document, render
+from src.sales import top_sellers
+from src.search import search_products
 from src.schemas.product import (
+    ProductBulkItem,
+    ProductBulkResult,
     ProductCreate,
+    ProductPage,
     ProductUpdate,
-    ProductResponse
+    ProductResponse,
+    ProductSales
 )
 
+# Longest window accepted by GET /products/top-sellers
+MAX_SALES_WINDOW_DAYS = 366
+
 
 # Create router instance
 router = APIRouter(
@@ -27,9 +58,24 @@ router = APIRouter(
 # PUBLIC_INTERFACE
 @router.get(
     "/",
-    response_model=List[ProductResponse],
+    response_model=Union[List[ProductResponse], ProductPage],
     summary="List all products",
-    description="Get a paginated list of all products in the system",
+    description="""
+    Get a paginated list of all products in the system.
+
+    Products can be filtered by price range (`min_price`, `max_price`) and
+    availability (`in_stock`), and sorted by `id` (default), `name`,
+    `price` or `updated_at` in `order` `asc` or `desc`; ties are broken
+    by `id`. Every sort is backed by an index.
+
+    Pass `cursor` (empty for the first page) to switch from offset to
+    keyset pagination on the sort key; the response then becomes
+    `{"items": [...], "next_cursor": "..."}`. A cursor is only valid with
+    the sort it was returned for.
+
+    Responses carry a weak `ETag` for the page; send it back in
+    `If-None-Match` to get `304 Not Modified` while the page is unchanged.
+    """,
     responses={
         200: {
             "description": "List of products retrieved successfully",
@@ -69,25 +115,192 @@ router = APIRouter(
 async def list_products(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
-) -> List[Product]:
+    cursor: Optional[str] = None,
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    in_stock: Optional[bool] = None,
+    sort: Literal["id", "name", "price", "updated_at"] = "id",
+    order: Literal["asc", "desc"] = "asc",
+    db: AsyncSession = Depends(get_read_db),
+    preconditions: Preconditions = Depends(get_preconditions)
+) -> Response:
     """
-    Get a list of all products with pagination.
+    Get a filtered, sorted list of products with offset or keyset
+    pagination.
 
     Args:
-        skip (int): Number of records to skip
-        limit (int): Maximum number of records to return
-        db (Session): Database session
+        skip (int): Number of records to skip (offset mode only)
+        limit (int): Maximum number of records to return; 1 to 500 in
+            keyset mode
+        cursor (Optional[str]): Cursor from the previous page; enables
+            keyset pagination when present, empty for the first page
+        min_price (Optional[float]): Lowest price, inclusive
+        max_price (Optional[float]): Highest price, inclusive
+        in_stock (Optional[bool]): Only products with or without stock
+        sort (Literal["id", "name", "price", "updated_at"]): Sort key
+        order (Literal["asc", "desc"]): Sort direction
+        db (AsyncSession): Database session
+        preconditions (Preconditions): Conditional request headers
 
     Returns:
-        List[Product]: List of products
+        Response: List of products in offset mode, or a page with the
+            next cursor in keyset mode; 304 if the client's copy of the
+            page is current
+
+    Raises:
+        ValidationError: If the cursor is malformed, the price range is
+            empty or the keyset page size is out of range
     """
+    if cursor is not None:
+        check_page_size(limit, 500)
+    if min_price is not None and max_price is not None and min_price > max_price:
+        raise ValidationError("min_price must not be greater than max_price")
+    query = product_list_query(
+        min_price=min_price,
+        max_price=max_price,
+        in_stock=in_stock,
+        sort=sort,
+        descending=order == "desc",
+        cursor=cursor
+    )
+    if cursor is None:
+        query = query.offset(skip).limit(limit)
+    else:
+        # Fetch one extra row to know whether another page follows
+        query = query.limit(limit + 1)
+
     try:
-        products = db.query(Product).offset(skip).limit(limit).all()
-        return products
+        rows = (await db.execute(query)).all()
     except SQLAlchemyError as e:
         raise DatabaseError(f"Error listing products: {str(e)}")
 
+    next_cursor = None
+    if cursor is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = product_list_cursor(rows[-1], sort)
+    etag = page_etag(preconditions.query, rows)
+    if preconditions.matches(etag):
+        return not_modified(etag)
+
+    documents = [product_document(row) for row in rows]
+    headers = validator_headers(etag)
+    if cursor is None:
+        return render(documents, headers=headers)
+    return render(
+        {"items": documents, "next_cursor": next_cursor}, headers=headers
+    )
+
+
+# PUBLIC_INTERFACE
+@router.get(
+    "/search",
+    response_model=ProductPage,
+    summary="Search products",
+    description="""
+    Search products by text, one keyset-paginated page at a time: pass the
+    `next_cursor` of a page as `cursor` to get the next one.
+
+    - `mode=fulltext` (default): products whose name or description
+      contains any word of `q`, most relevant first. Backed by a FULLTEXT
+      index on MySQL, so words shorter than the server's minimum token
+      size and stopwords are ignored.
+    - `mode=prefix`: products whose name starts with `q`, in name order,
+      for autocompletion.
+    """,
+    responses={
+        200: {"description": "Matching products retrieved successfully"},
+        400: {"description": "Invalid pagination cursor"}
+    }
+)
+async def search_products_endpoint(
+    q: str = Query(..., min_length=1, max_length=255),
+    mode: Literal["fulltext", "prefix"] = "fulltext",
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db)
+) -> JSONResponse:
+    """
+    Search products by name and description.
+
+    Args:
+        q (str): Search text
+        mode (Literal["fulltext", "prefix"]): Matching mode
+        cursor (Optional[str]): Cursor from the previous page
+        limit (int): Maximum number of products per page
+        db (AsyncSession): Database session
+
+    Returns:
+        JSONResponse: Page of matching products and the next cursor
+
+    Raises:
+        ValidationError: If the cursor is malformed
+    """
+    try:
+        rows, next_cursor = await search_products(db, q, mode, cursor, limit)
+    except SQLAlchemyError as e:
+        raise DatabaseError(f"Error searching products: {str(e)}")
+    return render({
+        "items": [product_document(row) for row in rows],
+        "next_cursor": next_cursor,
+    })
+
+
+# PUBLIC_INTERFACE
+@router.get(
+    "/top-sellers",
+    response_model=List[ProductSales],
+    summary="List the best selling products",
+    description="""
+    Rank products by units sold over the last `window` days (`7d` covers
+    today and the six previous UTC days), net of cancelled and deleted
+    orders.
+
+    Served from daily per-product aggregates maintained with every order
+    change, so the cost does not grow with the number of orders.
+    """,
+    responses={
+        200: {"description": "Top sellers retrieved successfully"},
+        400: {"description": "Window longer than MAX_SALES_WINDOW_DAYS"}
+    }
+)
+async def list_top_sellers(
+    window: str = Query("7d", pattern=r"^[1-9][0-9]*d$"),
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_read_db)
+) -> JSONResponse:
+    """
+    List the products with the most units sold in a window of days.
+
+    Args:
+        window (str): Number of days followed by ``d``, e.g. ``7d``
+        limit (int): Maximum number of products
+        db (AsyncSession): Database session
+
+    Returns:
+        JSONResponse: Products with units sold and revenue, best first
+
+    Raises:
+        ValidationError: If the window exceeds ``MAX_SALES_WINDOW_DAYS``
+    """
+    days = int(window[:-1])
+    if days > MAX_SALES_WINDOW_DAYS:
+        raise ValidationError(
+            f"Window cannot exceed {MAX_SALES_WINDOW_DAYS} days"
+        )
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    try:
+        rows = await top_sellers(db, since, limit)
+    except SQLAlchemyError as e:
+        raise DatabaseError(f"Error listing top sellers: {str(e)}")
+    return render([
+        {
+            "product_id": row.product_id,
+            "units_sold": int(row.units_sold),
+            "revenue": round(float(row.revenue), 2),
+        }
+        for row in rows
+    ])
+
 
 # PUBLIC_INTERFACE
 @router.get(
@@ -110,6 +323,9 @@ async def list_products(
                 }
             }
         },
+        304: {
+            "description": "Product unchanged since the client's copy"
+        },
         404: {
             "description": "Product not found",
             "content": {
@@ -134,26 +350,67 @@ async def list_products(
 )
 async def get_product(
     product_id: int,
-    db: Session = Depends(get_db),
-) -> Product:
+    db: AsyncSession = Depends(get_read_db),
+    cache: ProductCache = Depends(get_product_cache),
+    preconditions: Preconditions = Depends(get_preconditions),
+    sticky: bool = Depends(get_read_sticky)
+) -> Response:
     """
-    Get a specific product by ID.
+    Get a specific product by ID, served from the product cache when
+    possible.
+
+    Clients that wrote recently (see ``get_read_db``) bypass the cache so
+    they see their own changes, and only rows read from the writer fill
+    it: a lagging replica could otherwise cache a row a write has just
+    invalidated for the whole TTL. For the same reason the fill is dropped
+    if the product is invalidated while it is being read.
+
+    Conditional requests are answered from the cached document, or else
+    from the product's ``updated_at`` alone, before the product is loaded.
 
     Args:
         product_id (int): Product ID
-        db (Session): Database session
+        db (AsyncSession): Database session
+        cache (ProductCache): Read-through product cache
+        preconditions (Preconditions): Conditional request headers
+        sticky (bool): Whether the client must read its own writes
 
     Returns:
-        Product: Product details
+        Response: Product details with ``ETag`` and ``Last-Modified``, or
+            304 if the client's copy is current
 
     Raises:
         HTTPException: If product is not found
     """
+    cached = None if sticky else await cache.get(product_id)
+    if cached is not None:
+        updated_at = datetime.fromisoformat(cached["updated_at"])
+        etag = entity_etag(product_id, updated_at)
+        if preconditions.matches(etag, updated_at):
+            return not_modified(etag, updated_at)
+        return render(cached, headers=validator_headers(etag, updated_at))
+    # Taken before the read so a write invalidating the product meanwhile
+    # keeps the row read here out of the cache
+    generation = cache.generation()
     try:
-        product = db.query(Product).filter(Product.id == product_id).first()
+        if preconditions:
+            updated_at = await db.scalar(
+                select(Product.updated_at).where(Product.id == product_id)
+            )
+            if updated_at is None:
+                raise ResourceNotFoundError("Product", product_id)
+            etag = entity_etag(product_id, updated_at)
+            if preconditions.matches(etag, updated_at):
+                return not_modified(etag, updated_at)
+        product = await db.get(Product, product_id)
         if not product:
             raise ResourceNotFoundError("Product", product_id)
-        return product
+        data = product_document(product)
+        if not is_replica_session(db):
+            await cache.set(product_id, data, generation)
+        return render(data, headers=validator_headers(
+            entity_etag(product.id, product.updated_at), product.updated_at
+        ))
     except SQLAlchemyError as e:
         raise DatabaseError(f"Error retrieving product: {str(e)}")
 
@@ -194,14 +451,14 @@ async def get_product(
 )
 async def create_product(
     product: ProductCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Product:
     """
     Create a new product.
 
     Args:
         product (ProductCreate): Product data
-        db (Session): Database session
+        db (AsyncSession): Database session
 
     Returns:
         Product: Created product details
@@ -209,20 +466,80 @@ async def create_product(
     try:
         db_product = Product(**product.model_dump())
         db.add(db_product)
-        db.commit()
-        db.refresh(db_product)
+        await db.commit()
+        await db.refresh(db_product)
         return db_product
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise DatabaseError(f"Error creating product: {str(e)}")
 
 
+# PUBLIC_INTERFACE
+@router.post(
+    "/bulk",
+    response_model=List[ProductBulkResult],
+    summary="Create and update products in bulk",
+    description="""
+    Apply a large batch of product rows with set-based statements.
+
+    - Rows without `id` are created (all `ProductCreate` fields required)
+    - Rows with `id` and all `ProductCreate` fields are upserted
+    - Rows with `id` and some fields update an existing product
+    - Repeats of an `id` already in the request are reported `invalid`
+
+    Rows are written in chunks, each with multi-row INSERT/upsert and
+    UPDATE statements inside its own transaction; on MySQL the ids of
+    created rows are read back with one extra SELECT per chunk. The
+    response holds one result per input row, in input order.
+    """,
+    responses={
+        200: {
+            "description": "Rows applied; see the per-row status",
+            "content": {
+                "application/json": {
+                    "example": [
+                        {"index": 0, "id": 12, "status": "created"},
+                        {"index": 1, "id": 3, "status": "updated"},
+                        {
+                            "index": 2,
+                            "id": 99,
+                            "status": "not_found",
+                            "detail": "Product with id 99 not found"
+                        }
+                    ]
+                }
+            }
+        }
+    }
+)
+async def bulk_upsert(
+    items: List[ProductBulkItem],
+    db: AsyncSession = Depends(get_db),
+    cache: ProductCache = Depends(get_product_cache)
+) -> List[ProductBulkResult]:
+    """
+    Create and update many products at once.
+
+    Args:
+        items (List[ProductBulkItem]): Product rows to apply
+        db (AsyncSession): Database session
+        cache (ProductCache): Product cache to invalidate
+
+    Returns:
+        List[ProductBulkResult]: Outcome of every row, in input order
+    """
+    results = await bulk_upsert_products(db, items)
+    await cache.invalidate(r.id for r in results if r.status == "updated")
+    return results
+
+
 # PUBLIC_INTERFACE
 @router.put("/{product_id}", response_model=ProductResponse)
 async def update_product(
     product_id: int,
     product: ProductUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    cache: ProductCache = Depends(get_product_cache)
 ) -> Product:
     """
     Update a product.
@@ -230,7 +547,8 @@ async def update_product(
     Args:
         product_id (int): Product ID
         product (ProductUpdate): Updated product data
-        db (Session): Database session
+        db (AsyncSession): Database session
+        cache (ProductCache): Product cache to invalidate
 
     Returns:
         Product: Updated product details
@@ -239,7 +557,7 @@ async def update_product(
         HTTPException: If product is not found
     """
     try:
-        db_product = db.query(Product).filter(Product.id == product_id).first()
+        db_product = await db.get(Product, product_id)
         if not db_product:
             raise ResourceNotFoundError("Product", product_id)
 
@@ -247,11 +565,12 @@ async def update_product(
         for field, value in update_data.items():
             setattr(db_product, field, value)
 
-        db.commit()
-        db.refresh(db_product)
+        await db.commit()
+        await cache.invalidate([product_id])
+        await db.refresh(db_product)
         return db_product
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise DatabaseError(f"Error updating product: {str(e)}")
 
 
@@ -262,25 +581,28 @@ async def update_product(
 )
 async def delete_product(
     product_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
+    cache: ProductCache = Depends(get_product_cache),
 ) -> None:
     """
     Delete a product.
 
     Args:
         product_id (int): Product ID
-        db (Session): Database session
+        db (AsyncSession): Database session
+        cache (ProductCache): Product cache to invalidate
 
     Raises:
         HTTPException: If product is not found
     """
     try:
-        db_product = db.query(Product).filter(Product.id == product_id).first()
+        db_product = await db.get(Product, product_id)
         if not db_product:
             raise ResourceNotFoundError("Product", product_id)
 
-        db.delete(db_product)
-        db.commit()
+        await db.delete(db_product)
+        await db.commit()
+        await cache.invalidate([product_id])
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise DatabaseError(f"Error deleting product: {str(e)}")
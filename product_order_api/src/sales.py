@@ -0,0 +1,120 @@
+"""Incrementally maintained product sales aggregates."""
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.bulk import BULK_CHUNK_SIZE, upsert_statement
+from src.models.order import OrderItem
+from src.models.product_sales import ProductDailySales
+
+# (product_id, day) -> (units, revenue)
+SalesDelta = Dict[Tuple[int, date], Tuple[int, float]]
+
+
+# PUBLIC_INTERFACE
+def order_sales(
+    items: Iterable[OrderItem],
+    day: date,
+    sign: int = 1,
+    into: Optional[SalesDelta] = None
+) -> SalesDelta:
+    """
+    Compute the sales aggregate change caused by order lines.
+
+    Args:
+        items (Iterable[OrderItem]): Order lines, or rows with
+            ``product_id``, ``quantity`` and ``subtotal``
+        day (date): UTC day the order was placed
+        sign (int): 1 when the order is placed, -1 when it is cancelled or
+            deleted
+        into (Optional[SalesDelta]): Change to add to, e.g. when collecting
+            the lines of several orders
+
+    Returns:
+        SalesDelta: Units and revenue keyed by ``(product_id, day)``
+    """
+    sales = {} if into is None else into
+    for item in items:
+        key = (item.product_id, day)
+        units, revenue = sales.get(key, (0, 0.0))
+        sales[key] = (
+            units + sign * item.quantity,
+            revenue + sign * item.subtotal
+        )
+    return sales
+
+
+# PUBLIC_INTERFACE
+async def record_sales(
+    db: AsyncSession,
+    sales: SalesDelta
+) -> None:
+    """
+    Apply a sales change to the ``product_daily_sales`` table.
+
+    Rows are upserted with ``units = units + :units`` in key order, so
+    concurrent orders add to the same row instead of overwriting it and
+    always lock rows in the same order.
+
+    Args:
+        db (AsyncSession): Database session; the caller owns the transaction
+        sales (SalesDelta): Change computed by :func:`order_sales`
+    """
+    rows = [
+        {
+            "product_id": product_id,
+            "day": day,
+            "units": units,
+            "revenue": revenue,
+        }
+        for (product_id, day), (units, revenue) in sorted(sales.items())
+        if units or revenue
+    ]
+    dialect_name = db.get_bind().dialect.name
+    for start in range(0, len(rows), BULK_CHUNK_SIZE):
+        await db.execute(upsert_statement(
+            dialect_name,
+            ProductDailySales,
+            rows[start:start + BULK_CHUNK_SIZE],
+            ("product_id", "day"),
+            lambda proposed: {
+                "units": ProductDailySales.units + proposed.units,
+                "revenue": ProductDailySales.revenue + proposed.revenue,
+            }
+        ))
+
+
+# PUBLIC_INTERFACE
+async def top_sellers(db: AsyncSession, since: date, limit: int) -> List[Row]:
+    """
+    Rank products by units sold from a day on, reading only the aggregates.
+
+    The cost depends on the number of products sold per day in the window,
+    not on the number of orders.
+
+    Args:
+        db (AsyncSession): Database session
+        since (date): First UTC day of the window
+        limit (int): Maximum number of products
+
+    Returns:
+        List[Row]: Rows with ``product_id``, ``units_sold`` and ``revenue``,
+            best sellers first
+    """
+    units_sold = func.sum(ProductDailySales.units)
+    result = await db.execute(
+        select(
+            ProductDailySales.product_id,
+            units_sold.label("units_sold"),
+            func.sum(ProductDailySales.revenue).label("revenue"),
+        )
+        .where(ProductDailySales.day >= since)
+        .group_by(ProductDailySales.product_id)
+        .having(units_sold > 0)
+        .order_by(units_sold.desc(), ProductDailySales.product_id)
+        .limit(limit)
+    )
+    return result.all()
@@ -1,7 +1,7 @@
 """Order schema module."""
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
-from typing import List
+from typing import List, Literal, Optional, Union
 from pydantic import (
     BaseModel,
     EmailStr,
@@ -64,15 +64,75 @@ class OrderUpdate(BaseModel):
 
 
 # PUBLIC_INTERFACE
-class OrderResponse(OrderBase):
-    """Schema for order response including all fields."""
+class OrderSummary(OrderBase):
+    """Schema for an order without its items."""
     id: int
     total_amount: NonNegativeFloat
     status: OrderStatus
     created_at: datetime
     updated_at: datetime
+
+    class Config:
+        """Pydantic config for ORM mode."""
+        from_attributes = True
+
+
+# PUBLIC_INTERFACE
+class OrderResponse(OrderSummary):
+    """Schema for order response including all fields."""
     order_items: List[OrderItemResponse]
 
+
+# PUBLIC_INTERFACE
+class OrderPage(BaseModel):
+    """Schema for a keyset-paginated page of orders."""
+    items: List[OrderResponse]
+    next_cursor: str | None = None
+
+
+# PUBLIC_INTERFACE
+class CustomerOrderPage(BaseModel):
+    """Schema for a keyset-paginated page of one customer's orders."""
+    items: List[Union[OrderResponse, OrderSummary]]
+    next_cursor: str | None = None
+
+
+# PUBLIC_INTERFACE
+class OrderTotals(BaseModel):
+    """Schema for the number and value of orders of a day or status."""
+    day: Optional[date] = None
+    status: Optional[OrderStatus] = None
+    order_count: int
+    revenue: float
+
+
+# PUBLIC_INTERFACE
+class QueuedOrderResponse(BaseModel):
+    """Schema for an order request accepted into the order queue."""
+    id: int
+    status: Literal["pending", "processing", "completed", "failed"]
+    order_id: Optional[int] = None
+    detail: Optional[str] = None
+    created_at: datetime
+
     class Config:
         """Pydantic config for ORM mode."""
         from_attributes = True
+
+
+# PUBLIC_INTERFACE
+class OrderStatusChange(BaseModel):
+    """Schema for one status change of a batch status update."""
+    order_id: int = Field(..., gt=0)
+    status: OrderStatus
+
+
+# PUBLIC_INTERFACE
+class OrderStatusChangeResult(BaseModel):
+    """Schema for the outcome of one status change of a batch update."""
+    index: int
+    order_id: int
+    status: Literal["updated", "not_found", "invalid", "error"]
+    from_status: OrderStatus | None = None
+    to_status: OrderStatus
+    detail: str | None = None
@@ -1,5 +1,6 @@
 """Product schema module."""
 from datetime import datetime
+from typing import List, Literal
 from pydantic import BaseModel, Field, NonNegativeFloat, NonNegativeInt
 
 
@@ -27,6 +28,27 @@ class ProductUpdate(BaseModel):
     stock: NonNegativeInt | None = None
 
 
+# PUBLIC_INTERFACE
+class ProductBulkItem(ProductUpdate):
+    """
+    Schema for one row of a bulk product upsert.
+
+    Rows without ``id`` are created and must carry every field required by
+    ``ProductCreate``. Rows with ``id`` and all required fields are upserted;
+    rows with ``id`` and only some fields update an existing product.
+    """
+    id: int | None = Field(None, gt=0)
+
+
+# PUBLIC_INTERFACE
+class ProductBulkResult(BaseModel):
+    """Schema for the outcome of one row of a bulk product upsert."""
+    index: int
+    id: int | None = None
+    status: Literal["created", "updated", "not_found", "invalid", "error"]
+    detail: str | None = None
+
+
 # PUBLIC_INTERFACE
 class ProductResponse(ProductBase):
     """Schema for product response including all fields."""
@@ -37,3 +59,18 @@ class ProductResponse(ProductBase):
     class Config:
         """Pydantic config for ORM mode."""
         from_attributes = True
+
+
+# PUBLIC_INTERFACE
+class ProductPage(BaseModel):
+    """Schema for a keyset-paginated page of products."""
+    items: List[ProductResponse]
+    next_cursor: str | None = None
+
+
+# PUBLIC_INTERFACE
+class ProductSales(BaseModel):
+    """Schema for the units sold and revenue of a product over a window."""
+    product_id: int
+    units_sold: int
+    revenue: float
@@ -0,0 +1,125 @@
+"""Product search: ranked full-text and name prefix matching."""
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import (
+    Float, Select, and_, column, func, literal_column, or_, table
+)
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.models.product import Product
+from src.pagination import decode_cursor, encode_cursor, keyset_condition
+from src.projections import product_rows
+
+_WORD = re.compile(r"\w+")
+
+# FTS5 index of product names and descriptions on SQLite, see
+# PRODUCTS_FTS_DDL in src/models/product.py
+PRODUCTS_FTS = table("products_fts", column("rowid"))
+
+
+def _fulltext_query(
+    dialect_name: str,
+    q: str
+) -> Optional[Tuple[Select, ColumnElement]]:
+    """
+    Build the ranked full-text query and its score expression.
+
+    Returns None when ``q`` holds no searchable word.
+    """
+    words = _WORD.findall(q)
+    if not words:
+        return None
+    if dialect_name == "mysql":
+        # Served by ix_products_name_description_fulltext
+        score = match(
+            Product.name, Product.description, against=" ".join(words)
+        ).in_natural_language_mode()
+        query = product_rows().add_columns(score.label("score")).where(score)
+        return query, score
+    if dialect_name == "sqlite":
+        # bm25() is lower for better matches; negate it to rank like MySQL.
+        # Words are quoted so FTS5 query syntax in q is taken literally.
+        terms = " OR ".join(f'"{word}"' for word in words)
+        score = -func.bm25(literal_column(PRODUCTS_FTS.name), type_=Float)
+        query = (
+            product_rows()
+            .add_columns(score.label("score"))
+            .join(PRODUCTS_FTS, PRODUCTS_FTS.c.rowid == Product.id)
+            .where(literal_column(PRODUCTS_FTS.name).op("MATCH")(terms))
+        )
+        return query, score
+    raise NotImplementedError(f"Search is not supported for {dialect_name}")
+
+
+# PUBLIC_INTERFACE
+async def search_products(
+    db: AsyncSession,
+    q: str,
+    mode: str,
+    cursor: Optional[str],
+    limit: int
+) -> Tuple[List[Row], Optional[str]]:
+    """
+    Search products and return one keyset-paginated page.
+
+    ``fulltext`` matches any word of ``q`` in the name or description,
+    best matches first, using the MySQL FULLTEXT index (FTS5 on SQLite).
+    ``prefix`` matches names starting with ``q`` in name order with
+    ``LIKE 'q%'`` on the ``name`` index, for autocompletion.
+
+    Args:
+        db (AsyncSession): Database session
+        q (str): Search text
+        mode (str): ``fulltext`` or ``prefix``
+        cursor (Optional[str]): Cursor from the previous page
+        limit (int): Maximum number of products per page
+
+    Returns:
+        Tuple[List[Row], Optional[str]]: Product rows and the cursor of the
+            next page, None on the last page
+
+    Raises:
+        ValidationError: If the cursor is malformed
+        NotImplementedError: If full-text search is not supported on the
+            database dialect
+    """
+    if mode == "prefix":
+        escaped = re.sub(r"([\\%_])", r"\\\1", q)
+        query = product_rows().where(
+            Product.name.like(f"{escaped}%", escape="\\")
+        )
+        if cursor:
+            position = decode_cursor(cursor, {"name": str, "id": int})
+            query = query.where(keyset_condition(
+                Product.name, position["name"], Product.id, position["id"]
+            ))
+        query = query.order_by(Product.name, Product.id)
+        sort_column = "name"
+    else:
+        built = _fulltext_query(db.get_bind().dialect.name, q)
+        if built is None:
+            return [], None
+        query, score = built
+        if cursor:
+            position = decode_cursor(cursor, {"score": float, "id": int})
+            query = query.where(or_(
+                score < position["score"],
+                and_(score == position["score"], Product.id > position["id"])
+            ))
+        query = query.order_by(score.desc(), Product.id)
+        sort_column = "score"
+
+    # Fetch one extra row to know whether another page follows
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            {sort_column: getattr(last, sort_column), "id": last.id}
+        )
+    return rows, next_cursor
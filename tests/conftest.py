@@ -2,8 +2,8 @@
 import os
 import pytest
 from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
 import asyncio
 from httpx import AsyncClient
 from fastapi.testclient import TestClient
@@ -11,11 +11,21 @@ from fastapi.testclient import TestClient
 # Set testing environment
 os.environ["TESTING"] = "true"
 
-from product_order_api.database import Base, get_db
+from product_order_api.cache import (
+    InMemoryCacheBackend,
+    ProductCache,
+    get_product_cache
+)
+from product_order_api.database import (
+    Base,
+    get_db,
+    get_read_db,
+    get_session_factory
+)
 from product_order_api.main import app
 from product_order_api.models.product import Product
 from product_order_api.models.order import Order, OrderItem
-from tests.database import clear_database
+from tests.database import QueryCounter, clear_database
 
 
 @pytest.fixture(scope="session")
@@ -26,31 +36,61 @@ def event_loop():
     loop.close()
 
 
+def _enable_foreign_keys(dbapi_connection, connection_record):
+    """Enable foreign key support for SQLite."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
 @pytest.fixture(scope="session")
-def test_engine():
-    """Create test database engine using SQLite in-memory database."""
+def test_engine(tmp_path_factory):
+    """
+    Create test database engine using a file-backed SQLite database.
+
+    A file is used instead of ``:memory:`` so that every request gets its
+    own connection, just like against RDS, and concurrent requests really
+    contend for the same rows. This synchronous engine backs the factories
+    and assertions; the application talks to the same file through
+    ``async_test_engine``.
+    """
+    db_path = tmp_path_factory.mktemp("db") / "test.db"
     engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
+        f"sqlite:///{db_path}",
+        connect_args={"check_same_thread": False, "timeout": 30},
         echo=False
     )
-    
+    event.listen(engine, 'connect', _enable_foreign_keys)
+
     # Create all tables
     Base.metadata.create_all(bind=engine)
-    
-    # Enable foreign key support for SQLite
-    def _enable_foreign_keys(dbapi_connection, connection_record):
-        cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.close()
-    
-    event.listen(engine, 'connect', _enable_foreign_keys)
-    
+
     yield engine
-    
+
     # Drop all tables after tests
     Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+async def async_test_engine(test_engine):
+    """Create the asyncio engine the application uses during tests."""
+    engine = create_async_engine(
+        str(test_engine.url).replace("sqlite://", "sqlite+aiosqlite://", 1),
+        connect_args={"check_same_thread": False, "timeout": 30},
+        echo=False
+    )
+    event.listen(engine.sync_engine, 'connect', _enable_foreign_keys)
+
+    yield engine
+
+    await engine.dispose()
+
+
+@pytest.fixture
+def query_counter(async_test_engine):
+    """Return a factory for counters of statements issued by the app."""
+    return lambda: QueryCounter(async_test_engine.sync_engine)
 
 
 @pytest.fixture(scope="function")
@@ -73,15 +113,31 @@ def db_session(test_engine):
 
 
 @pytest.fixture
-async def test_client(db_session, event_loop):
-    """Create an async test client with database session."""
-    def override_get_db():
+def product_cache():
+    """Create an empty product cache for each test."""
+    return ProductCache(InMemoryCacheBackend(max_size=100, ttl=60))
+
+
+@pytest.fixture
+async def test_client(async_test_engine, db_session, product_cache, event_loop):
+    """Create an async test client with a database session per request."""
+    TestingSessionLocal = async_sessionmaker(
+        bind=async_test_engine,
+        autoflush=False,
+        expire_on_commit=False
+    )
+
+    async def override_get_db():
+        db = TestingSessionLocal()
         try:
-            yield db_session
+            yield db
         finally:
-            pass
+            await db.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
+    app.dependency_overrides[get_product_cache] = lambda: product_cache
     
     async with AsyncClient(app=app, base_url="http://test") as client:
         yield client
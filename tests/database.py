@@ -1,7 +1,8 @@
 """Test database utilities."""
 from contextlib import contextmanager
-from typing import Generator
+from typing import Generator, List
 
+from sqlalchemy import Engine, event
 from sqlalchemy.orm import Session
 
 from product_order_api.database import Base
@@ -28,4 +29,32 @@ def transaction(session: Session) -> Generator[Session, None, None]:
         session.rollback()
         raise
     finally:
-        session.close()
\ No newline at end of file
+        session.close()
+
+
+class QueryCounter:
+    """
+    Count the SQL statements executed through an engine.
+
+    Use as a context manager around the code under test; statements are
+    recorded only while the block is active.
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        """Number of statements executed inside the block."""
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._record)
@@ -0,0 +1,242 @@
+"""Test module for the product cache."""
+import time
+
+import pytest
+from fastapi import status
+from product_order_api.cache import InMemoryCacheBackend, ProductCache
+from product_order_api import database
+from product_order_api.database import (
+    READ_STICKY_COOKIE,
+    ReplicaRouter,
+    get_read_db,
+    get_session_factory
+)
+from product_order_api.main import app
+from product_order_api.schemas.order import OrderStatus
+from tests.factories import ProductFactory, OrderFactory, OrderItemFactory
+
+
+@pytest.mark.asyncio
+async def test_in_memory_backend_evicts_least_recently_used():
+    """Test the in-memory backend stays bounded and honours the TTL."""
+    backend = InMemoryCacheBackend(max_size=2, ttl=60)
+    await backend.set("a", 1)
+    await backend.set("b", 2)
+    assert await backend.get("a") == 1  # "b" is now least recently used
+    await backend.set("c", 3)
+
+    assert await backend.get("b") is None
+    assert await backend.get("a") == 1
+    assert await backend.get("c") == 3
+    assert backend.stats()["evictions"] == 1
+
+    expired = InMemoryCacheBackend(max_size=2, ttl=0)
+    await expired.set("a", 1)
+    assert await expired.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_get_product_served_from_cache(
+    test_client, db_session, product_cache, query_counter
+):
+    """Test repeated product reads skip the database until invalidated."""
+    product = ProductFactory(price=10.0, stock=5, session=db_session)
+
+    response = await test_client.get(f"/products/{product.id}")
+    assert response.status_code == status.HTTP_200_OK
+
+    with query_counter() as queries:
+        response = await test_client.get(f"/products/{product.id}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["stock"] == 5
+    assert queries.count == 0
+    assert product_cache.hits == 1
+    assert product_cache.misses == 1
+
+    # Updates invalidate the cached entry
+    await test_client.put(f"/products/{product.id}", json={"price": 12.0})
+    response = await test_client.get(f"/products/{product.id}")
+    assert response.json()["price"] == 12.0
+
+    # Deletes invalidate the cached entry
+    await test_client.delete(f"/products/{product.id}")
+    response = await test_client.get(f"/products/{product.id}")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_order_stock_changes_invalidate_cache(test_client, db_session):
+    """Test order creation, cancellation and deletion refresh cached stock."""
+    product = ProductFactory(price=10.0, stock=10, session=db_session)
+    await test_client.get(f"/products/{product.id}")
+
+    response = await test_client.post("/orders/", json={
+        "customer_name": "John Doe",
+        "customer_email": "john@example.com",
+        "items": [{"product_id": product.id, "quantity": 4}]
+    })
+    order_id = response.json()["id"]
+    response = await test_client.get(f"/products/{product.id}")
+    assert response.json()["stock"] == 6
+
+    await test_client.put(
+        f"/orders/{order_id}", json={"status": OrderStatus.CANCELLED}
+    )
+    response = await test_client.get(f"/products/{product.id}")
+    assert response.json()["stock"] == 10
+
+    order = OrderFactory(status=OrderStatus.PENDING, session=db_session)
+    OrderItemFactory(order=order, product=product, quantity=3, session=db_session)
+    await test_client.delete(f"/orders/{order.id}")
+    response = await test_client.get(f"/products/{product.id}")
+    assert response.json()["stock"] == 13
+
+    response = await test_client.get("/internal/cache-stats")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["products"]["invalidations"] == 3
+
+
+@pytest.mark.asyncio
+async def test_cache_fill_checks_invalidation_generation():
+    """Test fills older than an invalidation of their product are dropped."""
+    cache = ProductCache(InMemoryCacheBackend(max_size=10, ttl=60), history=2)
+    generation = cache.generation()
+    await cache.invalidate([2])
+    await cache.set(1, {"id": 1}, generation)
+    await cache.set(2, {"id": 2}, generation)
+    assert await cache.get(1) == {"id": 1}
+    assert await cache.get(2) is None
+
+    # Once an invalidation falls out of the history, older fills are dropped
+    generation = cache.generation()
+    await cache.invalidate([3, 4, 5])
+    await cache.set(1, {"id": 1}, generation)
+    assert cache.stale_fills == 2
+    await cache.set(1, {"id": 1}, cache.generation())
+    assert cache.stale_fills == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_read_skips_cache_fill(
+    test_client, db_session, product_cache
+):
+    """Test a write landing between the read and the fill is not hidden."""
+    product = ProductFactory(price=10.0, stock=5, session=db_session)
+    session_factory = app.dependency_overrides[get_session_factory]()
+    primary_db = app.dependency_overrides[get_read_db]
+
+    async def racing_db():
+        async with session_factory() as db:
+            read = db.get
+
+            async def read_then_write(*args, **kwargs):
+                row = await read(*args, **kwargs)
+                # Commits and invalidates before the handler fills the cache
+                response = await test_client.put(
+                    f"/products/{product.id}", json={"stock": 9}
+                )
+                assert response.status_code == status.HTTP_200_OK
+                return row
+
+            db.get = read_then_write
+            yield db
+
+    app.dependency_overrides[get_read_db] = racing_db
+    try:
+        response = await test_client.get(f"/products/{product.id}")
+    finally:
+        app.dependency_overrides[get_read_db] = primary_db
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["stock"] == 5
+    assert await product_cache.get(product.id) is None
+    assert product_cache.stale_fills == 1
+
+    response = await test_client.get(f"/products/{product.id}")
+    assert response.json()["stock"] == 9
+    assert (await product_cache.get(product.id))["stock"] == 9
+
+
+@pytest.mark.asyncio
+async def test_replica_reads_do_not_fill_cache(
+    test_client, db_session, product_cache
+):
+    """Test rows read from a possibly lagging replica are not cached."""
+    product = ProductFactory(price=10.0, stock=5, session=db_session)
+    session_factory = app.dependency_overrides[get_session_factory]()
+    primary_db = app.dependency_overrides[get_read_db]
+
+    async def replica_db():
+        async with session_factory() as db:
+            db.info["replica"] = True
+            yield db
+
+    app.dependency_overrides[get_read_db] = replica_db
+    try:
+        response = await test_client.get(f"/products/{product.id}")
+    finally:
+        app.dependency_overrides[get_read_db] = primary_db
+    assert response.status_code == status.HTTP_200_OK
+    assert await product_cache.get(product.id) is None
+
+    await test_client.get(f"/products/{product.id}")
+    assert await product_cache.get(product.id) is not None
+
+
+@pytest.mark.asyncio
+async def test_sticky_clients_read_from_writer(
+    test_client, db_session, product_cache, monkeypatch
+):
+    """Test get_read_db routes clients that just wrote to the writer."""
+    product = ProductFactory(price=10.0, stock=5, session=db_session)
+    writer = app.dependency_overrides[get_session_factory]()
+    replica_sessions = []
+
+    def replica():
+        db = writer()
+        replica_sessions.append(db)
+        return db
+
+    monkeypatch.setattr(
+        database, "read_router", ReplicaRouter(writer, [replica])
+    )
+    read_db = app.dependency_overrides.pop(get_read_db)
+    try:
+        response = await test_client.get(f"/products/{product.id}")
+        assert response.status_code == status.HTTP_200_OK
+        assert len(replica_sessions) == 1
+        assert await product_cache.get(product.id) is None
+
+        # The write sets the last-write cookie; the next read uses the writer
+        response = await test_client.put(
+            f"/products/{product.id}", json={"stock": 7}
+        )
+        assert READ_STICKY_COOKIE in response.cookies
+        response = await test_client.get(f"/products/{product.id}")
+        assert response.json()["stock"] == 7
+        assert len(replica_sessions) == 1
+        assert (await product_cache.get(product.id))["stock"] == 7
+
+        test_client.cookies.clear()
+        await test_client.get(f"/products/{product.id}")
+        assert len(replica_sessions) == 2
+    finally:
+        app.dependency_overrides[get_read_db] = read_db
+
+
+@pytest.mark.asyncio
+async def test_sticky_reads_bypass_cache(test_client, db_session, product_cache):
+    """Test clients that just wrote never get a cached product."""
+    product = ProductFactory(price=10.0, stock=5, session=db_session)
+    await test_client.get(f"/products/{product.id}")
+
+    # Change the row behind the cache's back
+    product.stock = 4
+    db_session.commit()
+
+    response = await test_client.get(f"/products/{product.id}")
+    assert response.json()["stock"] == 5
+    response = await test_client.get(
+        f"/products/{product.id}",
+        headers={"Cookie": f"{READ_STICKY_COOKIE}={time.time()}"}
+    )
+    assert response.json()["stock"] == 4
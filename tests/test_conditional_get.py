@@ -0,0 +1,163 @@
+"""Test module for conditional GET (ETag / Last-Modified) handling."""
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+from fastapi import status
+from tests.factories import ProductFactory, OrderFactory, OrderItemFactory
+
+
+def _http_date(moment: datetime) -> str:
+    return format_datetime(moment.replace(tzinfo=timezone.utc), usegmt=True)
+
+
+@pytest.mark.asyncio
+async def test_product_conditional_get(
+    test_client, db_session, product_cache, query_counter
+):
+    """Test product ETags, 304 responses and their cost."""
+    product = ProductFactory(price=10.0, stock=5, session=db_session)
+
+    response = await test_client.get(f"/products/{product.id}")
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert response.headers["Last-Modified"] == _http_date(product.updated_at)
+
+    # Served from the cached document without touching the database
+    with query_counter() as queries:
+        response = await test_client.get(
+            f"/products/{product.id}", headers={"If-None-Match": etag}
+        )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert queries.count == 0
+
+    # On a cache miss only updated_at is selected
+    await product_cache.invalidate([product.id])
+    with query_counter() as queries:
+        response = await test_client.get(
+            f"/products/{product.id}",
+            headers={"If-None-Match": f'"other", {etag.removeprefix("W/")}'}
+        )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert queries.count == 1
+    assert "updated_at" in queries.statements[0]
+    assert "stock" not in queries.statements[0]
+
+    response = await test_client.get(
+        f"/products/{product.id}",
+        headers={"If-Modified-Since": _http_date(product.updated_at)}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    response = await test_client.get(
+        f"/products/{product.id}",
+        headers={
+            "If-Modified-Since": _http_date(
+                product.updated_at - timedelta(seconds=1)
+            )
+        }
+    )
+    assert response.status_code == status.HTTP_200_OK
+    # A mismatching ETag wins over a matching date
+    response = await test_client.get(
+        f"/products/{product.id}",
+        headers={
+            "If-None-Match": 'W/"other"',
+            "If-Modified-Since": _http_date(product.updated_at),
+        }
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    # Any write changes the ETag
+    await test_client.put(f"/products/{product.id}", json={"stock": 6})
+    response = await test_client.get(
+        f"/products/{product.id}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["stock"] == 6
+    assert response.headers["ETag"] != etag
+
+    response = await test_client.get(
+        "/products/9999", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_order_conditional_get(test_client, db_session, query_counter):
+    """Test order ETags are checked before the order is loaded."""
+    product = ProductFactory(price=10.0, stock=20, session=db_session)
+    order = OrderFactory(session=db_session)
+    OrderItemFactory(order=order, product=product, session=db_session)
+
+    response = await test_client.get(f"/orders/{order.id}")
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers["ETag"]
+
+    with query_counter() as queries:
+        response = await test_client.get(
+            f"/orders/{order.id}", headers={"If-None-Match": etag}
+        )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert queries.count == 1
+
+    await test_client.put(f"/orders/{order.id}", json={"status": "processing"})
+    response = await test_client.get(
+        f"/orders/{order.id}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["status"] == "processing"
+
+
+@pytest.mark.asyncio
+async def test_list_conditional_get(test_client, db_session, query_counter):
+    """Test list pages are tagged by their rows and query."""
+    products = [ProductFactory(session=db_session) for _ in range(3)]
+    order = OrderFactory(customer_email="poll@example.com", session=db_session)
+    OrderItemFactory(order=order, product=products[0], session=db_session)
+
+    for url in (
+        "/products/?limit=2",
+        "/orders/",
+        "/orders/?cursor=",
+        "/customers/poll@example.com/orders?include_items=true",
+    ):
+        response = await test_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        etag = response.headers["ETag"]
+        assert "Last-Modified" not in response.headers
+        response = await test_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    # Unchanged order pages are answered without loading the items
+    response = await test_client.get("/orders/")
+    with query_counter() as queries:
+        response = await test_client.get(
+            "/orders/", headers={"If-None-Match": response.headers["ETag"]}
+        )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert queries.count == 1
+
+    # Other filters, a changed row or a deleted row change the tag
+    response = await test_client.get("/products/?limit=2")
+    etag = response.headers["ETag"]
+    response = await test_client.get(
+        "/products/?limit=2&sort=name", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    await test_client.put(f"/products/{products[1].id}", json={"stock": 1})
+    response = await test_client.get(
+        "/products/?limit=2", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers["ETag"]
+    await test_client.delete(f"/products/{products[1].id}")
+    response = await test_client.get(
+        "/products/?limit=2", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [p["id"] for p in response.json()] == [
+        products[0].id, products[2].id
+    ]
@@ -0,0 +1,73 @@
+"""Test module for customer endpoints."""
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import status
+from product_order_api.schemas.order import OrderStatus
+from tests.factories import ProductFactory, OrderFactory, OrderItemFactory
+
+
+@pytest.mark.asyncio
+async def test_customer_order_history(test_client, db_session, query_counter):
+    """Test the order history walks one customer's orders newest first."""
+    product = ProductFactory(session=db_session)
+    started = datetime(2024, 1, 1)
+    orders = []
+    for index in range(7):
+        order = OrderFactory(
+            customer_email="support@example.com",
+            status=OrderStatus.PENDING if index % 2 else OrderStatus.COMPLETED,
+            # Pairs of orders share a timestamp to exercise the id tiebreak
+            created_at=started + timedelta(minutes=index // 2),
+            session=db_session
+        )
+        OrderItemFactory(order=order, product=product, session=db_session)
+        orders.append(order)
+    OrderFactory(customer_email="other@example.com", session=db_session)
+    newest_first = [
+        o.id for o in sorted(orders, key=lambda o: (o.created_at, o.id), reverse=True)
+    ]
+
+    async def collect(**params):
+        pages, cursor = [], ""
+        while cursor is not None:
+            response = await test_client.get(
+                "/customers/support@example.com/orders",
+                params={"cursor": cursor, "limit": 3, **params}
+            )
+            assert response.status_code == status.HTTP_200_OK
+            page = response.json()
+            pages.append(page["items"])
+            cursor = page["next_cursor"]
+        return [order for page in pages for order in page]
+
+    # Summaries only by default, with one query per page
+    with query_counter() as queries:
+        history = await collect()
+    assert queries.count == 3
+    assert [o["id"] for o in history] == newest_first
+    assert all("order_items" not in o for o in history)
+
+    completed_ids = {o.id for o in orders if o.status == OrderStatus.COMPLETED}
+    completed = await collect(status=OrderStatus.COMPLETED.value)
+    assert [o["id"] for o in completed] == [
+        order_id for order_id in newest_first if order_id in completed_ids
+    ]
+
+    with query_counter() as queries:
+        response = await test_client.get(
+            "/customers/support@example.com/orders",
+            params={"include_items": "true", "limit": 10}
+        )
+    assert queries.count == 2
+    page = response.json()
+    assert page["next_cursor"] is None
+    assert all(len(o["order_items"]) == 1 for o in page["items"])
+
+    response = await test_client.get("/customers/nobody@example.com/orders")
+    assert response.json() == {"items": [], "next_cursor": None}
+
+    response = await test_client.get(
+        "/customers/support@example.com/orders?cursor=not-a-cursor"
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,80 @@
+"""Test module for read replica routing."""
+import pytest
+from fastapi import status
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from product_order_api.database import (
+    READ_STICKY_COOKIE,
+    READ_STICKY_SECONDS,
+    ReplicaRouter,
+    is_read_sticky
+)
+
+
+@pytest.fixture
+async def replica_factories(tmp_path):
+    """Create a writer and two replica session factories."""
+    engines = [
+        create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / name}.db",
+            poolclass=AsyncAdaptedQueuePool
+        )
+        for name in ("primary", "replica1", "replica2")
+    ]
+    yield [async_sessionmaker(bind=engine) for engine in engines]
+    for engine in engines:
+        await engine.dispose()
+
+
+def test_replica_router_round_robin(replica_factories):
+    """Test reads rotate over replicas unless the client is sticky."""
+    primary, first, second = replica_factories
+    router = ReplicaRouter(primary, [first, second])
+
+    assert [router.session_factory() for _ in range(4)] == [
+        first, second, first, second
+    ]
+    assert router.session_factory(sticky=True) is primary
+    assert ReplicaRouter(primary).session_factory() is primary
+
+    with pytest.raises(ValueError):
+        ReplicaRouter(primary, [first], strategy="random")
+
+
+@pytest.mark.asyncio
+async def test_replica_router_least_busy(replica_factories):
+    """Test the least busy strategy avoids replicas with checked out connections."""
+    primary, first, second = replica_factories
+    router = ReplicaRouter(primary, [first, second], strategy="least_busy")
+
+    async with first.kw["bind"].connect():
+        assert router.session_factory() is second
+    async with second.kw["bind"].connect():
+        assert router.session_factory() is first
+
+
+def test_is_read_sticky():
+    """Test the last-write cookie keeps reads on the writer for a while."""
+    assert not is_read_sticky(None)
+    assert not is_read_sticky("not-a-timestamp")
+    assert is_read_sticky("1000.0", now=1000.0 + READ_STICKY_SECONDS / 2)
+    assert not is_read_sticky("1000.0", now=1000.0 + READ_STICKY_SECONDS)
+
+
+@pytest.mark.asyncio
+async def test_writes_set_last_write_cookie(test_client):
+    """Test successful writes mark the client as sticky and reads do not."""
+    response = await test_client.get("/products/")
+    assert READ_STICKY_COOKIE not in response.cookies
+
+    response = await test_client.post("/products/", json={
+        "name": "Test Product",
+        "description": "Test Description",
+        "price": 99.99,
+        "stock": 10
+    })
+    assert response.status_code == status.HTTP_201_CREATED
+    assert is_read_sticky(response.cookies[READ_STICKY_COOKIE])
+
+    response = await test_client.put("/products/9999", json={"price": 1.0})
+    assert READ_STICKY_COOKIE not in response.cookies
@@ -90,9 +90,32 @@ async def test_concurrent_order_processing(test_client, db_session):
     assert success_count == 1
     assert failure_count == 1
 
-    # Verify final stock
+    # Verify final stock; either order may win the race
+    winner = next(r for r in responses if r.status_code == status.HTTP_201_CREATED)
     db_session.refresh(product)
-    assert product.stock == 4  # 10 - 6 (from successful order)
+    assert product.stock == 10 - winner.json()["order_items"][0]["quantity"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_idempotent_retries(test_client, db_session):
+    """Test concurrent requests with one Idempotency-Key create one order."""
+    product = ProductFactory(price=100.0, stock=10, session=db_session)
+    order_data = {
+        "customer_name": "Customer 1",
+        "customer_email": "customer1@example.com",
+        "items": [{"product_id": product.id, "quantity": 2}]
+    }
+    headers = {"Idempotency-Key": "retry-storm"}
+
+    responses = await asyncio.gather(*(
+        test_client.post("/orders/", json=order_data, headers=headers)
+        for _ in range(4)
+    ))
+
+    assert all(r.status_code == status.HTTP_201_CREATED for r in responses)
+    assert len({r.json()["id"] for r in responses}) == 1
+    db_session.refresh(product)
+    assert product.stock == 8
 
 
 @pytest.mark.asyncio
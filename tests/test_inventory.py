@@ -0,0 +1,112 @@
+"""Concurrency tests for the stock reservation engine."""
+import asyncio
+import os
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from product_order_api.database import Base
+from product_order_api.errors import BusinessLogicError
+from product_order_api.inventory import reserve_stock
+from product_order_api.models.product import Product
+
+WORKERS = 16
+ATTEMPTS = 200
+
+
+@pytest.fixture
+async def stress_engine(tmp_path):
+    """
+    Create a file-backed engine shared by many concurrent sessions.
+
+    Set ``STRESS_DATABASE_URL`` (e.g. ``mysql+aiomysql://...``) to run
+    against a local MySQL container instead of SQLite.
+    """
+    url = os.getenv(
+        "STRESS_DATABASE_URL",
+        f"sqlite+aiosqlite:///{tmp_path / 'stress.db'}"
+    )
+    if url.startswith("sqlite"):
+        engine = create_async_engine(
+            url,
+            connect_args={"check_same_thread": False, "timeout": 30}
+        )
+
+        # SQLite only allows one writer; take the write lock up front so
+        # concurrent writers queue instead of failing with "database is locked"
+        @event.listens_for(engine.sync_engine, "connect")
+        def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(engine.sync_engine, "begin")
+        def _begin_immediate(conn):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+    else:
+        engine = create_async_engine(url, pool_size=WORKERS)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_reserve_stock_never_oversells(stress_engine):
+    """Test parallel reservations on a hot product never oversell."""
+    Session = async_sessionmaker(bind=stress_engine, expire_on_commit=False)
+    async with Session() as session:
+        hot = Product(name="Hot", price=10.0, stock=50)
+        cold = Product(name="Cold", price=5.0, stock=1000)
+        session.add_all([hot, cold])
+        await session.commit()
+        hot_id, cold_id = hot.id, cold.id
+
+    semaphore = asyncio.Semaphore(WORKERS)
+
+    async def checkout(attempt):
+        # Alternate the line order to exercise deterministic locking
+        quantities = (
+            {hot_id: 1, cold_id: 2} if attempt % 2 else {cold_id: 2, hot_id: 1}
+        )
+        async with semaphore, Session() as session:
+            try:
+                await reserve_stock(session, quantities)
+                await session.commit()
+                return True
+            except BusinessLogicError:
+                await session.rollback()
+                return False
+
+    outcomes = await asyncio.gather(*(checkout(i) for i in range(ATTEMPTS)))
+
+    async with Session() as session:
+        hot = await session.get(Product, hot_id)
+        cold = await session.get(Product, cold_id)
+        assert outcomes.count(True) == 50
+        assert outcomes.count(False) == ATTEMPTS - 50
+        assert hot.stock == 0
+        assert cold.stock == 1000 - 2 * 50
+
+
+@pytest.mark.asyncio
+async def test_reserve_stock_rejects_without_partial_update(stress_engine):
+    """Test a rejected reservation leaves stock untouched after rollback."""
+    Session = async_sessionmaker(bind=stress_engine, expire_on_commit=False)
+    async with Session() as session:
+        first = Product(name="First", price=1.0, stock=5)
+        second = Product(name="Second", price=1.0, stock=1)
+        session.add_all([first, second])
+        await session.commit()
+
+        with pytest.raises(BusinessLogicError) as exc_info:
+            await reserve_stock(session, {first.id: 2, second.id: 3})
+        await session.rollback()
+
+        assert "Available: 1, Requested: 3" in exc_info.value.detail
+        await session.refresh(first)
+        await session.refresh(second)
+        assert first.stock == 5
+        assert second.stock == 1
@@ -0,0 +1,60 @@
+"""Test module for request and SQL metrics."""
+import pytest
+from fastapi import status
+from product_order_api.metrics import (
+    instrument_engine,
+    normalize_statement,
+    registry
+)
+from tests.factories import ProductFactory
+
+
+def test_normalize_statement():
+    """Test literals, parameters and repeated lists collapse."""
+    assert normalize_statement(
+        "SELECT products.id \n FROM products WHERE products.id IN (?, ?, ?)"
+    ) == "SELECT products.id FROM products WHERE products.id IN (?, ...)"
+    assert normalize_statement(
+        "INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s), (%s, %s)"
+    ) == "INSERT INTO t (a, b) VALUES (?, ...), ..."
+    assert normalize_statement(
+        "SELECT * FROM orders WHERE status = 'pending' LIMIT 10"
+    ) == "SELECT * FROM orders WHERE status = ? LIMIT ?"
+
+
+@pytest.mark.asyncio
+async def test_requests_recorded_by_route_template(test_client, db_session):
+    """Test request metrics use the route template, not the raw path."""
+    product = ProductFactory(session=db_session)
+    labels = {"method": "GET", "route": "/products/{product_id}"}
+    total = {**labels, "status": "200"}
+    before = registry.value("http_requests_total", total) or 0
+
+    response = await test_client.get(f"/products/{product.id}")
+    assert response.status_code == status.HTTP_200_OK
+
+    assert registry.value("http_requests_total", total) == before + 1
+    assert registry.value("http_requests_in_progress", labels) == 0
+    assert registry.value("http_request_duration_seconds", labels).count >= 1
+
+    await test_client.get("/no/such/path")
+    unmatched = {"method": "GET", "route": "<unmatched>", "status": "404"}
+    assert registry.value("http_requests_total", unmatched) >= 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(test_client, async_test_engine, db_session):
+    """Test the exposition includes request and SQL statement metrics."""
+    instrument_engine(async_test_engine.sync_engine)
+    await test_client.get("/products/")
+
+    response = await test_client.get("/metrics")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert (
+        'http_requests_total{method="GET",route="/products/",status="200"}'
+        in body
+    )
+    assert 'db_statement_duration_seconds_count{statement="SELECT' in body
@@ -0,0 +1,195 @@
+"""Test module for the queued order pipeline."""
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import status
+from sqlalchemy import select
+from product_order_api import order_pipeline
+from product_order_api.database import get_session_factory
+from product_order_api.main import app
+from product_order_api.models.order_queue import QueuedOrder
+from product_order_api.order_pipeline import OrderWorkerPool, get_order_queue
+from product_order_api.order_queue import (
+    ORDER_QUEUE_LEASE_SECONDS,
+    ORDER_QUEUE_MAX_ATTEMPTS,
+    DatabaseOrderQueue,
+    InMemoryOrderQueue
+)
+from tests.factories import ProductFactory
+
+
+def _order(product_id, quantity):
+    return {
+        "customer_name": "John Doe",
+        "customer_email": "john@example.com",
+        "items": [{"product_id": product_id, "quantity": quantity}]
+    }
+
+
+@pytest.fixture
+def order_queue(request, test_client):
+    """Enable queued mode with the backend named by the test parameter."""
+    queue = request.param()
+    app.dependency_overrides[get_order_queue] = lambda: queue
+    return queue
+
+
+@pytest.fixture
+def worker_pool(order_queue, test_client, product_cache):
+    """Create a worker pool draining the test queue."""
+    session_factory = app.dependency_overrides[get_session_factory]()
+    return OrderWorkerPool(order_queue, session_factory, product_cache)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "order_queue", [InMemoryOrderQueue, DatabaseOrderQueue], indirect=True
+)
+async def test_queued_order_lifecycle(
+    test_client, db_session, order_queue, worker_pool
+):
+    """Test queued orders are accepted with 202 and placed by a worker."""
+    product = ProductFactory(price=10.0, stock=5, session=db_session)
+
+    response = await test_client.post("/orders/", json=_order(product.id, 2))
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    entry = response.json()
+    assert entry["status"] == "pending"
+    assert entry["order_id"] is None
+    assert response.headers["Location"] == f"/orders/queue/{entry['id']}"
+
+    # Nothing is written until a worker processes the queue
+    db_session.refresh(product)
+    assert product.stock == 5
+
+    assert await worker_pool.run_once() == 1
+    assert await worker_pool.run_once() == 0
+
+    response = await test_client.get(f"/orders/queue/{entry['id']}")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["status"] == "completed"
+
+    response = await test_client.get(f"/orders/{data['order_id']}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["total_amount"] == 20.0
+    db_session.refresh(product)
+    assert product.stock == 3
+
+    response = await test_client.get("/orders/queue/9999")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("order_queue", [DatabaseOrderQueue], indirect=True)
+async def test_queued_orders_grouped_per_batch(
+    test_client, db_session, order_queue, worker_pool, query_counter
+):
+    """Test a batch updates each product once and rejects what does not fit."""
+    product = ProductFactory(price=10.0, stock=5, session=db_session)
+    entries = []
+    for order_data in (
+        _order(product.id, 2),
+        _order(product.id, 2),
+        _order(product.id, 2),
+        _order(9999, 1),
+    ):
+        response = await test_client.post("/orders/", json=order_data)
+        entries.append(response.json()["id"])
+
+    with query_counter() as queries:
+        assert await worker_pool.run_once() == 4
+    stock_updates = [
+        s for s in queries.statements if s.startswith("UPDATE products")
+    ]
+    assert len(stock_updates) == 1
+
+    statuses = []
+    for entry_id in entries:
+        response = await test_client.get(f"/orders/queue/{entry_id}")
+        statuses.append(response.json())
+    assert [s["status"] for s in statuses] == [
+        "completed", "completed", "failed", "failed"
+    ]
+    assert "Insufficient stock" in statuses[2]["detail"]
+    assert "not found" in statuses[3]["detail"]
+    db_session.refresh(product)
+    assert product.stock == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "order_queue", [InMemoryOrderQueue, DatabaseOrderQueue], indirect=True
+)
+async def test_unparseable_entry_fails_alone(
+    test_client, db_session, order_queue, worker_pool
+):
+    """Test a payload that no longer parses does not block its batch."""
+    product = ProductFactory(price=10.0, stock=5, session=db_session)
+    session_factory = app.dependency_overrides[get_session_factory]()
+    async with session_factory() as db:
+        bad = await order_queue.enqueue(db, '{"customer_name": "Legacy"}')
+        await db.commit()
+    response = await test_client.post("/orders/", json=_order(product.id, 1))
+    good = response.json()["id"]
+
+    assert await worker_pool.run_once() == 2
+
+    response = await test_client.get(f"/orders/queue/{bad.id}")
+    assert response.json()["status"] == "failed"
+    assert "Invalid order payload" in response.json()["detail"]
+    response = await test_client.get(f"/orders/queue/{good}")
+    assert response.json()["status"] == "completed"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "order_queue", [InMemoryOrderQueue, DatabaseOrderQueue], indirect=True
+)
+async def test_unexpected_batch_error_is_released(
+    test_client, db_session, order_queue, worker_pool, monkeypatch
+):
+    """Test any batch error releases the entries until attempts run out."""
+    product = ProductFactory(price=10.0, stock=5, session=db_session)
+    response = await test_client.post("/orders/", json=_order(product.id, 1))
+    entry_id = response.json()["id"]
+
+    async def broken_batch(db, queue, entries):
+        raise KeyError("unexpected")
+
+    monkeypatch.setattr(order_pipeline, "process_order_batch", broken_batch)
+    for _ in range(ORDER_QUEUE_MAX_ATTEMPTS):
+        assert await worker_pool.run_once() == 1
+    assert await worker_pool.run_once() == 0
+
+    response = await test_client.get(f"/orders/queue/{entry_id}")
+    assert response.json()["status"] == "failed"
+    assert "unexpected" in response.json()["detail"]
+    db_session.refresh(product)
+    assert product.stock == 5
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_at_max_attempts_is_given_up(test_client, db_session):
+    """Test entries whose last allowed claim expired are not claimed again."""
+    stale = datetime.utcnow() - timedelta(seconds=ORDER_QUEUE_LEASE_SECONDS + 1)
+    for attempts in (ORDER_QUEUE_MAX_ATTEMPTS - 1, ORDER_QUEUE_MAX_ATTEMPTS):
+        db_session.add(QueuedOrder(
+            payload="{}",
+            status="processing",
+            attempts=attempts,
+            claimed_at=stale
+        ))
+    db_session.commit()
+    retried, given_up = db_session.scalars(
+        select(QueuedOrder).order_by(QueuedOrder.id)
+    ).all()
+
+    queue = DatabaseOrderQueue()
+    async with app.dependency_overrides[get_session_factory]()() as db:
+        claimed = await queue.claim(db, 10)
+    assert [entry.id for entry in claimed] == [retried.id]
+
+    db_session.expire_all()
+    assert given_up.status == "failed"
+    assert "attempts" in given_up.detail
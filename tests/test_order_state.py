@@ -0,0 +1,46 @@
+"""Test module for the order status state machine."""
+import asyncio
+
+import pytest
+from fastapi import status
+from product_order_api.order_state import (
+    TRANSITIONS,
+    allowed_sources,
+    can_transition
+)
+from product_order_api.schemas.order import OrderStatus
+from tests.factories import ProductFactory, OrderFactory, OrderItemFactory
+
+
+def test_transition_table():
+    """Test the transition table is read-only and its inverse consistent."""
+    with pytest.raises(TypeError):
+        TRANSITIONS[OrderStatus.COMPLETED] = frozenset({OrderStatus.PENDING})
+
+    assert can_transition(OrderStatus.PENDING, OrderStatus.PROCESSING)
+    assert not can_transition(OrderStatus.COMPLETED, OrderStatus.CANCELLED)
+    assert allowed_sources(OrderStatus.CANCELLED) == {"pending", "processing"}
+    assert allowed_sources(OrderStatus.COMPLETED) == {"processing"}
+    assert allowed_sources(OrderStatus.PENDING) == frozenset()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_cancellations_restore_stock_once(
+    test_client, db_session
+):
+    """Test only one of several concurrent cancellations takes effect."""
+    product = ProductFactory(stock=10, session=db_session)
+    order = OrderFactory(status=OrderStatus.PROCESSING, session=db_session)
+    OrderItemFactory(order=order, product=product, quantity=4, session=db_session)
+
+    responses = await asyncio.gather(*(
+        test_client.put(
+            f"/orders/{order.id}", json={"status": OrderStatus.CANCELLED}
+        )
+        for _ in range(4)
+    ))
+
+    codes = sorted(r.status_code for r in responses)
+    assert codes == [status.HTTP_200_OK] + [status.HTTP_400_BAD_REQUEST] * 3
+    db_session.refresh(product)
+    assert product.stock == 14
@@ -1,7 +1,24 @@
 """Test module for order endpoints."""
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
 import pytest
 from fastapi import status
-from product_order_api.schemas.order import OrderStatus
+from fastapi.responses import JSONResponse, ORJSONResponse
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from product_order_api import rendering
+from product_order_api.database import get_session_factory
+from product_order_api.idempotency import (
+    IdempotencyKeyPurger,
+    purge_expired_keys
+)
+from product_order_api.main import app
+from product_order_api.models.idempotency import IdempotencyKey
+from product_order_api.models.order import Order
+from product_order_api.schemas.order import OrderResponse, OrderStatus
 from tests.factories import ProductFactory, OrderFactory, OrderItemFactory
 
 
@@ -66,6 +83,101 @@ async def test_create_order_insufficient_stock(test_client, db_session):
     assert product.stock == 2
 
 
+@pytest.mark.asyncio
+async def test_create_order_merges_duplicate_lines(test_client, db_session):
+    """Test duplicate product lines are merged before stock validation."""
+    product = ProductFactory(price=10.0, stock=5, session=db_session)
+
+    # Each line fits on its own, but together they exceed the stock
+    order_data = {
+        "customer_name": "John Doe",
+        "customer_email": "john@example.com",
+        "items": [
+            {"product_id": product.id, "quantity": 3},
+            {"product_id": product.id, "quantity": 3}
+        ]
+    }
+    response = await test_client.post("/orders/", json=order_data)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "Requested: 6" in response.json()["error"]["message"]
+
+    order_data["items"][1]["quantity"] = 2
+    response = await test_client.post("/orders/", json=order_data)
+    assert response.status_code == status.HTTP_201_CREATED
+
+    data = response.json()
+    assert len(data["order_items"]) == 1
+    assert data["order_items"][0]["quantity"] == 5
+    assert data["total_amount"] == 5 * 10.0
+
+    db_session.refresh(product)
+    assert product.stock == 0
+
+
+@pytest.mark.asyncio
+async def test_create_order_idempotency_key(test_client, db_session):
+    """Test retries with the same Idempotency-Key replay the first response."""
+    product = ProductFactory(price=10.0, stock=5, session=db_session)
+    order_data = {
+        "customer_name": "John Doe",
+        "customer_email": "john@example.com",
+        "items": [{"product_id": product.id, "quantity": 2}]
+    }
+    headers = {"Idempotency-Key": "checkout-1"}
+
+    first = await test_client.post("/orders/", json=order_data, headers=headers)
+    assert first.status_code == status.HTTP_201_CREATED
+    assert "Idempotent-Replayed" not in first.headers
+
+    retry = await test_client.post("/orders/", json=order_data, headers=headers)
+    assert retry.status_code == status.HTTP_201_CREATED
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+
+    # Stock was reserved and the order created only once
+    db_session.refresh(product)
+    assert product.stock == 3
+    response = await test_client.get("/orders/")
+    assert len(response.json()) == 1
+
+    # The key cannot be reused for a different request
+    order_data["items"][0]["quantity"] = 1
+    response = await test_client.post(
+        "/orders/", json=order_data, headers=headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "Idempotency-Key" in response.json()["error"]["message"]
+
+
+@pytest.mark.asyncio
+async def test_purge_expired_idempotency_keys(test_client, db_session):
+    """Test expired keys are purged in bounded batches, live keys kept."""
+    now = datetime.utcnow()
+    for index in range(5):
+        db_session.add(IdempotencyKey(
+            key=f"expired-{index}",
+            request_hash="0" * 64,
+            expires_at=now - timedelta(hours=index + 1)
+        ))
+    db_session.add(IdempotencyKey(
+        key="live", request_hash="0" * 64, expires_at=now + timedelta(hours=1)
+    ))
+    db_session.commit()
+
+    session_factory = app.dependency_overrides[get_session_factory]()
+    async with session_factory() as db:
+        assert await purge_expired_keys(db, limit=2) == 2
+        await db.commit()
+    # The oldest keys go first
+    remaining = set(db_session.scalars(select(IdempotencyKey.key)))
+    assert remaining == {"expired-0", "expired-1", "expired-2", "live"}
+
+    purger = IdempotencyKeyPurger(session_factory, interval=60, batch_size=2)
+    assert await purger.run_once() == 3
+    db_session.expire_all()
+    assert list(db_session.scalars(select(IdempotencyKey.key))) == ["live"]
+
+
 @pytest.mark.asyncio
 async def test_order_status_transitions(test_client, db_session):
     """Test order status transitions and validation."""
@@ -149,6 +261,101 @@ async def test_stock_restoration_on_cancellation(test_client, db_session):
     assert product2.stock == 15  # Original stock
 
 
+@pytest.mark.asyncio
+async def test_stock_restored_with_one_update(
+    test_client, db_session, query_counter
+):
+    """Test cancel and delete restore stock of all lines in one UPDATE."""
+    products = [ProductFactory(stock=10, session=db_session) for _ in range(5)]
+    orders = [
+        OrderFactory(status=OrderStatus.PENDING, session=db_session)
+        for _ in range(2)
+    ]
+    for order in orders:
+        for product in products:
+            OrderItemFactory(
+                order=order, product=product, quantity=2, session=db_session
+            )
+    # A second line for the same product is merged
+    OrderItemFactory(
+        order=orders[0], product=products[0], quantity=1, session=db_session
+    )
+
+    with query_counter() as cancel:
+        response = await test_client.put(
+            f"/orders/{orders[0].id}",
+            json={"status": OrderStatus.CANCELLED}
+        )
+    assert response.status_code == status.HTTP_200_OK
+    with query_counter() as delete:
+        response = await test_client.delete(f"/orders/{orders[1].id}")
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    for queries in (cancel, delete):
+        product_statements = [
+            s for s in queries.statements if "products" in s
+        ]
+        assert len(product_statements) == 1
+        assert product_statements[0].startswith("UPDATE products")
+
+    stocks = []
+    for product in products:
+        db_session.refresh(product)
+        stocks.append(product.stock)
+    assert stocks == [15, 14, 14, 14, 14]
+
+
+@pytest.mark.asyncio
+async def test_batch_update_status(test_client, db_session, query_counter):
+    """Test batch status changes with per-order results and restocking."""
+    product = ProductFactory(stock=10, session=db_session)
+    processing = [
+        OrderFactory(status=OrderStatus.PROCESSING, session=db_session)
+        for _ in range(3)
+    ]
+    pending = OrderFactory(status=OrderStatus.PENDING, session=db_session)
+    completed = OrderFactory(status=OrderStatus.COMPLETED, session=db_session)
+    for order in (pending, processing[2]):
+        OrderItemFactory(
+            order=order, product=product, quantity=2, session=db_session
+        )
+
+    changes = [
+        {"order_id": processing[0].id, "status": "completed"},
+        {"order_id": processing[1].id, "status": "completed"},
+        {"order_id": processing[2].id, "status": "cancelled"},
+        {"order_id": pending.id, "status": "cancelled"},
+        {"order_id": completed.id, "status": "processing"},
+        {"order_id": 99999, "status": "completed"},
+        {"order_id": processing[0].id, "status": "cancelled"},
+    ]
+    with query_counter() as queries:
+        response = await test_client.post("/orders/status:batch", json=changes)
+    assert response.status_code == status.HTTP_200_OK
+    results = response.json()
+    assert [r["status"] for r in results] == [
+        "updated", "updated", "updated", "updated",
+        "invalid", "not_found", "invalid"
+    ]
+    assert results[0]["from_status"] == "processing"
+    assert "Invalid status transition" in results[4]["detail"]
+
+    # One UPDATE per (from, to) status pair
+    order_updates = [
+        s for s in queries.statements if s.startswith("UPDATE orders")
+    ]
+    assert len(order_updates) == 3
+
+    for order in processing + [pending]:
+        db_session.refresh(order)
+    assert [o.status for o in processing] == [
+        "completed", "completed", "cancelled"
+    ]
+    assert pending.status == "cancelled"
+    db_session.refresh(product)
+    assert product.stock == 14
+
+
 @pytest.mark.asyncio
 async def test_validation_rules(test_client, db_session):
     """Test order validation rules."""
@@ -245,6 +452,160 @@ async def test_list_orders(test_client, db_session):
     assert len(data) == 2
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("response_class", [JSONResponse, ORJSONResponse])
+async def test_rendered_orders_match_response_model(
+    test_client, db_session, monkeypatch, response_class
+):
+    """Test prebuilt order documents encode exactly like the response model."""
+    monkeypatch.setattr(rendering, "RESPONSE_CLASS", response_class)
+    product = ProductFactory(price=10, session=db_session)
+    order = OrderFactory(total_amount=20, status="processing", session=db_session)
+    OrderItemFactory(order=order, product=product, quantity=2, session=db_session)
+    db_session.commit()
+    db_session.expire_all()
+    order = db_session.scalars(
+        select(Order).options(selectinload(Order.order_items))
+    ).one()
+
+    expected = [OrderResponse.model_validate(order).model_dump(mode="json")]
+    response = await test_client.get("/orders/")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == response_class(content=expected).body
+
+    response = await test_client.get(f"/orders/{order.id}")
+    assert response.content == response_class(content=expected[0]).body
+
+
+@pytest.mark.asyncio
+async def test_list_orders_cursor_pagination(test_client, db_session):
+    """Test keyset pagination over orders with status and email filters."""
+    product = ProductFactory(session=db_session)
+    for index in range(7):
+        extra = {"customer_email": "repeat@example.com"} if index < 3 else {}
+        order = OrderFactory(
+            status=OrderStatus.PENDING if index % 2 else OrderStatus.COMPLETED,
+            session=db_session,
+            **extra
+        )
+        OrderItemFactory(order=order, product=product, session=db_session)
+
+    async def collect(**params):
+        ids, cursor = [], ""
+        while cursor is not None:
+            response = await test_client.get(
+                "/orders/", params={"cursor": cursor, "limit": 2, **params}
+            )
+            assert response.status_code == status.HTTP_200_OK
+            page = response.json()
+            assert len(page["items"]) <= 2
+            ids.extend(o["id"] for o in page["items"])
+            cursor = page["next_cursor"]
+        return ids
+
+    all_ids = await collect()
+    assert len(all_ids) == 7
+    assert len(set(all_ids)) == 7
+
+    pending = await collect(status=OrderStatus.PENDING.value)
+    assert len(pending) == 3
+
+    repeat = await collect(customer_email="repeat@example.com")
+    assert len(repeat) == 3
+
+    # Offset mode keeps returning a plain list and honours the filters
+    response = await test_client.get(
+        "/orders/", params={"status": OrderStatus.COMPLETED.value}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()) == 4
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("params", [
+    {"cursor": "", "limit": 0},
+    {"cursor": "", "limit": -3},
+    {"cursor": "", "limit": 101},
+])
+async def test_list_orders_rejects_out_of_range_page_size(test_client, params):
+    """Test keyset page sizes outside their bounds are rejected."""
+    response = await test_client.get("/orders/", params=params)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["error"]["code"] == "VALIDATION_ERROR"
+
+
+@pytest.mark.asyncio
+async def test_list_orders_offset_mode_accepts_any_limit(test_client):
+    """Test offset mode keeps accepting limits beyond the keyset bounds."""
+    response = await test_client.get("/orders/", params={"limit": 200})
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+async def test_order_summary(test_client, db_session):
+    """Test order totals come from the refreshed rollup plus today live."""
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    two_days_ago = today - timedelta(days=2)
+    placed = [
+        (two_days_ago, OrderStatus.COMPLETED, 10.0),
+        (two_days_ago, OrderStatus.PENDING, 5.0),
+        (today - timedelta(days=1), OrderStatus.PENDING, 7.5),
+    ]
+    orders = [
+        OrderFactory(
+            created_at=created_at + timedelta(hours=1),
+            status=order_status,
+            total_amount=amount,
+            session=db_session
+        )
+        for created_at, order_status, amount in placed
+    ]
+    OrderFactory(created_at=datetime.utcnow(), total_amount=2.5, session=db_session)
+
+    response = await test_client.post("/internal/order-rollup/refresh")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["refreshed_days"][:2] == [
+        two_days_ago.date().isoformat(),
+        (today - timedelta(days=1)).date().isoformat(),
+    ]
+
+    params = {"from": two_days_ago.date().isoformat()}
+    response = await test_client.get("/orders/summary", params=params)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [
+        {"day": two_days_ago.date().isoformat(), "order_count": 2, "revenue": 15.0},
+        {
+            "day": (today - timedelta(days=1)).date().isoformat(),
+            "order_count": 1,
+            "revenue": 7.5
+        },
+        {"day": today.date().isoformat(), "order_count": 1, "revenue": 2.5},
+    ]
+
+    # Past days only change after the next refresh
+    await test_client.put(f"/orders/{orders[1].id}", json={"status": "cancelled"})
+    await test_client.delete(f"/orders/{orders[2].id}")
+    by_status = {**params, "group_by": "status"}
+    response = await test_client.get("/orders/summary", params=by_status)
+    assert response.json() == [
+        {"status": "completed", "order_count": 1, "revenue": 10.0},
+        {"status": "pending", "order_count": 3, "revenue": 15.0},
+    ]
+
+    await test_client.post("/internal/order-rollup/refresh")
+    response = await test_client.get("/orders/summary", params=by_status)
+    assert response.json() == [
+        {"status": "cancelled", "order_count": 1, "revenue": 5.0},
+        {"status": "completed", "order_count": 1, "revenue": 10.0},
+        {"status": "pending", "order_count": 1, "revenue": 2.5},
+    ]
+
+    response = await test_client.get(
+        "/orders/summary", params={"from": "2024-02-01", "to": "2024-01-01"}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 @pytest.mark.asyncio
 async def test_delete_order(test_client, db_session):
     """Test order deletion with stock restoration."""
@@ -273,3 +634,75 @@ async def test_delete_order(test_client, db_session):
     # Verify order deletion
     response = await test_client.get(f"/orders/{order.id}")
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_order_items_are_eager_loaded(test_client, db_session, query_counter):
+    """Test order endpoints load items without one query per order."""
+    product = ProductFactory(stock=100, session=db_session)
+    orders = []
+    for _ in range(5):
+        order = OrderFactory(status=OrderStatus.PENDING, session=db_session)
+        for quantity in (1, 2):
+            OrderItemFactory(
+                order=order,
+                product=product,
+                quantity=quantity,
+                session=db_session
+            )
+        orders.append(order)
+
+    # One query for the page of orders, one for all of their items
+    with query_counter() as queries:
+        response = await test_client.get("/orders/")
+    assert response.status_code == status.HTTP_200_OK
+    assert all(len(o["order_items"]) == 2 for o in response.json())
+    assert queries.count == 2
+
+    with query_counter() as queries:
+        response = await test_client.get(f"/orders/{orders[0].id}")
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()["order_items"]) == 2
+    assert queries.count == 2
+
+    # Load order and items, then a single UPDATE
+    with query_counter() as queries:
+        response = await test_client.put(
+            f"/orders/{orders[1].id}",
+            json={"status": OrderStatus.PROCESSING}
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()["order_items"]) == 2
+    assert queries.count == 3
+
+
+@pytest.mark.asyncio
+async def test_export_orders(test_client, db_session):
+    """Test streaming export of orders with items as NDJSON and CSV."""
+    product1 = ProductFactory(session=db_session)
+    product2 = ProductFactory(session=db_session)
+    order = OrderFactory(status=OrderStatus.PENDING, session=db_session)
+    OrderItemFactory(order=order, product=product1, quantity=2, session=db_session)
+    OrderItemFactory(order=order, product=product2, quantity=1, session=db_session)
+    empty_order = OrderFactory(status=OrderStatus.CANCELLED, session=db_session)
+
+    response = await test_client.get("/orders/export")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [o["id"] for o in lines] == [order.id, empty_order.id]
+    assert [i["quantity"] for i in lines[0]["order_items"]] == [2, 1]
+    assert lines[1]["order_items"] == []
+
+    response = await test_client.get(
+        "/orders/export",
+        params={"format": "csv", "status": OrderStatus.PENDING.value}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 2
+    assert {int(r["order_id"]) for r in rows} == {order.id}
+    assert sorted(int(r["product_id"]) for r in rows) == sorted(
+        [product1.id, product2.id]
+    )
@@ -0,0 +1,58 @@
+"""Test module for connection pool instrumentation."""
+import pytest
+from fastapi import status
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import create_async_engine
+from product_order_api.metrics import Histogram
+from product_order_api.pool import InstrumentedQueuePool, pool_stats
+
+
+def test_histogram_cumulative_buckets():
+    """Test observations are counted in cumulative buckets."""
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == pytest.approx(2.65)
+    assert snapshot["buckets"] == {"0.1": 2, "1.0": 3, "+Inf": 4}
+
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_counts_checkouts_and_timeouts(tmp_path):
+    """Test the pool reports usage, overflow and checkout timeouts."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05
+    )
+    try:
+        async with engine.connect(), engine.connect():
+            stats = pool_stats(engine)
+            assert stats["checked_out"] == 2
+            assert stats["overflow"] == 1
+
+            with pytest.raises(exc.TimeoutError):
+                async with engine.connect():
+                    pass
+
+        stats = pool_stats(engine)
+        assert stats["checked_out"] == 0
+        assert stats["checkouts"] == 2
+        assert stats["checkout_timeouts"] == 1
+        assert stats["checkout_wait_seconds"]["count"] == 3
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_endpoint(test_client):
+    """Test the internal endpoint describes the writer pool."""
+    response = await test_client.get("/internal/pool-stats")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert "pool" in data["primary"]
+    assert data["replicas"] == []
@@ -1,7 +1,12 @@
 """Test module for product endpoints."""
+import base64
+import json
+
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.orm import Session
+from product_order_api.models.product import Product
+from product_order_api.schemas.product import ProductResponse
 from tests.factories import ProductFactory
 
 
@@ -97,8 +102,214 @@ async def test_list_products_pagination(test_client, db_session):
     
     # Verify correct products are returned
     product_ids = [p["id"] for p in data]
-    expected_ids = [p.id for p in sorted(products, key=lambda x: x.id)[5:10]]
-    assert product_ids == expected_ids
+    expected = sorted(products, key=lambda x: x.id)[5:10]
+    assert product_ids == [p.id for p in expected]
+
+    # Projected rows render exactly like the response model
+    assert data == [
+        ProductResponse.model_validate(p).model_dump(mode="json")
+        for p in expected
+    ]
+
+
+@pytest.mark.asyncio
+async def test_list_products_cursor_pagination(test_client, db_session):
+    """Test keyset pagination walks every product exactly once."""
+    products = [ProductFactory(session=db_session) for _ in range(12)]
+
+    seen = []
+    cursor = ""
+    while cursor is not None:
+        response = await test_client.get(
+            "/products/", params={"cursor": cursor, "limit": 5}
+        )
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 5
+        seen.extend(p["id"] for p in page["items"])
+        cursor = page["next_cursor"]
+
+    assert seen == sorted(p.id for p in products)
+
+    # Malformed cursors are rejected
+    response = await test_client.get("/products/?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort, position", [
+    ("id", {"id": {"a": 1}}),
+    ("id", {"id": "7"}),
+    ("id", {"id": True}),
+    ("id", {"id": 2 ** 70}),
+    ("price", {"price": [1], "id": 1}),
+    ("price", {"price": 10.0, "id": 1.5}),
+    ("name", {"name": 3, "id": 1}),
+    ("updated_at", {"updated_at": 0, "id": 1}),
+    ("updated_at", {"updated_at": "yesterday", "id": 1}),
+])
+async def test_list_products_rejects_mistyped_cursor(
+    test_client, db_session, sort, position
+):
+    """Test cursor values of the wrong type are rejected before the query."""
+    ProductFactory(session=db_session)
+    cursor = base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+    response = await test_client.get(
+        "/products/", params={"cursor": cursor, "sort": sort}
+    )
+    assert response.status_code == 400
+    assert response.json()["error"]["message"] == "Invalid pagination cursor"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("params", [
+    {"cursor": "", "limit": 0},
+    {"cursor": "", "limit": -3},
+    {"cursor": "", "limit": 501},
+])
+async def test_list_products_rejects_out_of_range_page_size(test_client, params):
+    """Test keyset page sizes outside their bounds are rejected."""
+    response = await test_client.get("/products/", params=params)
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == "VALIDATION_ERROR"
+
+
+@pytest.mark.asyncio
+async def test_list_products_offset_mode_accepts_any_limit(test_client):
+    """Test offset mode keeps accepting limits beyond the keyset bounds."""
+    response = await test_client.get("/products/", params={"limit": 1000})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_list_products_filters_and_sort(test_client, db_session):
+    """Test price and stock filters and sorting, in both pagination modes."""
+    prices = [5.0, 20.0, 15.0, 20.0, 50.0, 10.0, 20.0, 30.0]
+    products = [
+        ProductFactory(price=price, stock=n % 3, session=db_session)
+        for n, price in enumerate(prices)
+    ]
+
+    response = await test_client.get(
+        "/products/",
+        params={"min_price": 10, "max_price": 30, "in_stock": True,
+                "sort": "price", "order": "desc"}
+    )
+    assert response.status_code == 200
+    expected = sorted(
+        (p for p in products if 10 <= p.price <= 30 and p.stock > 0),
+        key=lambda p: (-p.price, -p.id)
+    )
+    assert [p["id"] for p in response.json()] == [p.id for p in expected]
+
+    response = await test_client.get(
+        "/products/", params={"in_stock": False, "sort": "name"}
+    )
+    expected = sorted(
+        (p for p in products if p.stock == 0), key=lambda p: (p.name, p.id)
+    )
+    assert [p["id"] for p in response.json()] == [p.id for p in expected]
+
+    # Keyset pages follow the sort, ties on price included
+    seen, cursor = [], ""
+    while cursor is not None:
+        response = await test_client.get(
+            "/products/",
+            params={"cursor": cursor, "limit": 3, "sort": "price",
+                    "order": "desc"}
+        )
+        assert response.status_code == 200
+        page = response.json()
+        seen.extend(p["id"] for p in page["items"])
+        cursor = page["next_cursor"]
+    expected = sorted(products, key=lambda p: (-p.price, -p.id))
+    assert seen == [p.id for p in expected]
+
+    response = await test_client.get(
+        "/products/", params={"min_price": 30, "max_price": 10}
+    )
+    assert response.status_code == 400
+    response = await test_client.get("/products/", params={"sort": "stock"})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_products(test_client, db_session):
+    """Test bulk creation, upsert and partial update with per-row results."""
+    existing = ProductFactory(price=10.0, stock=5, session=db_session)
+    payload = [
+        {"name": "New A", "price": 1.5, "stock": 10},
+        {"id": existing.id, "price": 12.5},
+        {"id": existing.id + 1000, "stock": 3},
+        {"name": "Missing price", "stock": 1},
+        {
+            "id": existing.id + 2000,
+            "name": "Upserted",
+            "description": "Created through upsert",
+            "price": 7.0,
+            "stock": 2
+        },
+        {"name": "New B", "description": "Second", "price": 2.5, "stock": 20},
+    ]
+
+    response = await test_client.post("/products/bulk", json=payload)
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["index"] for r in results] == list(range(len(payload)))
+    assert [r["status"] for r in results] == [
+        "created", "updated", "not_found", "invalid", "created", "created"
+    ]
+    assert results[4]["id"] == existing.id + 2000
+
+    db_session.refresh(existing)
+    assert existing.price == 12.5
+    assert existing.stock == 5
+
+    for result, row in ((results[0], payload[0]), (results[5], payload[5])):
+        created = await test_client.get(f"/products/{result['id']}")
+        assert created.status_code == 200
+        assert created.json()["name"] == row["name"]
+        assert created.json()["stock"] == row["stock"]
+
+    # Upserting an existing id updates it in place
+    payload = [{
+        "id": existing.id + 2000,
+        "name": "Upserted again",
+        "price": 8.0,
+        "stock": 4
+    }]
+    response = await test_client.post("/products/bulk", json=payload)
+    assert response.json()[0]["status"] == "updated"
+    upserted = await test_client.get(f"/products/{existing.id + 2000}")
+    assert upserted.json()["name"] == "Upserted again"
+    assert upserted.json()["description"] == "Created through upsert"
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_rejects_repeated_ids(test_client, db_session):
+    """Test a repeated id is reported invalid without failing its chunk."""
+    existing = ProductFactory(price=10.0, stock=5, session=db_session)
+    full = {"name": "Upserted", "price": 7.0, "stock": 2}
+    payload = [
+        {"id": existing.id + 1000, **full},
+        {"id": existing.id, "price": 11.0},
+        {"id": existing.id + 1000, **full, "stock": 9},
+        {"id": existing.id, "price": 12.0},
+    ]
+
+    response = await test_client.post("/products/bulk", json=payload)
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["status"] for r in results] == [
+        "created", "updated", "invalid", "invalid"
+    ]
+    assert "more than once" in results[2]["detail"]
+
+    # The first occurrence of each id was applied
+    db_session.refresh(existing)
+    assert existing.price == 11.0
+    response = await test_client.get(f"/products/{existing.id + 1000}")
+    assert response.json()["stock"] == 2
 
 
 @pytest.mark.asyncio
@@ -163,4 +374,114 @@ async def test_concurrent_updates(test_client, db_session):
     data = response.json()
     
     # Last update should win
-    assert data["stock"] == 95
\ No newline at end of file
+    assert data["stock"] == 95
+
+
+@pytest.mark.asyncio
+async def test_top_sellers(test_client, db_session):
+    """Test top sellers follow placed, cancelled and deleted orders."""
+    best = ProductFactory(price=5.0, stock=100, session=db_session)
+    runner_up = ProductFactory(price=20.0, stock=100, session=db_session)
+
+    async def place(*lines):
+        response = await test_client.post("/orders/", json={
+            "customer_name": "Buyer",
+            "customer_email": "buyer@example.com",
+            "items": [
+                {"product_id": product.id, "quantity": quantity}
+                for product, quantity in lines
+            ]
+        })
+        assert response.status_code == 201
+        return response.json()["id"]
+
+    await place((best, 4), (runner_up, 1))
+    await place((best, 3))
+    cancelled = await place((runner_up, 2))
+    deleted = await place((best, 1), (runner_up, 1))
+    batch_cancelled = await place((best, 5))
+
+    await test_client.put(f"/orders/{cancelled}", json={"status": "cancelled"})
+    await test_client.delete(f"/orders/{deleted}")
+    await test_client.post("/orders/status:batch", json=[
+        {"order_id": batch_cancelled, "status": "cancelled"}
+    ])
+
+    response = await test_client.get("/products/top-sellers?window=7d")
+    assert response.status_code == 200
+    assert response.json() == [
+        {"product_id": best.id, "units_sold": 7, "revenue": 35.0},
+        {"product_id": runner_up.id, "units_sold": 1, "revenue": 20.0},
+    ]
+
+    response = await test_client.get("/products/top-sellers?window=1d&limit=1")
+    assert [p["product_id"] for p in response.json()] == [best.id]
+
+    response = await test_client.get("/products/top-sellers?window=1000d")
+    assert response.status_code == 400
+    response = await test_client.get("/products/top-sellers?window=week")
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_search_products(test_client, db_session):
+    """Test ranked full-text search and prefix autocompletion."""
+    lamp = ProductFactory(
+        name="Desk lamp", description="Lamp with a lamp shade", session=db_session
+    )
+    chair = ProductFactory(
+        name="Desk chair", description="Ergonomic chair", session=db_session
+    )
+    ProductFactory(name="Table lamp", description="Small", session=db_session)
+    ProductFactory(name="Rug", description="Wool", session=db_session)
+    ProductFactory(name="Desk mat", description="Felt", session=db_session)
+
+    response = await test_client.get("/products/search", params={"q": "lamp"})
+    assert response.status_code == 200
+    page = response.json()
+    assert page["items"][0]["id"] == lamp.id
+    assert {p["name"] for p in page["items"]} == {"Desk lamp", "Table lamp"}
+    assert page["next_cursor"] is None
+
+    # Renamed products are reindexed; query syntax is taken literally
+    db_session.query(Product).filter_by(id=chair.id).update({"name": "Stool"})
+    db_session.commit()
+    response = await test_client.get(
+        "/products/search", params={"q": '"chair* NOT'}
+    )
+    assert [p["id"] for p in response.json()["items"]] == [chair.id]
+
+    # Paging one product at a time follows the ranking of a single page
+    response = await test_client.get(
+        "/products/search", params={"q": "desk lamp ergonomic"}
+    )
+    ranked = [p["name"] for p in response.json()["items"]]
+    assert len(ranked) == 4
+    seen, cursor = [], None
+    while True:
+        params = {"q": "desk lamp ergonomic", "limit": 1}
+        if cursor:
+            params["cursor"] = cursor
+        page = (await test_client.get("/products/search", params=params)).json()
+        seen.extend(p["name"] for p in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == ranked
+
+    response = await test_client.get(
+        "/products/search", params={"q": "de", "mode": "prefix", "limit": 1}
+    )
+    page = response.json()
+    assert [p["name"] for p in page["items"]] == ["Desk lamp"]
+    response = await test_client.get("/products/search", params={
+        "q": "de", "mode": "prefix", "cursor": page["next_cursor"]
+    })
+    page = response.json()
+    assert [p["name"] for p in page["items"]] == ["Desk mat"]
+    assert page["next_cursor"] is None
+
+    response = await test_client.get(
+        "/products/search", params={"q": "%", "mode": "prefix"}
+    )
+    assert response.json()["items"] == []